@@ -0,0 +1,171 @@
+"""Measure cold start of AWS Lambda handler in fresh interpreters
+
+Every run starts new python process, which imports src.handler
+and serves one representative event, as AWS Lambda does on cold start.
+Distributions (min, median, 90th and 99th percentiles, max) of:
+- process: milliseconds from process start to its exit,
+  including interpreter startup
+- import: milliseconds spent on import of src.handler
+- first_response: milliseconds from the start of import
+  to the first response
+- max_rss_kb: peak resident memory of process
+
+Runs against source tree and against production package, created
+with scripts/package.py. Package is extracted to temporary directory,
+as AWS Lambda does. Runs of source tree and package alternate,
+so that both are affected by the same noise of host.
+
+Run from repository root:
+python3 -m benchmarks.cold_start [--runs 50] [--package build/package.zip]
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+import zipfile
+
+from benchmarks.import_time import generate_event, run_fresh_interpreter
+from scripts.package import create_zip_package
+
+
+# Metrics in order of report
+METRICS = ['process', 'import', 'first_response', 'max_rss_kb']
+
+# Percentiles in report
+PERCENTILES = [
+    ('min', 0),
+    ('p50', 0.5),
+    ('p90', 0.9),
+    ('p99', 0.99),
+    ('max', 1),
+]
+
+
+def run_cold_start(event, python=sys.executable, path='.'):
+    """Serve *event* in fresh interpreter, which imports handler
+    from *path*
+
+    Returns:
+        Dict with value of every metric
+    """
+    started = time.perf_counter()
+    metrics, _ = run_fresh_interpreter(event, python, path)
+    metrics['process'] = (time.perf_counter() - started) * 1000
+    return metrics
+
+
+def get_percentile(values, fraction):
+    """Return value, which is greater than or equal to *fraction*
+    of *values* (nearest rank)
+    """
+    index = math.ceil(len(values) * fraction) - 1
+    return sorted(values)[max(index, 0)]
+
+
+def summarize(values):
+    """Return dict with percentiles of *values*
+    """
+    return {
+        name: get_percentile(values, fraction)
+        for name, fraction in PERCENTILES
+    }
+
+
+def measure_cold_starts(targets, runs, python=sys.executable):
+    """Run fresh interpreters *runs* times for every target
+
+    Args:
+        targets (list): Pairs of target name and directory with src package
+        runs (int): Number of runs of every target
+        python (str): Python executable
+
+    Returns:
+        Dict with distribution of every metric of every target
+    """
+    event = generate_event()
+    samples = {name: {} for name, _ in targets}
+    for _ in range(runs):
+        for name, path in targets:
+            for metric, value in run_cold_start(event, python, path).items():
+                samples[name].setdefault(metric, []).append(value)
+    return {
+        name: {
+            metric: summarize(values)
+            for metric, values in target_samples.items()
+        }
+        for name, target_samples in samples.items()
+    }
+
+
+def extract_package(package_path, directory):
+    """Extract zip package to *directory* and return path to it
+    """
+    with zipfile.ZipFile(package_path) as package:
+        package.extractall(directory)
+    return directory
+
+
+def format_report(distributions):
+    """Return report table with distributions of every target
+    """
+    lines = ['{target:<14} {metric:<16}'.format(
+        target='target', metric='metric') + ''.join(
+            '{:>10}'.format(name) for name, _ in PERCENTILES)]
+    for target, metrics in distributions.items():
+        for metric in METRICS:
+            lines.append('{target:<14} {metric:<16}'.format(
+                target=target, metric=metric) + ''.join(
+                    '{:>10.1f}'.format(metrics[metric][name])
+                    for name, _ in PERCENTILES))
+    return '\n'.join(lines)
+
+
+def main(arguments):
+    """Main script
+
+    Print distributions of cold start metrics of source tree
+    and production package
+    """
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        '--runs', help="Number of fresh interpreters for every target",
+        type=int, default=50)
+    parser.add_argument(
+        '--python', help="Python executable, which serves event "
+        "and creates package", type=str, default=sys.executable)
+    parser.add_argument(
+        '--package', help="Zip package to measure. By default production "
+        "package is created with scripts/package.py", type=str, default=None)
+    parser.add_argument(
+        '--skip-package', help="Measure only source tree",
+        action='store_true')
+    parser.add_argument(
+        '--output', help="Write distributions to JSON file",
+        type=str, default=None)
+    args = parser.parse_args(arguments)
+    with tempfile.TemporaryDirectory() as directory:
+        targets = [('source', '.')]
+        if not args.skip_package:
+            package_path = args.package
+            if package_path is None:
+                package_path, _ = create_zip_package(
+                    os.path.join(directory, 'opening_hours'),
+                    production=True, python=args.python)
+            targets.append(('package', extract_package(
+                package_path, os.path.join(directory, 'package'))))
+        distributions = measure_cold_starts(targets, args.runs, args.python)
+    print(format_report(distributions))
+    if args.output is not None:
+        with open(args.output, 'w') as output_file:
+            json.dump(distributions, output_file, indent=2)
+            output_file.write('\n')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
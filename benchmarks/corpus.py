@@ -0,0 +1,175 @@
+"""Generate corpus of API Gateway events for load tests
+
+Corpus is NDJSON file with one event of the main handler per line.
+Events are a realistic mix of:
+- random valid schedules
+- duplicates of schedules, which were already sent (cache hits)
+- schedules with shifts closing on the next day
+- queries with malformed base64 (400 Bad Request)
+- schedules with unmatched hours (422 Unprocessable Entity)
+
+Run from repository root:
+python3 -m benchmarks.corpus corpus.ndjson [--events 10000]
+"""
+import argparse
+import base64
+import json
+import random
+import sys
+
+from src.constants import DAYS_OF_WEEK
+from src.pipeline import create_week
+from src.request.validate import ValidationError
+from src.working_hours import WorkingHoursError
+from tests.utils import generate_random_request
+
+
+# Default share of every kind of events. The rest are new valid schedules
+DUPLICATE_SHARE = 0.3
+
+OVERNIGHT_SHARE = 0.2
+
+BAD_BASE64_SHARE = 0.05
+
+UNPROCESSABLE_SHARE = 0.05
+
+
+def create_event(query):
+    """Create API Gateway event of the main handler with *query*
+    """
+    return {
+        'resource': '/openinghours',
+        'path': '/openinghours',
+        'httpMethod': 'GET',
+        'queryStringParameters': {'query': query},
+        'body': None,
+        'isBase64Encoded': False,
+    }
+
+
+def encode_schedule(schedule):
+    """Return base64 encoded query with *schedule*
+    """
+    return base64.b64encode(json.dumps(schedule).encode()).decode()
+
+
+def _get_error_type(schedule):
+    """Return type of error, raised for *schedule*, or None
+    """
+    try:
+        create_week(schedule)
+    except (ValidationError, WorkingHoursError) as err:
+        return type(err)
+    return None
+
+
+def generate_valid_schedule(rand):
+    """Generate random schedule, which can be converted
+    """
+    while True:
+        schedule = generate_random_request(rand)
+        if _get_error_type(schedule) is None:
+            return schedule
+
+
+def generate_unprocessable_schedule(rand):
+    """Generate random schedule with valid structure and unmatched hours
+    """
+    while True:
+        schedule = generate_random_request(rand)
+        if _get_error_type(schedule) is WorkingHoursError:
+            return schedule
+
+
+def generate_overnight_schedule(rand):
+    """Generate schedule, where restaurant opens in the evening
+    and closes in the night on some days, including sunday to monday
+    """
+    schedule = {day: [] for day in DAYS_OF_WEEK}
+    days = sorted(rand.sample(range(len(DAYS_OF_WEEK)), rand.randint(1, 7)))
+    for day in days:
+        schedule[DAYS_OF_WEEK[day]].append({
+            'type': 'open', 'value': rand.randrange(64800, 86400, 900)})
+        next_day = DAYS_OF_WEEK[(day + 1) % len(DAYS_OF_WEEK)]
+        schedule[next_day].insert(0, {
+            'type': 'close', 'value': rand.randrange(0, 14400, 900)})
+    return schedule
+
+
+def generate_bad_base64_query(rand):
+    """Generate query, which is not valid base64
+    """
+    query = encode_schedule(generate_random_request(rand))
+    index = rand.randrange(len(query))
+    return query[:index] + rand.choice('!*.~') + query[index + 1:]
+
+
+def generate_corpus(
+        count, rand,
+        duplicate_share=DUPLICATE_SHARE,
+        overnight_share=OVERNIGHT_SHARE,
+        bad_base64_share=BAD_BASE64_SHARE,
+        unprocessable_share=UNPROCESSABLE_SHARE):
+    """Generate *count* events with shares of every kind of events
+
+    Returns:
+        Generator of events
+    """
+    queries = []
+    for _ in range(count):
+        share = rand.random()
+        if share < bad_base64_share:
+            query = generate_bad_base64_query(rand)
+        elif share < bad_base64_share + unprocessable_share:
+            query = encode_schedule(generate_unprocessable_schedule(rand))
+        elif share < bad_base64_share + unprocessable_share + \
+                duplicate_share and queries:
+            query = rand.choice(queries)
+        elif share < bad_base64_share + unprocessable_share + \
+                duplicate_share + overnight_share:
+            query = encode_schedule(generate_overnight_schedule(rand))
+            queries.append(query)
+        else:
+            query = encode_schedule(generate_valid_schedule(rand))
+            queries.append(query)
+        yield create_event(query)
+
+
+def main(arguments):
+    """Main script
+
+    Write corpus to NDJSON file
+    """
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        'output_file', help="Output NDJSON file. Default: stdout",
+        type=argparse.FileType('w'), nargs='?', default='-')
+    parser.add_argument(
+        '--events', help="Number of events", type=int, default=10000)
+    parser.add_argument(
+        '--duplicates', help="Share of duplicate schedules",
+        type=float, default=DUPLICATE_SHARE)
+    parser.add_argument(
+        '--overnight', help="Share of schedules with overnight shifts",
+        type=float, default=OVERNIGHT_SHARE)
+    parser.add_argument(
+        '--bad-base64', help="Share of queries with malformed base64",
+        type=float, default=BAD_BASE64_SHARE)
+    parser.add_argument(
+        '--unprocessable', help="Share of schedules with unmatched hours",
+        type=float, default=UNPROCESSABLE_SHARE)
+    parser.add_argument(
+        '--seed', help="Seed of random generator", type=int, default=42)
+    args = parser.parse_args(arguments)
+    for event in generate_corpus(
+            args.events, random.Random(args.seed), args.duplicates,
+            args.overnight, args.bad_base64, args.unprocessable):
+        args.output_file.write(json.dumps(event))
+        args.output_file.write('\n')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,139 @@
+"""Latency histogram with fixed relative precision, as in HdrHistogram
+
+Values are counted in buckets: values below 2 ** SIGNIFICANT_BITS
+have own buckets, larger values share buckets of relative width
+2 ** (1 - SIGNIFICANT_BITS), so that percentiles of any value range
+are reported with the same precision and memory does not depend
+on number of values.
+"""
+import collections
+
+
+# Values are distinguished with relative precision 2 ** (1 - bits): < 1%
+SIGNIFICANT_BITS = 8
+
+_EXACT_LIMIT = 2 ** SIGNIFICANT_BITS
+
+_HALF_LIMIT = _EXACT_LIMIT // 2
+
+
+def get_bucket(value):
+    """Return index of bucket of non-negative integer *value*
+    """
+    if value < _EXACT_LIMIT:
+        return value
+    exponent = value.bit_length() - SIGNIFICANT_BITS
+    return _EXACT_LIMIT + (exponent - 1) * _HALF_LIMIT + \
+        (value >> exponent) - _HALF_LIMIT
+
+
+def get_bucket_range(bucket):
+    """Return the lowest and the highest values of *bucket*
+    """
+    if bucket < _EXACT_LIMIT:
+        return bucket, bucket
+    exponent, offset = divmod(bucket - _EXACT_LIMIT, _HALF_LIMIT)
+    exponent += 1
+    lowest = (offset + _HALF_LIMIT) << exponent
+    return lowest, lowest + (1 << exponent) - 1
+
+
+class LatencyHistogram:
+    """
+    Histogram of non-negative integer values, usually microseconds
+
+    Attributes:
+        buckets (collections.Counter): Number of values in every bucket
+        count (int): Number of values
+        total (int): Sum of values
+        min (int): The smallest value, None if histogram is empty
+        max (int): The largest value, None if histogram is empty
+    """
+
+    def __init__(self):
+        """Return empty LatencyHistogram
+        """
+        self.buckets = collections.Counter()
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def record(self, value):
+        """Count *value*. Negative values are counted as 0
+        """
+        value = max(int(value), 0)
+        self.buckets[get_bucket(value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """Add values of *other* histogram
+        """
+        self.buckets.update(other.buckets)
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def mean(self):
+        """Returns mean value or None if histogram is empty
+        """
+        return self.total / self.count if self.count else None
+
+    def get_percentile(self, percentile):
+        """Return value, which is greater than or equal to *percentile*
+        percents of values. It is the highest value of its bucket,
+        but not greater than maximal value.
+
+        Returns None if histogram is empty
+        """
+        if not self.count:
+            return None
+        rank = max(1, -(-self.count * percentile // 100))
+        counted = 0
+        for bucket in sorted(self.buckets):
+            counted += self.buckets[bucket]
+            if counted >= rank:
+                return min(get_bucket_range(bucket)[1], self.max)
+        return self.max
+
+    def format_percentile_distribution(self, unit_divisor=1000):
+        """Return table of values by percentile, as printed by HdrHistogram:
+        percentiles approach 100 in halving steps (50, 75, 87.5, ...)
+
+        Args:
+            unit_divisor (int): Values are divided by it,
+            microseconds are printed as milliseconds by default
+        """
+        lines = ['{:>12} {:>14} {:>10} {:>14}'.format(
+            'Value', 'Percentile', 'TotalCount', '1/(1-Percentile)')]
+        if not self.count:
+            return '\n'.join(lines)
+        percentile = 0
+        step = 50
+        while True:
+            value = self.get_percentile(percentile)
+            total_count = sum(
+                count for bucket, count in self.buckets.items()
+                if get_bucket_range(bucket)[0] <= value)
+            lines.append('{value:>12.3f} {percentile:>14.6f} {count:>10} '
+                         '{inverse:>14.2f}'.format(
+                             value=value / unit_divisor,
+                             percentile=percentile / 100,
+                             count=total_count,
+                             inverse=100 / (100 - percentile)))
+            if total_count >= self.count:
+                break
+            percentile += step
+            step /= 2
+        lines.append('{:>12.3f} {:>14.6f} {:>10}'.format(
+            self.max / unit_divisor, 1, self.count))
+        return '\n'.join(lines)
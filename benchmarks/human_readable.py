@@ -0,0 +1,87 @@
+"""Compare conversion of many working weeks to human readable format:
+one week at a time with reference and fused pipelines,
+and all weeks at once with vectorized conversion
+
+Run from repository root: python3 -m benchmarks.human_readable
+"""
+import argparse
+import random
+import sys
+import timeit
+
+from src.pipeline import (
+    create_week_in_one_pass,
+    create_week_with_reference_pipeline)
+from src.working_hours.vectorized import (
+    convert_weeks_to_human_readable_format)
+from tests.utils import generate_random_request
+
+
+def generate_schedules(count, seed=42):
+    """Generate *count* random valid working weeks
+    """
+    rand = random.Random(seed)
+    schedules = []
+    while len(schedules) < count:
+        schedule = generate_random_request(rand)
+        try:
+            create_week_in_one_pass(schedule)
+        except ValueError:
+            continue
+        schedules.append(schedule)
+    return schedules
+
+
+def _convert_one_by_one(create_week):
+    """Return function, which converts weeks one by one
+    with *create_week* pipeline
+    """
+    def _convert(schedules):
+        return [
+            create_week(schedule).to_human_readable_format()
+            for schedule in schedules
+        ]
+    return _convert
+
+
+CONVERTERS = [
+    ('reference pipeline',
+     _convert_one_by_one(create_week_with_reference_pipeline)),
+    ('fused pipeline', _convert_one_by_one(create_week_in_one_pass)),
+    ('vectorized', convert_weeks_to_human_readable_format),
+]
+
+
+def main(arguments):
+    """Main script
+
+    Time every converter on the same corpus and check
+    that results are the same
+    """
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        '--schedules', help="Number of working weeks",
+        type=int, default=100000)
+    parser.add_argument(
+        '--repeat', help="Number of measurements", type=int, default=3)
+    args = parser.parse_args(arguments)
+    schedules = generate_schedules(args.schedules)
+    expected = None
+    baseline = None
+    for name, convert in CONVERTERS:
+        result = convert(schedules)
+        expected = expected or result
+        if result != expected:
+            sys.exit('{} returned different result'.format(name))
+        seconds = min(timeit.repeat(
+            lambda: convert(schedules), number=1, repeat=args.repeat))
+        baseline = baseline or seconds
+        print('{converter:<20} {time:>9.3f} s {speedup:>7.1f}x'.format(
+            converter=name, time=seconds, speedup=baseline / seconds))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
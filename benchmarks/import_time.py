@@ -0,0 +1,159 @@
+"""Report import cost of AWS Lambda handler and time to first response
+
+Every run starts fresh python interpreter with -X importtime,
+imports src.handler and serves one request. Reported times are medians.
+
+Run from repository root: python3 -m benchmarks.import_time
+"""
+import argparse
+import base64
+import json
+import statistics
+import subprocess
+import sys
+
+from tests.utils import generate_valid_request
+
+
+# Target for median time from the start of handler import
+# to the first response. See README
+TARGET_MILLISECONDS = 40
+
+# Code executed in fresh interpreter
+CHILD_CODE = '''
+import sys
+import time
+sys.path[0] = {path!r}
+started = time.perf_counter()
+import src.handler
+imported = time.perf_counter()
+src.handler.handler({event}, None)
+responded = time.perf_counter()
+import json
+import resource
+print(json.dumps({{
+    'import': (imported - started) * 1000,
+    'first_response': (responded - started) * 1000,
+    'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+}}))
+'''
+
+
+def generate_event():
+    """Generate representative API Gateway event
+    """
+    query = json.dumps(generate_valid_request()).encode()
+    return {
+        'queryStringParameters': {
+            'query': base64.b64encode(query).decode()
+        }
+    }
+
+
+def run_fresh_interpreter(
+        event, python=sys.executable, path='.', import_time=False):
+    """Import handler and serve *event* in fresh interpreter
+
+    Args:
+        event (dict): Event for handler
+        python (str): Python executable
+        path (str): Directory or zip file with src package
+        import_time (bool): Run with -X importtime. It slows down
+        imports, so timings of such runs are not representative
+
+    Returns:
+        - Dict with milliseconds spent on import and until first response,
+        and peak resident memory in KB (on Linux)
+        - Dict with cumulative import time in milliseconds of every module,
+        empty if *import_time* is False
+    """
+    options = ['-X', 'importtime'] if import_time else []
+    code = CHILD_CODE.format(path=path, event=repr(event))
+    result = subprocess.run(
+        [python] + options + ['-c', code],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True)
+    return json.loads(result.stdout), parse_import_time(result.stderr)
+
+
+def parse_import_time(report):
+    """Parse -X importtime report
+
+    Returns:
+        Dict with cumulative import time of every module in milliseconds
+    """
+    modules = {}
+    for line in report.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line[len('import time:'):].split('|')
+        modules[module.strip()] = int(cumulative) / 1000
+    return modules
+
+
+def measure(runs, python=sys.executable, path='.'):
+    """Run fresh interpreter *runs* times
+
+    Returns:
+        - Dict with lists of import and first response times
+        and peak memory
+        - Dict with median cumulative import time of every module
+    """
+    event = generate_event()
+    timings = {}
+    modules = {}
+    for _ in range(runs):
+        run_timings, _ = run_fresh_interpreter(event, python, path)
+        for name, value in run_timings.items():
+            timings.setdefault(name, []).append(value)
+        _, run_modules = run_fresh_interpreter(
+            event, python, path, import_time=True)
+        for module, milliseconds in run_modules.items():
+            modules.setdefault(module, []).append(milliseconds)
+    return timings, {
+        module: statistics.median(milliseconds)
+        for module, milliseconds in modules.items()
+    }
+
+
+def main(arguments):
+    """Main script
+
+    Print modules with the largest import time, median times to import
+    and to first response, and fail if time to first response
+    exceeds target
+    """
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        '--runs', help="Number of fresh interpreters", type=int, default=20)
+    parser.add_argument(
+        '--top', help="Number of modules to report", type=int, default=15)
+    parser.add_argument(
+        '--target-ms', help="Target time to first response",
+        type=float, default=TARGET_MILLISECONDS)
+    args = parser.parse_args(arguments)
+    # Measure
+    timings, modules = measure(args.runs)
+    print('Modules with the largest cumulative import time '
+          '(median, measured with -X importtime):')
+    for module, milliseconds in sorted(
+            modules.items(), key=lambda item: item[1],
+            reverse=True)[:args.top]:
+        print('{milliseconds:>9.2f} ms  {module}'.format(
+            milliseconds=milliseconds, module=module))
+    import_time = statistics.median(timings['import'])
+    first_response_time = statistics.median(timings['first_response'])
+    print('Import of src.handler: {:.2f} ms'.format(import_time))
+    print('Import and first response: {:.2f} ms (target {:.2f} ms)'.format(
+        first_response_time, args.target_ms))
+    if first_response_time > args.target_ms:
+        sys.exit('Time to first response exceeds target')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,308 @@
+"""Replay API Gateway events and report latency histogram
+
+Events are read from NDJSON corpus (see benchmarks.corpus) or generated,
+and replayed in a loop for --duration seconds:
+- directly: handler of event path is called in this process
+- over HTTP: events are sent to server (python3 -m src.server)
+  with --concurrency keep-alive connections
+
+Without --rate every connection sends the next request as soon as
+it gets response (closed loop). With --rate requests are sent
+on schedule (open loop), and latency is measured from scheduled
+time, so that delays of requests, which wait for previous ones,
+are not hidden.
+
+Events are converted once and then served from response cache,
+as in warm AWS Lambda, unless --disable-cache is passed (direct calls)
+or server runs with OPENING_HOURS_RESPONSE_CACHE_MAX_BYTES=0.
+
+Reports throughput, share of every status code and latency
+percentiles in HdrHistogram format.
+
+Run from repository root:
+python3 -m benchmarks.load_test [--corpus corpus.ndjson]
+[--url http://127.0.0.1:3000] [--rate 1000] [--concurrency 16]
+"""
+import argparse
+import asyncio
+import collections
+import itertools
+import json
+import random
+import sys
+import time
+import urllib.parse
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.histogram import LatencyHistogram
+from src.handler import RESPONSE_CACHE
+from src.server import ROUTES
+
+
+# Status of requests, which failed without response
+TRANSPORT_ERROR = 'transport error'
+
+# Seconds before scheduled request, which are spent in busy loop
+SPIN_SECONDS = 0.001
+
+
+class LoadTestResult:
+    """
+    Result of load test
+
+    Attributes:
+        histogram (LatencyHistogram): Latencies in microseconds
+        statuses (collections.Counter): Number of responses
+        with every status code
+        elapsed (float): Seconds of load test
+    """
+
+    def __init__(self):
+        """Return empty LoadTestResult
+        """
+        self.histogram = LatencyHistogram()
+        self.statuses = collections.Counter()
+        self.elapsed = 0
+
+    def record(self, status, scheduled, finished):
+        """Record request, which was scheduled and finished
+        at *perf_counter* times
+        """
+        self.statuses[status] += 1
+        self.histogram.record((finished - scheduled) * 1e6)
+
+    def to_human_readable_format(self):
+        """Return report with throughput, status codes and latencies
+        """
+        count = self.histogram.count
+        lines = [
+            'Requests: {count} in {elapsed:.1f} s, '
+            '{throughput:.0f} requests/s'.format(
+                count=count, elapsed=self.elapsed,
+                throughput=count / self.elapsed if self.elapsed else 0),
+        ]
+        for status, status_count in sorted(
+                self.statuses.items(), key=lambda item: str(item[0])):
+            lines.append('  {status}: {count} ({share:.2%})'.format(
+                status=status, count=status_count,
+                share=status_count / count))
+        if count:
+            lines.append('Latency: ' + ', '.join(
+                '{name} {value:.3f} ms'.format(
+                    name=name,
+                    value=self.histogram.get_percentile(percentile) / 1000)
+                for name, percentile in [
+                    ('p50', 50), ('p90', 90), ('p99', 99), ('p99.9', 99.9),
+                    ('max', 100)]))
+        lines.append(self.histogram.format_percentile_distribution())
+        return '\n'.join(lines)
+
+
+def load_corpus(corpus_file):
+    """Return list of events from NDJSON file
+    """
+    return [json.loads(line) for line in corpus_file if line.strip()]
+
+
+def _get_route_handler(event):
+    """Return handler of event path, as server does
+    """
+    _, route_handler = ROUTES[event['path'].rstrip('/')]
+    return route_handler
+
+
+def _wait_until(scheduled):
+    """Wait until *scheduled* perf_counter time. The last millisecond
+    is spent in busy loop: sleep can overshoot, and it would be
+    counted as latency
+    """
+    delay = scheduled - time.perf_counter() - SPIN_SECONDS
+    if delay > 0:
+        time.sleep(delay)
+    while time.perf_counter() < scheduled:
+        pass
+
+
+def run_direct(events, duration, rate=None):
+    """Call handlers with *events* in a loop for *duration* seconds,
+    on schedule with *rate* requests per second if it is passed
+    """
+    result = LoadTestResult()
+    handlers = [_get_route_handler(event) for event in events]
+    started = time.perf_counter()
+    deadline = started + duration
+    for index in itertools.count():
+        now = time.perf_counter()
+        scheduled = now if rate is None else started + index / rate
+        if scheduled >= deadline or now >= deadline:
+            break
+        _wait_until(scheduled)
+        position = index % len(events)
+        response = handlers[position](events[position], None)
+        result.record(
+            response['statusCode'], scheduled, time.perf_counter())
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def create_http_request(event, host):
+    """Return raw HTTP request for API Gateway *event*
+    """
+    target = event['path']
+    query = event.get('queryStringParameters')
+    if query:
+        target += '?' + '&'.join(
+            '{}={}'.format(
+                urllib.parse.quote(name, safe=''),
+                urllib.parse.quote(value, safe=''))
+            for name, value in query.items())
+    body = (event.get('body') or '').encode()
+    return (
+        '{method} {target} HTTP/1.1\r\nHost: {host}\r\n'
+        'Content-Length: {length}\r\n\r\n'.format(
+            method=event['httpMethod'], target=target, host=host,
+            length=len(body))).encode() + body
+
+
+class HttpConnection:
+    """
+    Keep-alive connection to server, which is reopened after errors
+    """
+
+    def __init__(self, host, port):
+        """Return HttpConnection, which is not open yet
+        """
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def send(self, request):
+        """Send raw *request* and return response status code
+        or TRANSPORT_ERROR
+        """
+        try:
+            if self.writer is None:
+                self.reader, self.writer = await asyncio.open_connection(
+                    self.host, self.port)
+            self.writer.write(request)
+            head = await self.reader.readuntil(b'\r\n\r\n')
+            status_line, *header_lines = head.decode().split('\r\n')
+            length = 0
+            for line in header_lines:
+                name, _, value = line.partition(':')
+                if name.lower() == 'content-length':
+                    length = int(value)
+            await self.reader.readexactly(length)
+            if b'connection: close' in head.lower():
+                self.close()
+            return int(status_line.split()[1])
+        except (OSError, EOFError, asyncio.IncompleteReadError, ValueError):
+            self.close()
+            return TRANSPORT_ERROR
+
+    def close(self):
+        """Close connection. It is opened again by the next request
+        """
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+async def run_http(events, url, duration, concurrency, rate=None):
+    """Send *events* to server at *url* in a loop for *duration* seconds
+    with *concurrency* connections, on schedule with *rate* requests
+    per second if it is passed
+    """
+    address = urllib.parse.urlsplit(url)
+    host = address.hostname
+    port = address.port or 80
+    requests = [create_http_request(event, address.netloc) for event in events]
+    connections = asyncio.Queue()
+    for _ in range(concurrency):
+        connections.put_nowait(HttpConnection(host, port))
+    result = LoadTestResult()
+    indexes = itertools.count()
+    started = time.perf_counter()
+    deadline = started + duration
+
+    async def send(index, scheduled):
+        connection = await connections.get()
+        try:
+            status = await connection.send(requests[index % len(requests)])
+        finally:
+            connections.put_nowait(connection)
+        result.record(status, scheduled, time.perf_counter())
+
+    async def send_in_loop():
+        while time.perf_counter() < deadline:
+            await send(next(indexes), time.perf_counter())
+
+    if rate is None:
+        await asyncio.gather(*(send_in_loop() for _ in range(concurrency)))
+    else:
+        tasks = []
+        for index in indexes:
+            scheduled = started + index / rate
+            if scheduled >= deadline:
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.ensure_future(send(index, scheduled)))
+        await asyncio.gather(*tasks)
+    result.elapsed = time.perf_counter() - started
+    while not connections.empty():
+        connections.get_nowait().close()
+    return result
+
+
+def main(arguments):
+    """Main script
+
+    Replay events and print report
+    """
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        '--corpus', help="NDJSON file with events. By default events "
+        "are generated", type=argparse.FileType('r'), default=None)
+    parser.add_argument(
+        '--events', help="Number of generated events",
+        type=int, default=10000)
+    parser.add_argument(
+        '--url', help="Server URL. By default handlers are called directly",
+        type=str, default=None)
+    parser.add_argument(
+        '--duration', help="Seconds to replay events",
+        type=float, default=10)
+    parser.add_argument(
+        '--rate', help="Target requests per second. By default requests "
+        "are sent as soon as previous ones are answered",
+        type=float, default=None)
+    parser.add_argument(
+        '--disable-cache', help="Disable response cache, when handlers "
+        "are called directly, so that repeated events are converted again",
+        action='store_true')
+    parser.add_argument(
+        '--concurrency', help="Number of HTTP connections",
+        type=int, default=16)
+    args = parser.parse_args(arguments)
+    if args.corpus is not None:
+        events = load_corpus(args.corpus)
+    else:
+        events = list(generate_corpus(args.events, random.Random(42)))
+    if args.disable_cache:
+        RESPONSE_CACHE.max_bytes = 0
+    if args.url is None:
+        result = run_direct(events, args.duration, args.rate)
+    else:
+        result = asyncio.run(run_http(
+            events, args.url, args.duration, args.concurrency, args.rate))
+    print(result.to_human_readable_format())
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
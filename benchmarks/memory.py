@@ -0,0 +1,209 @@
+"""Measure memory allocated per request and retained per schedule
+
+Every stage of request pipeline is called on synthetic schedules
+(see benchmarks.suite) with tracemalloc tracing only this call:
+- peak_kb: the largest memory allocated at once during the call,
+  including temporary objects, like dicts from json.loads
+- retained_kb and retained_blocks: memory and number of memory blocks
+  (objects, their dicts and buffers), allocated during the call
+  and still held by its result
+
+Retained memory per compiled schedule is measured by keeping
+many Week, CompiledWeek and Timeline objects of every schedule.
+
+Every stage is called once before measurement, so that caches
+(like time tables) are not counted. Results depend on python version.
+Script fails if any number exceeds limit stored in JSON file.
+
+Run from repository root:
+python3 -m benchmarks.memory [--limits benchmarks/memory_limits.json]
+[--write-limits benchmarks/memory_limits.json]
+"""
+import argparse
+import base64
+import gc
+import json
+import sys
+import tracemalloc
+
+from benchmarks.suite import SCHEDULES, _call_handler_without_cache
+from src.pipeline import create_week
+from src.request.parse import decode_and_load_json, ParseError
+from src.request.validate import ValidationError
+from src.working_hours import Week, WorkingHoursError
+
+
+# Number of objects kept to measure retained memory per schedule
+RETAINED_COPIES = 100
+
+# Limits are written with this headroom above measured numbers
+HEADROOM = 0.1
+
+METRICS = ['peak_kb', 'retained_kb', 'retained_blocks']
+
+
+def measure_call(function):
+    """Call *function* with tracing of its allocations
+
+    Returns:
+        Dict with peak and retained memory in KB and number
+        of retained memory blocks
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function()
+        retained, peak = tracemalloc.get_traced_memory()
+        retained_blocks = sum(
+            statistic.count for statistic in
+            tracemalloc.take_snapshot().statistics('filename'))
+    finally:
+        tracemalloc.stop()
+    del result
+    return {
+        'peak_kb': peak / 1024,
+        'retained_kb': retained / 1024,
+        'retained_blocks': retained_blocks,
+    }
+
+
+def _call_ignoring_errors(function, *args):
+    """Return result of *function* or raised error of invalid request
+    """
+    try:
+        return function(*args)
+    except (ParseError, ValidationError, WorkingHoursError) as err:
+        return err
+
+
+def create_measurements(schedules):
+    """Return list of (name, function) for every measurement.
+    Name is "stage[schedule]"
+    """
+    measurements = []
+    for schedule_name, schedule in schedules:
+        query = base64.b64encode(json.dumps(schedule).encode()).decode()
+        event = {'queryStringParameters': {'query': query}}
+        stages = [
+            ('request.parse.decode_and_load_json',
+             lambda query=query: _call_ignoring_errors(
+                 decode_and_load_json, query)),
+            ('pipeline.create_week',
+             lambda schedule=schedule: _call_ignoring_errors(
+                 create_week, schedule)),
+            ('handler',
+             lambda event=event: _call_handler_without_cache(event)),
+        ]
+        week = _call_ignoring_errors(create_week, schedule)
+        if isinstance(week, Week):
+            stages += [
+                ('working_hours.Week.create_week_from_json',
+                 lambda schedule=schedule: Week.create_week_from_json(
+                     schedule)),
+                ('working_hours.Week.to_human_readable_format',
+                 week.to_human_readable_format),
+                ('retained_per_schedule.Week',
+                 lambda schedule=schedule: [
+                     create_week(schedule) for _ in range(RETAINED_COPIES)]),
+                ('retained_per_schedule.CompiledWeek',
+                 lambda week=week: [
+                     week.compile() for _ in range(RETAINED_COPIES)]),
+                ('retained_per_schedule.Timeline',
+                 lambda week=week: [
+                     week.create_timeline()
+                     for _ in range(RETAINED_COPIES)]),
+            ]
+        measurements.extend(
+            ('{stage}[{schedule}]'.format(
+                stage=stage, schedule=schedule_name), function)
+            for stage, function in stages)
+    return sorted(measurements)
+
+
+def measure(name, function):
+    """Return metrics of measurement. Metrics of objects kept
+    per schedule are divided by number of copies
+    """
+    function()
+    metrics = measure_call(function)
+    if name.startswith('retained_per_schedule.'):
+        metrics = {
+            metric: value / RETAINED_COPIES
+            for metric, value in metrics.items()
+        }
+    return metrics
+
+
+def find_exceeded_limits(results, limits):
+    """Return list of (name, metric, limit, value) of metrics,
+    which exceed *limits*. Measurements without limits are skipped
+    """
+    return [
+        (name, metric, limits[name][metric], metrics[metric])
+        for name, metrics in sorted(results.items())
+        for metric in METRICS
+        if metric in limits.get(name, {}) and
+        metrics[metric] > limits[name][metric]
+    ]
+
+
+def main(arguments):
+    """Main script
+
+    Measure memory, compare it with limits and write new limits
+    """
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        '--limits', help="Fail if memory exceeds limits from JSON file",
+        type=str, default=None)
+    parser.add_argument(
+        '--write-limits', help="Write measured memory with headroom "
+        "as limits to JSON file", type=str, default=None)
+    parser.add_argument(
+        '--headroom', help="Headroom of written limits",
+        type=float, default=HEADROOM)
+    parser.add_argument(
+        '--filter', help="Run only measurements with substring in name",
+        type=str, default='')
+    args = parser.parse_args(arguments)
+    limits = {}
+    if args.limits is not None:
+        with open(args.limits) as limits_file:
+            limits = json.load(limits_file)['limits']
+    results = {}
+    print('{:<60} {:>10} {:>12} {:>16}'.format(
+        'measurement', *METRICS))
+    for name, function in create_measurements(SCHEDULES):
+        if args.filter not in name:
+            continue
+        results[name] = measure(name, function)
+        print('{name:<60} {peak_kb:>10.1f} {retained_kb:>12.2f} '
+              '{retained_blocks:>16.1f}'.format(name=name, **results[name]))
+    if args.write_limits is not None:
+        with open(args.write_limits, 'w') as limits_file:
+            json.dump(
+                {
+                    'python': '{}.{}'.format(*sys.version_info),
+                    'limits': {
+                        name: {
+                            metric: round(value * (1 + args.headroom), 2)
+                            for metric, value in metrics.items()
+                        }
+                        for name, metrics in results.items()
+                    },
+                },
+                limits_file, indent=2, sort_keys=True)
+            limits_file.write('\n')
+    exceeded = find_exceeded_limits(results, limits)
+    for name, metric, limit, value in exceeded:
+        print('Limit exceeded: {name} {metric} {value:.2f} > {limit:.2f}'.
+              format(name=name, metric=metric, value=value, limit=limit))
+    if exceeded:
+        sys.exit('{} memory limits are exceeded'.format(len(exceeded)))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
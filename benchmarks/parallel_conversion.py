@@ -0,0 +1,85 @@
+"""Measure scaling of NDJSON conversion with number of worker processes
+
+Generates NDJSON file with random restaurants and converts it
+sequentially and with pools from 1 to --max-workers processes
+
+Run from repository root: python3 -m benchmarks.parallel_conversion
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from scripts.convert_ndjson import (
+    convert_file,
+    convert_file_in_parallel,
+    ConversionStats)
+from tests.utils import generate_random_request
+
+
+def generate_ndjson_file(path, records, seed=42):
+    """Write *records* random restaurants to NDJSON file
+    """
+    rand = random.Random(seed)
+    with open(path, 'w') as output_file:
+        for item_id in range(records):
+            output_file.write(json.dumps({
+                'id': item_id,
+                'working_hours': generate_random_request(rand)
+            }))
+            output_file.write('\n')
+
+
+def time_conversion(path, workers, ordered):
+    """Return seconds spent on conversion of file. File is converted
+    sequentially if *workers* is None
+    """
+    stats = ConversionStats()
+    started = time.perf_counter()
+    with open(os.devnull, 'w') as output_file:
+        if workers is None:
+            with open(path, 'rb') as input_file:
+                convert_file(input_file, output_file, stats)
+        else:
+            convert_file_in_parallel(
+                path, output_file, stats, workers, ordered)
+    return time.perf_counter() - started
+
+
+def main(arguments):
+    """Main script
+
+    Print conversion time and speedup for every number of workers
+    """
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        '--records', help="Number of restaurants in file",
+        type=int, default=100000)
+    parser.add_argument(
+        '--max-workers', help="Maximal number of workers",
+        type=int, default=os.cpu_count())
+    parser.add_argument(
+        '--unordered', help="Write results out of order",
+        action='store_true')
+    args = parser.parse_args(arguments)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'restaurants.ndjson')
+        generate_ndjson_file(path, args.records)
+        baseline = time_conversion(path, None, True)
+        print('{workers:<12} {time:>8.2f} s {speedup:>6.2f}x'.format(
+            workers='sequential', time=baseline, speedup=1))
+        for workers in range(1, args.max_workers + 1):
+            seconds = time_conversion(path, workers, not args.unordered)
+            print('{workers:<12} {time:>8.2f} s {speedup:>6.2f}x'.format(
+                workers='{} workers'.format(workers), time=seconds,
+                speedup=baseline / seconds))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
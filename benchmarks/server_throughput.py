@@ -0,0 +1,128 @@
+"""Measure throughput of pre-forked HTTP server with 1 and N workers
+
+Starts python3 -m src.server with every number of workers and sends
+requests with random restaurants over keep-alive connections
+for --duration seconds. Response cache is disabled, unless --cache
+is passed, so that every request is converted.
+
+Client runs in this process, so it needs a CPU core of its own
+to saturate workers.
+
+Run from repository root: python3 -m benchmarks.server_throughput
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+from tests.utils import generate_random_request
+
+
+def generate_requests(count, seed=42):
+    """Return *count* raw HTTP requests with random restaurants
+    """
+    rand = random.Random(seed)
+    return [
+        'GET /openinghours?query={query} HTTP/1.1\r\n'
+        'Host: localhost\r\n\r\n'.format(
+            query=base64.b64encode(json.dumps(
+                generate_random_request(rand)).encode()).decode()).encode()
+        for _ in range(count)
+    ]
+
+
+def start_server(port, workers, cache):
+    """Start server process and wait until it accepts connections
+    """
+    environment = dict(os.environ)
+    if not cache:
+        environment['OPENING_HOURS_RESPONSE_CACHE_MAX_BYTES'] = '0'
+    process = subprocess.Popen(
+        [
+            sys.executable, '-m', 'src.server', '--port', str(port),
+            '--workers', str(workers)],
+        env=environment, stderr=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            socket.create_connection(('127.0.0.1', port)).close()
+            return process
+        except ConnectionError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError('Server did not start')
+
+
+async def send_requests(port, requests, deadline):
+    """Send *requests* one after another over one connection
+    until *deadline* and return number of responses
+    """
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    responses = 0
+    while time.monotonic() < deadline:
+        writer.write(requests[responses % len(requests)])
+        head = await reader.readuntil(b'\r\n\r\n')
+        length = int(head.split(b'Content-Length: ')[1].split(b'\r\n')[0])
+        await reader.readexactly(length)
+        responses += 1
+    writer.close()
+    return responses
+
+
+async def measure_throughput(port, requests, connections, duration):
+    """Return responses per second with *connections* concurrent clients
+    """
+    deadline = time.monotonic() + duration
+    responses = await asyncio.gather(*(
+        send_requests(port, requests[index::connections], deadline)
+        for index in range(connections)))
+    return sum(responses) / duration
+
+
+def main(arguments):
+    """Main script
+
+    Print throughput and speedup for 1 worker and --workers workers
+    """
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        '--workers', help="Number of workers to compare with 1 worker",
+        type=int, default=os.cpu_count())
+    parser.add_argument(
+        '--connections', help="Number of concurrent connections",
+        type=int, default=64)
+    parser.add_argument(
+        '--duration', help="Seconds to send requests",
+        type=float, default=5)
+    parser.add_argument(
+        '--port', help="Port of server", type=int, default=3001)
+    parser.add_argument(
+        '--cache', help="Keep response cache enabled",
+        action='store_true')
+    args = parser.parse_args(arguments)
+    requests = generate_requests(args.connections * 100)
+    baseline = None
+    for workers in sorted({1, args.workers}):
+        process = start_server(args.port, workers, args.cache)
+        try:
+            throughput = asyncio.run(measure_throughput(
+                args.port, requests, args.connections, args.duration))
+        finally:
+            process.terminate()
+            process.wait()
+        baseline = baseline or throughput
+        print('{workers:<12} {rate:>10.0f} req/s {speedup:>6.2f}x'.format(
+            workers='{} workers'.format(workers), rate=throughput,
+            speedup=throughput / baseline))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,224 @@
+"""Time every stage of request pipeline on synthetic schedules
+
+Every stage (request parsing, validation, week creation, formatting,
+response creation and the whole handler) is timed on empty week,
+typical week, multi-shift days, overnight shifts, the largest days
+and invalid payloads. Stages, which need valid week, are skipped
+for invalid payloads. Handler is timed with response cache disabled,
+so that every call converts working hours, and with cache hit.
+
+Results are microseconds per call. They can be written to JSON
+and compared with baseline: script fails if any stage is slower
+than in baseline by more than --threshold. Slower stages are timed
+again --retries times before the failure, because timings on shared
+hosts are noisy.
+
+Run from repository root:
+python3 -m benchmarks.suite [--output results.json]
+[--baseline benchmarks/baseline.json] [--threshold 0.2]
+"""
+import argparse
+import base64
+import json
+import platform
+import sys
+import timeit
+
+from src.handler import handler, RESPONSE_CACHE
+from src.pipeline import create_week
+from src.request.parse import decode_and_load_json, ParseError
+from src.request.validate import validate_request, ValidationError
+from src.response import create_successfull_resonse
+from src.working_hours import Week, WorkingHoursError
+from tests.utils import (
+    generate_empty_request,
+    generate_invalid_shifts_request,
+    generate_invalid_structure_request,
+    generate_max_size_request,
+    generate_multi_shift_request,
+    generate_overnight_request,
+    generate_valid_request
+)
+
+
+SCHEDULES = [
+    ('empty', generate_empty_request()),
+    ('typical', generate_valid_request()),
+    ('multi_shift', generate_multi_shift_request()),
+    ('overnight', generate_overnight_request()),
+    ('max_size', generate_max_size_request()),
+    ('invalid_structure', generate_invalid_structure_request()),
+    ('invalid_shifts', generate_invalid_shifts_request()),
+]
+
+# Default number of timings of every stage. The fastest one is reported
+REPEAT = 5
+
+# Default minimal seconds of one timing
+MIN_TIME = 0.1
+
+
+def _ignore_errors(function, *args):
+    """Return function, which calls *function* with *args*
+    and ignores errors of invalid requests
+    """
+    def _call():
+        try:
+            function(*args)
+        except (ParseError, ValidationError, WorkingHoursError):
+            pass
+    return _call
+
+
+def _call_handler_without_cache(event):
+    """Return response of handler with disabled response cache
+    """
+    max_bytes = RESPONSE_CACHE.max_bytes
+    RESPONSE_CACHE.max_bytes = 0
+    try:
+        return handler(event, None)
+    finally:
+        RESPONSE_CACHE.max_bytes = max_bytes
+
+
+def create_benchmarks(schedules):
+    """Return list of (name, function) for every stage and schedule,
+    sorted by name. Name is "stage[schedule]"
+    """
+    benchmarks = []
+    for schedule_name, schedule in schedules:
+        query = base64.b64encode(json.dumps(schedule).encode()).decode()
+        event = {'queryStringParameters': {'query': query}}
+        stages = [
+            ('request.parse.decode_and_load_json',
+             _ignore_errors(decode_and_load_json, query)),
+            ('request.validate.validate_request',
+             _ignore_errors(validate_request, schedule)),
+            ('pipeline.create_week', _ignore_errors(create_week, schedule)),
+            ('handler', _ignore_errors(_call_handler_without_cache, event)),
+        ]
+        try:
+            week = create_week(schedule)
+        except (ValidationError, WorkingHoursError):
+            week = None
+        if week is not None:
+            body = {'working_hours': week.to_human_readable_format()}
+            stages += [
+                ('working_hours.Week.create_week_from_json',
+                 _ignore_errors(Week.create_week_from_json, schedule)),
+                ('working_hours.Week.to_human_readable_format',
+                 week.to_human_readable_format),
+                ('working_hours.Week.create_timeline', week.create_timeline),
+                ('response.create_successfull_resonse',
+                 _ignore_errors(create_successfull_resonse, body)),
+                ('handler.cache_hit',
+                 _ignore_errors(handler, event, None)),
+            ]
+        benchmarks.extend(
+            ('{stage}[{schedule}]'.format(
+                stage=stage, schedule=schedule_name), function)
+            for stage, function in stages)
+    return sorted(benchmarks)
+
+
+def time_function(function, repeat=REPEAT, min_time=MIN_TIME):
+    """Return the fastest time of one call of *function*
+    in microseconds
+    """
+    timer = timeit.Timer(function)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def find_regressions(results, baseline, threshold):
+    """Return list of (name, baseline time, time) of benchmarks,
+    which are slower than in *baseline* by more than *threshold*.
+    Benchmarks, which are not in baseline, are skipped
+    """
+    return [
+        (name, baseline[name], time)
+        for name, time in sorted(results.items())
+        if name in baseline and time > baseline[name] * (1 + threshold)
+    ]
+
+
+def main(arguments):
+    """Main script
+
+    Time every stage, write results and compare them with baseline
+    """
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        '--output', help="Write results to JSON file",
+        type=str, default=None)
+    parser.add_argument(
+        '--baseline', help="Compare results with JSON file",
+        type=str, default=None)
+    parser.add_argument(
+        '--threshold', help="Allowed slowdown compared with baseline",
+        type=float, default=0.2)
+    parser.add_argument(
+        '--retries', help="Number of times to time again benchmarks, "
+        "which are slower than baseline",
+        type=int, default=2)
+    parser.add_argument(
+        '--filter', help="Run only benchmarks with substring in name",
+        type=str, default='')
+    parser.add_argument(
+        '--repeat', help="Number of timings of every benchmark",
+        type=int, default=REPEAT)
+    parser.add_argument(
+        '--min-time', help="Minimal seconds of one timing",
+        type=float, default=MIN_TIME)
+    args = parser.parse_args(arguments)
+    baseline = {}
+    if args.baseline is not None:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)['results']
+    benchmarks = dict(create_benchmarks(SCHEDULES))
+    results = {}
+    for name, function in sorted(benchmarks.items()):
+        if args.filter not in name:
+            continue
+        results[name] = time_function(function, args.repeat, args.min_time)
+        change = ''
+        if name in baseline:
+            change = '{:+7.1%}'.format(results[name] / baseline[name] - 1)
+        print('{name:<60} {time:>12.2f} us {change}'.format(
+            name=name, time=results[name], change=change))
+    regressions = find_regressions(results, baseline, args.threshold)
+    for _ in range(args.retries):
+        if not regressions:
+            break
+        # Timings on shared hosts are noisy: slow benchmarks are timed
+        # again and the fastest time is kept
+        for name, _, _ in regressions:
+            results[name] = min(results[name], time_function(
+                benchmarks[name], args.repeat, args.min_time))
+        regressions = find_regressions(results, baseline, args.threshold)
+    if args.output is not None:
+        with open(args.output, 'w') as output_file:
+            json.dump(
+                {
+                    'python': platform.python_version(),
+                    'unit': 'us',
+                    'results': results,
+                },
+                output_file, indent=2, sort_keys=True)
+            output_file.write('\n')
+    for name, baseline_time, time in regressions:
+        print('Regression: {name} {baseline:.2f} us -> {time:.2f} us'.format(
+            name=name, baseline=baseline_time, time=time))
+    if regressions:
+        sys.exit('{count} benchmarks are slower than baseline by more '
+                 'than {threshold:.0%}'.format(
+                     count=len(regressions), threshold=args.threshold))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
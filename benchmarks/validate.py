@@ -0,0 +1,102 @@
+"""Compare request validation with jsonschema and specialized validation
+
+Run from repository root: python3 -m benchmarks.validate
+"""
+import argparse
+import sys
+import timeit
+
+import jsonschema
+
+from src.request.validate import (
+    validate_request,
+    ValidationError,
+    WORKING_HOURS_SCHEMA
+)
+from tests.utils import generate_valid_request
+
+
+def _generate_invalid_request():
+    """Generate request with invalid hour on the last day
+    """
+    request = generate_valid_request()
+    request['sunday'] = [
+        {
+            'type': 'open',
+            'value': 90000
+        }
+    ]
+    return request
+
+
+def _validate_with_jsonschema(request):
+    """Validate request as it was done before: schema is checked
+    and validator is created on every call
+    """
+    jsonschema.validate(request, WORKING_HOURS_SCHEMA)
+
+
+_CACHED_VALIDATOR = jsonschema.Draft4Validator(WORKING_HOURS_SCHEMA)
+
+
+def _validate_with_cached_jsonschema_validator(request):
+    """Validate request with jsonschema validator created once
+    """
+    _CACHED_VALIDATOR.validate(request)
+
+
+VALIDATORS = [
+    ('jsonschema.validate', _validate_with_jsonschema),
+    ('cached jsonschema validator',
+     _validate_with_cached_jsonschema_validator),
+    ('specialized validate_request', validate_request),
+]
+
+REQUESTS = [
+    ('valid', generate_valid_request()),
+    ('invalid', _generate_invalid_request()),
+]
+
+
+def time_validation(validate, request, number):
+    """Return average time of one validation in microseconds
+    """
+    def _validate():
+        try:
+            validate(request)
+        except (jsonschema.ValidationError, ValidationError):
+            pass
+    total_time = min(timeit.repeat(_validate, number=number, repeat=3))
+    return total_time / number * 1e6
+
+
+def main(arguments):
+    """Main script
+
+    Time every validator on valid and invalid request
+    """
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        '--number', help="Validations per measurement",
+        type=int, default=2000)
+    args = parser.parse_args(arguments)
+    # Time validators
+    for request_name, request in REQUESTS:
+        baseline = None
+        for validator_name, validate in VALIDATORS:
+            microseconds = time_validation(validate, request, args.number)
+            baseline = baseline or microseconds
+            print(
+                '{request:<8} {validator:<30} {time:>9.2f} us '
+                '{speedup:>7.1f}x'.format(
+                    request=request_name,
+                    validator=validator_name,
+                    time=microseconds,
+                    speedup=baseline / microseconds))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,73 @@
+"""Compare open-at queries over many restaurants: loop over timelines
+and vectorized week store
+
+Run from repository root: python3 -m benchmarks.week_store
+"""
+import argparse
+import random
+import sys
+import timeit
+
+from src.pipeline import create_week
+from src.working_hours.constants import SECONDS_IN_WEEK
+from src.working_hours.store import WeekStore
+from tests.utils import generate_random_request
+
+
+def generate_timelines(count, seed=42):
+    """Generate timelines of *count* restaurants with random valid weeks
+    """
+    rand = random.Random(seed)
+    timelines = []
+    while len(timelines) < count:
+        try:
+            week = create_week(generate_random_request(rand))
+        except ValueError:
+            continue
+        timelines.append(week.create_timeline())
+    return timelines
+
+
+def time_query(query, number):
+    """Return average time of one query in milliseconds
+    """
+    total_time = min(timeit.repeat(query, number=number, repeat=3))
+    return total_time / number * 1e3
+
+
+def main(arguments):
+    """Main script
+
+    Time open-at, count and open-during queries
+    """
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        '--restaurants', help="Number of restaurants",
+        type=int, default=100000)
+    parser.add_argument(
+        '--number', help="Queries per measurement", type=int, default=5)
+    args = parser.parse_args(arguments)
+    timelines = generate_timelines(args.restaurants)
+    store = WeekStore.create_from_timelines(timelines)
+    seconds = SECONDS_IN_WEEK // 2
+    queries = [
+        ('timelines: open at',
+         lambda: [timeline.is_open_at(seconds) for timeline in timelines]),
+        ('store: open at', lambda: store.is_open_at(seconds)),
+        ('store: count open at', lambda: store.count_open_at(seconds)),
+        ('store: open during 2 hours',
+         lambda: store.is_open_during(seconds, seconds + 7200)),
+    ]
+    baseline = None
+    for name, query in queries:
+        milliseconds = time_query(query, args.number)
+        baseline = baseline or milliseconds
+        print('{query:<30} {time:>9.2f} ms {speedup:>7.1f}x'.format(
+            query=name, time=milliseconds, speedup=baseline / milliseconds))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,239 @@
+"""Convert working hours of restaurants from NDJSON file to NDJSON results
+
+Every input line is a restaurant in the format of batch API item:
+{"id": "restaurant-1", "working_hours": {...}}
+Every output line is its result in the format of batch API result.
+Lines are read, converted and written one by one, so memory use
+does not depend on input size. Throughput is printed to stderr.
+
+With --workers input file is memory-mapped and split into chunks
+on line boundaries, which are converted by pool of processes.
+Results are written in input order, or in order of conversion
+with --unordered.
+
+Run from repository root:
+python3 -m scripts.convert_ndjson restaurants.ndjson -o results.ndjson
+"""
+import argparse
+import json
+import mmap
+import multiprocessing
+import sys
+import time
+
+from src.batch import convert_ndjson
+from src.response import HTTP_STATUS_OK
+
+
+# Approximate size of input chunk, converted by one worker at once
+CHUNK_BYTES = 4 * 2 ** 20
+
+
+class ConversionStats:
+    """
+    Counters of converted lines
+
+    Attributes:
+        records (int): Number of converted records
+        errors (int): Number of records, which could not be converted
+        bytes (int): Size of read lines
+        started (float): Time when conversion started
+    """
+
+    def __init__(self):
+        """Return ConversionStats with zero counters
+        """
+        self.records = 0
+        self.errors = 0
+        self.bytes = 0
+        self.started = time.perf_counter()
+
+    def count_lines(self, lines):
+        """Count size of *lines* while they are read
+        """
+        for line in lines:
+            self.bytes += len(line)
+            yield line
+
+    def count_result(self, result):
+        """Count converted record with *result*
+        """
+        self.records += 1
+        if result['status'] != HTTP_STATUS_OK:
+            self.errors += 1
+
+    def add(self, other):
+        """Add counters of *other* stats, for example of converted chunk
+        """
+        self.records += other.records
+        self.errors += other.errors
+        self.bytes += other.bytes
+
+    def to_human_readable_format(self):
+        """Return string with counters and throughput
+        """
+        seconds = max(time.perf_counter() - self.started, 1e-9)
+        return (
+            '{records} records ({errors} errors), {megabytes:.1f} MB '
+            'in {seconds:.2f} s: {records_per_second:.0f} records/s, '
+            '{megabytes_per_second:.1f} MB/s'.format(
+                records=self.records,
+                errors=self.errors,
+                megabytes=self.bytes / 2 ** 20,
+                seconds=seconds,
+                records_per_second=self.records / seconds,
+                megabytes_per_second=self.bytes / 2 ** 20 / seconds))
+
+
+def convert_file(input_file, output_file, stats):
+    """Convert NDJSON lines from *input_file* and write results
+    to *output_file* line by line
+    """
+    for result in convert_ndjson(stats.count_lines(input_file)):
+        stats.count_result(result)
+        output_file.write(json.dumps(result))
+        output_file.write('\n')
+
+
+def split_into_chunks(path, chunks_count):
+    """Split file into chunks, which start and end on line boundaries
+
+    Returns:
+        List of (start, end) byte offsets of chunks
+    """
+    with open(path, 'rb') as input_file:
+        with _map_file(input_file) as mapped_file:
+            size = len(mapped_file)
+            boundaries = [0]
+            for index in range(1, chunks_count):
+                line_end = mapped_file.find(
+                    b'\n', max(size * index // chunks_count,
+                               boundaries[-1]))
+                if line_end == -1:
+                    break
+                boundaries.append(line_end + 1)
+            boundaries.append(size)
+    return [
+        (start, end)
+        for start, end in zip(boundaries, boundaries[1:])
+        if start < end
+    ]
+
+
+def convert_chunk(path, start, end):
+    """Convert NDJSON lines of file chunk from *start* to *end*.
+    Runs in worker process
+
+    Returns:
+        - String with results as NDJSON lines
+        - ConversionStats of the chunk
+    """
+    stats = ConversionStats()
+    results = []
+    with open(path, 'rb') as input_file:
+        with _map_file(input_file) as mapped_file:
+            lines = _read_lines(mapped_file, start, end)
+            for result in convert_ndjson(stats.count_lines(lines)):
+                stats.count_result(result)
+                results.append(json.dumps(result))
+                results.append('\n')
+    return ''.join(results), stats
+
+
+def _read_lines(mapped_file, start, end):
+    """Generate lines of memory-mapped file from *start* to *end*
+    """
+    mapped_file.seek(start)
+    while mapped_file.tell() < end:
+        yield mapped_file.readline()
+
+
+def _map_file(input_file):
+    """Memory-map the whole file for reading
+    """
+    return mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _convert_chunk(chunk):
+    """Convert chunk (path, start, end) in worker process
+    """
+    return convert_chunk(*chunk)
+
+
+def convert_file_in_parallel(
+        path, output_file, stats, workers, ordered=True):
+    """Convert NDJSON file with pool of *workers* processes
+    and write results to *output_file*
+
+    Args:
+        path (str): Path to input file
+        output_file (file): Output file object
+        stats (ConversionStats): Stats, updated with converted chunks
+        workers (int): Number of processes
+        ordered (bool): Write results in input order. Otherwise
+        results of every chunk are written as soon as it is converted
+    """
+    with open(path, 'rb') as input_file:
+        size = input_file.seek(0, 2)
+    if not size:
+        return
+    chunks_count = max(workers, size // CHUNK_BYTES)
+    chunks = [
+        (path, start, end)
+        for start, end in split_into_chunks(path, chunks_count)
+    ]
+    with multiprocessing.Pool(workers) as pool:
+        imap = pool.imap if ordered else pool.imap_unordered
+        for results, chunk_stats in imap(_convert_chunk, chunks):
+            output_file.write(results)
+            stats.add(chunk_stats)
+
+
+def main(arguments):
+    """Main script
+
+    Convert NDJSON file or stdin and print throughput
+    """
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        'input_file', help="Input NDJSON file, stdin by default",
+        type=argparse.FileType('rb'), nargs='?', default='-')
+    parser.add_argument(
+        '-o', '--output-file', help="Output NDJSON file, stdout by default",
+        type=argparse.FileType('w'), default='-')
+    parser.add_argument(
+        '--workers', help="Convert file with pool of processes",
+        type=int, default=None)
+    parser.add_argument(
+        '--unordered', help="Write results of parallel conversion "
+        "as soon as they are ready, not in input order",
+        action='store_true')
+    parser.add_argument(
+        '--quiet', help="Do not print throughput", action='store_true')
+    args = parser.parse_args(arguments)
+    if args.workers is not None and args.input_file is sys.stdin.buffer:
+        parser.error('--workers needs input file')
+    if args.workers is not None and args.workers < 1:
+        parser.error('--workers should be positive')
+    # Convert
+    stats = ConversionStats()
+    if args.workers is None:
+        convert_file(args.input_file, args.output_file, stats)
+    else:
+        convert_file_in_parallel(
+            args.input_file.name, args.output_file, stats,
+            args.workers, ordered=not args.unordered)
+    if not args.quiet:
+        print(stats.to_human_readable_format(), file=sys.stderr)
+    # Close file handlers, except stdin and stdout
+    if args.input_file is not sys.stdin.buffer:
+        args.input_file.close()
+    if args.output_file is not sys.stdout:
+        args.output_file.close()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
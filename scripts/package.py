@@ -1,33 +1,158 @@
 """Create zip package from /src folder and installed 3d party packages
+
+Production package contains only runtime dependencies from
+requirements-production.txt, without tests and package metadata,
+and with python files precompiled for target python.
 """
 import argparse
+import fnmatch
 import os
 import shutil
+import statistics
 import subprocess
 import sys
 import tempfile
 
 
-def create_zip_package(output_file_name):
+# Files and directories, which are not needed in production package
+PRODUCTION_EXCLUDED_PATTERNS = [
+    '__pycache__',
+    '*.dist-info',
+    '*.egg-info',
+    '*.pyc',
+    '*.pyi',
+    'tests',
+    'test',
+]
+
+# Modules of /src, which are not imported by any AWS Lambda handler:
+# local HTTP server, and vectorized conversion and store,
+# which need numpy from requirements.txt
+PRODUCTION_EXCLUDED_MODULES = [
+    'src/server.py',
+    'src/working_hours/store.py',
+    'src/working_hours/vectorized.py',
+]
+
+# Number of fresh interpreters used to measure cold import time
+COLD_IMPORT_RUNS = 5
+
+# Code, which measures import time of handler in fresh interpreter
+COLD_IMPORT_CODE = '''
+import time
+started = time.perf_counter()
+import src.handler
+print((time.perf_counter() - started) * 1000)
+'''
+
+
+def create_zip_package(
+        output_file_name, production=False, python=sys.executable):
     """Zip source code from /src and dependencies
+
+    Args:
+        output_file_name (str): Path to package without .zip extension
+        production (bool): Create production package
+        python (str): Target python executable. It installs dependencies
+        and compiles production package
+
+    Returns:
+        Path to created package and median cold import time
+        of handler in milliseconds for production package (None otherwise)
     """
     # Create temp directory
     dirpath = tempfile.mkdtemp()
     # Copy src directory to temp directory
-    shutil.copytree('./src', os.path.join(dirpath, 'src'))
+    shutil.copytree(
+        './src', os.path.join(dirpath, 'src'),
+        ignore=shutil.ignore_patterns('__pycache__', '*.pyc'))
+    requirements = \
+        'requirements-production.txt' if production else 'requirements.txt'
     # Install dependencies to the same directory
     subprocess.check_call(
         [
-            sys.executable, '-m',
-            'pip', 'install', '-r', 'requirements.txt',
+            python, '-m',
+            'pip', 'install', '-r', requirements,
             '-t', dirpath]
     )
-    shutil.make_archive(
+    cold_import_time = None
+    if production:
+        remove_unused_files(dirpath)
+        compile_package(dirpath, python)
+        cold_import_time = measure_cold_import_time(dirpath, python)
+    package_path = shutil.make_archive(
         output_file_name,
         'zip',
         root_dir=dirpath)
     # Remove temp dir
     shutil.rmtree(dirpath)
+    return package_path, cold_import_time
+
+
+def remove_unused_files(dirpath):
+    """Remove files and directories matching PRODUCTION_EXCLUDED_PATTERNS
+    and modules from PRODUCTION_EXCLUDED_MODULES
+    """
+    for module in PRODUCTION_EXCLUDED_MODULES:
+        os.remove(os.path.join(dirpath, module))
+    for root, dirnames, filenames in os.walk(dirpath):
+        for dirname in list(dirnames):
+            if _is_excluded(dirname):
+                shutil.rmtree(os.path.join(root, dirname))
+                dirnames.remove(dirname)
+        for filename in filenames:
+            if _is_excluded(filename):
+                os.remove(os.path.join(root, filename))
+
+
+def _is_excluded(name):
+    """Check if file or directory is not needed in production package
+    """
+    return any(
+        fnmatch.fnmatch(name, pattern)
+        for pattern in PRODUCTION_EXCLUDED_PATTERNS)
+
+
+def compile_package(dirpath, python=sys.executable):
+    """Precompile python files in *dirpath* with target *python*.
+
+    By default bytecode is valid while modification time of source
+    is the same. Zip stores time with 2 seconds precision, so after
+    extraction bytecode of some files becomes stale and they are compiled
+    on every cold start: AWS Lambda can not write new bytecode.
+    Python 3.7+ bytecode is not checked against source at all.
+    For older python modification times are rounded to even seconds
+    before compilation (zip also stores local time, so build host
+    should use UTC as AWS Lambda does)
+    """
+    supports_hash_bytecode = subprocess.call(
+        [python, '-c', 'import sys; sys.exit(sys.version_info < (3, 7))'])
+    if supports_hash_bytecode == 0:
+        subprocess.check_call(
+            [
+                python, '-m', 'compileall', '-q',
+                '--invalidation-mode', 'unchecked-hash', dirpath])
+        return
+    for root, _, filenames in os.walk(dirpath):
+        for filename in fnmatch.filter(filenames, '*.py'):
+            path = os.path.join(root, filename)
+            mtime = int(os.path.getmtime(path)) // 2 * 2
+            os.utime(path, (mtime, mtime))
+    subprocess.check_call([python, '-m', 'compileall', '-q', dirpath])
+
+
+def measure_cold_import_time(dirpath, python=sys.executable):
+    """Return median import time of handler in milliseconds.
+    Every import is done in fresh interpreter from *dirpath*
+    """
+    import_times = [
+        float(subprocess.check_output(
+            [python, '-c', COLD_IMPORT_CODE],
+            cwd=dirpath,
+            universal_newlines=True))
+        for _ in range(COLD_IMPORT_RUNS)
+    ]
+    return statistics.median(import_times)
 
 
 def main(arguments):
@@ -41,9 +166,28 @@ def main(arguments):
         formatter_class=argparse.RawDescriptionHelpFormatter)
     parser.add_argument(
         'output_file', help="Output file", type=str)
+    parser.add_argument(
+        '--production', help="Create production package",
+        action='store_true')
+    parser.add_argument(
+        '--python', help="Target python executable",
+        type=str, default=sys.executable)
+    parser.add_argument(
+        '--max-size-kb', help="Fail if package is larger",
+        type=float, default=None)
     args = parser.parse_args(arguments)
     # Package source code
-    create_zip_package(args.output_file)
+    package_path, cold_import_time = create_zip_package(
+        args.output_file, args.production, args.python)
+    # Report package size and import time
+    size_kb = os.path.getsize(package_path) / 1024
+    print('Package {path}: {size:.1f} KB'.format(
+        path=package_path, size=size_kb))
+    if cold_import_time is not None:
+        print('Cold import of src.handler: {:.2f} ms'.format(
+            cold_import_time))
+    if args.max_size_kb is not None and size_kb > args.max_size_kb:
+        sys.exit('Package is larger than {} KB'.format(args.max_size_kb))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,148 @@
+"""Combine profiles of sampled handler invocations into report
+
+Reads cProfile (.prof) and tracemalloc (.tracemalloc) files, written
+with OPENING_HOURS_PROFILE enabled, from files and directories,
+and prints top functions by time, peak memory allocated during every
+invocation (including temporary objects, which were freed before
+its end), and top source lines by memory, which was allocated during
+invocation and not freed by its end (for example cached responses),
+over all invocations.
+
+Run from repository root:
+python3 -m scripts.profile_report /tmp [--top 20] [--sort tottime]
+"""
+import argparse
+import collections
+import io
+import json
+import linecache
+import os
+import pstats
+import sys
+import tracemalloc
+
+from src.profiling import (
+    CPU_PROFILE_EXTENSION,
+    MEMORY_PEAK_EXTENSION,
+    MEMORY_PROFILE_EXTENSION
+)
+
+
+def find_profiles(paths, extension):
+    """Return sorted paths to profiles with *extension*
+    from files and directories *paths*
+    """
+    profiles = []
+    for path in paths:
+        if os.path.isdir(path):
+            profiles.extend(
+                os.path.join(path, file_name)
+                for file_name in os.listdir(path)
+                if file_name.endswith(extension))
+        elif path.endswith(extension):
+            profiles.append(path)
+    return sorted(profiles)
+
+
+def create_cpu_report(profiles, top, sort):
+    """Return report with *top* functions from combined cProfile
+    *profiles*, sorted by *sort* key of pstats
+    """
+    output = io.StringIO()
+    stats = pstats.Stats(*profiles, stream=output)
+    stats.strip_dirs().sort_stats(sort).print_stats(top)
+    return output.getvalue()
+
+
+def create_peak_memory_report(profiles, top):
+    """Return report with peak memory of *top* invocations with the
+    highest peak from JSON *profiles*, and average peak of all invocations.
+    Invocations are named as profiles: handler, payload hash, time
+    and process id
+    """
+    peaks = []
+    for profile in profiles:
+        with open(profile) as peak_file:
+            memory = json.load(peak_file)
+        peaks.append((
+            memory['peak_bytes'], memory['held_bytes'],
+            os.path.basename(profile)[:-len(MEMORY_PEAK_EXTENSION)]))
+    peaks.sort(reverse=True)
+    lines = [
+        'Peak memory of {count} invocations, average {average:.1f} KB:'.
+        format(
+            count=len(peaks),
+            average=sum(peak for peak, _, _ in peaks) / len(peaks) / 1024),
+        '{:>13} {:>13}  {}'.format('peak', 'held after', 'invocation'),
+    ]
+    for peak, held, name in peaks[:top]:
+        lines.append('{peak:>10.1f} KB {held:>10.1f} KB  {name}'.format(
+            peak=peak / 1024, held=held / 1024, name=name))
+    return '\n'.join(lines)
+
+
+def create_memory_report(profiles, top):
+    """Return report with *top* source lines, which hold the most
+    memory at the end of invocation, combined from tracemalloc *profiles*.
+    Memory is average per invocation
+    """
+    sizes = collections.Counter()
+    counts = collections.Counter()
+    for profile in profiles:
+        snapshot = tracemalloc.Snapshot.load(profile).filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+        ])
+        for statistic in snapshot.statistics('lineno'):
+            frame = statistic.traceback[0]
+            sizes[frame.filename, frame.lineno] += statistic.size
+            counts[frame.filename, frame.lineno] += statistic.count
+    lines = [
+        'Memory held after {} invocations, average per invocation:'.format(
+            len(profiles))
+    ]
+    for (filename, lineno), size in sizes.most_common(top):
+        lines.append('{size:>10.1f} KB {count:>8.0f} blocks  {place}'.format(
+            size=size / len(profiles) / 1024,
+            count=counts[filename, lineno] / len(profiles),
+            place='{}:{}'.format(filename, lineno)))
+        source = linecache.getline(filename, lineno).strip()
+        if source:
+            lines.append('    ' + source)
+    return '\n'.join(lines)
+
+
+def main(arguments):
+    """Main script
+
+    Print report of CPU and memory profiles
+    """
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        'paths', help="Profiles or directories with profiles",
+        type=str, nargs='+')
+    parser.add_argument(
+        '--top', help="Number of functions, invocations and lines in report",
+        type=int, default=20)
+    parser.add_argument(
+        '--sort', help="Sort key of functions, see pstats",
+        type=str, default='tottime')
+    args = parser.parse_args(arguments)
+    cpu_profiles = find_profiles(args.paths, CPU_PROFILE_EXTENSION)
+    memory_profiles = find_profiles(args.paths, MEMORY_PROFILE_EXTENSION)
+    peak_profiles = find_profiles(args.paths, MEMORY_PEAK_EXTENSION)
+    if not cpu_profiles and not memory_profiles and not peak_profiles:
+        sys.exit('No profiles found')
+    if cpu_profiles:
+        print(create_cpu_report(cpu_profiles, args.top, args.sort))
+    if peak_profiles:
+        print(create_peak_memory_report(peak_profiles, args.top))
+    if memory_profiles:
+        print(create_memory_report(memory_profiles, args.top))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
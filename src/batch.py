@@ -0,0 +1,105 @@
+"""Convert working hours of many restaurants.
+
+Every restaurant is validated and converted separately, so one invalid
+restaurant does not fail the others. Used by batch API handler
+and by command-line converters of NDJSON files
+"""
+from src import settings
+from src.pipeline import create_week
+from src.request.parse import load_json, ParseError
+from src.request.validate import (
+    prepend_to_pointer,
+    validate_batch_item,
+    ValidationError
+)
+from src.response import (
+    create_bad_request_batch_item_result,
+    create_successfull_batch_item_result,
+    create_unprocessable_entity_batch_item_result
+)
+from src.working_hours import WorkingHoursError
+
+
+def convert_working_hours(working_hours_json):
+    """Validate working hours, create week
+    and convert it to human readable format
+
+    Raises ValidationError if working hours are invalid
+    Raises WorkingHoursError if week can not be created
+    """
+    return format_week(create_week(working_hours_json))
+
+
+def format_week(week):
+    """Return working hours of *week* in human readable format,
+    selected with settings.OUTPUT
+    """
+    if settings.OUTPUT == settings.COMPACT_OUTPUT:
+        return week.to_compact_human_readable_format()
+    return week.to_human_readable_format()
+
+
+def convert_batch_item(item):
+    """Validate batch item and convert its working hours
+    to human readable format
+
+    Args:
+        item (dict): Restaurant. Format:
+        {
+            'id': str or int,
+            'working_hours': dict
+        }
+
+    Returns:
+        Batch item result with status code and
+        working hours or error message
+    """
+    item_id = item.get('id') if isinstance(item, dict) else None
+    try:
+        validate_batch_item(item)
+    except ValidationError as err:
+        return create_bad_request_batch_item_result(
+            item_id, err.message, err.pointer)
+    try:
+        working_hours_in_human_readable_format = \
+            convert_working_hours(item['working_hours'])
+    except ValidationError as err:
+        prepend_to_pointer(err, 'working_hours')
+        return create_bad_request_batch_item_result(
+            item_id, err.message, err.pointer)
+    except WorkingHoursError as err:
+        prepend_to_pointer(err, 'working_hours')
+        return create_unprocessable_entity_batch_item_result(
+            item_id, err.message, err.pointer)
+    return create_successfull_batch_item_result(
+        item_id,
+        {'working_hours': working_hours_in_human_readable_format})
+
+
+def convert_ndjson_line(line):
+    """Parse one line of NDJSON with batch item and convert it
+
+    Returns:
+        Batch item result. Line with invalid JSON has result
+        with status code 400 and without id
+    """
+    try:
+        item = load_json(line)
+    except ParseError as err:
+        return create_bad_request_batch_item_result(None, err.message)
+    return convert_batch_item(item)
+
+
+def convert_ndjson(lines):
+    """Convert batch items from NDJSON lines one by one.
+    Blank lines are skipped
+
+    Args:
+        lines (iterable): Lines as str or bytes, for example file object
+
+    Returns:
+        Generator of batch item results in the same order as lines
+    """
+    for line in lines:
+        if line.strip():
+            yield convert_ndjson_line(line)
@@ -0,0 +1,122 @@
+"""In-process cache of responses.
+
+Lives in module scope, so it is kept between warm invocations
+of AWS Lambda. Least recently used responses are evicted when
+cache size exceeds the limit in bytes.
+"""
+import collections
+import json
+import sys
+
+try:
+    # Importing hashlib initializes OpenSSL, which slows down cold start.
+    # Only blake2b is needed, and it does not depend on OpenSSL
+    from _blake2 import blake2b
+except ImportError:
+    from hashlib import blake2b
+
+
+# Approximate memory, used by cache entry besides response body:
+# key, response dict and ordered dict node
+ENTRY_OVERHEAD_BYTES = 400
+
+
+def create_cache_key(*parts):
+    """Create cache key as hash of string *parts*
+    """
+    key_hash = blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode()
+        key_hash.update(part)
+        # Separate parts, so that ('ab', 'c') and ('a', 'bc') differ
+        key_hash.update(b'\0')
+    return key_hash.digest()
+
+
+def canonicalize(document):
+    """Return JSON string, which is the same for equal documents
+    regardless of keys order and whitespaces
+    """
+    return json.dumps(document, sort_keys=True, separators=(',', ':'))
+
+
+class ResponseCache:
+    """
+    Least recently used cache of responses, bounded by memory.
+
+    Attributes:
+        max_bytes (int): Cache size limit. Cache is disabled if it is 0
+        size_bytes (int): Approximate memory, used by cached responses
+        hits (int): Number of found responses
+        misses (int): Number of not found responses
+        evictions (int): Number of responses evicted to free memory
+    """
+
+    def __init__(self, max_bytes):
+        """Return empty ResponseCache with size limit *max_bytes*
+        """
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._responses = collections.OrderedDict()
+
+    @property
+    def is_enabled(self):
+        """Returns flag to show if responses can be cached
+        """
+        return self.max_bytes > 0
+
+    def get(self, key):
+        """Return cached response for *key* or None if it is not found
+        Response is copied, so caller can change it
+        """
+        try:
+            response, _ = self._responses[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._responses.move_to_end(key)
+        self.hits += 1
+        return dict(response)
+
+    def set(self, key, response):
+        """Cache *response* for *key* and evict least recently used
+        responses if cache size exceeds the limit.
+
+        Response is a dict with 'statusCode' and serialized 'body'
+        """
+        size = sys.getsizeof(response['body']) + ENTRY_OVERHEAD_BYTES
+        if size > self.max_bytes:
+            return
+        if key in self._responses:
+            _, previous_size = self._responses.pop(key)
+            self.size_bytes -= previous_size
+        self._responses[key] = (dict(response), size)
+        self.size_bytes += size
+        while self.size_bytes > self.max_bytes:
+            _, (_, evicted_size) = self._responses.popitem(last=False)
+            self.size_bytes -= evicted_size
+            self.evictions += 1
+
+    def clear(self):
+        """Remove all responses. Counters are not reset
+        """
+        self._responses.clear()
+        self.size_bytes = 0
+
+    def stats(self):
+        """Return dict with cache counters and size
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._responses),
+            'size_bytes': self.size_bytes,
+        }
+
+    def __len__(self):
+        return len(self._responses)
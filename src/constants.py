@@ -10,3 +10,7 @@ DAYS_OF_WEEK_WITH_ORDER = {
     name: index
     for index, name in enumerate(DAYS_OF_WEEK)
 }
+
+SECONDS_IN_DAY = 24 * 60 * 60
+
+SECONDS_IN_WEEK = len(DAYS_OF_WEEK) * SECONDS_IN_DAY
@@ -3,9 +3,13 @@
 
 
 class ValueErrorWithMessage(ValueError):
-    """Custom ValueError with message attribute
+    """Custom ValueError with message attribute.
+
+    Optional pointer attribute is JSON pointer to the part of request,
+    which caused the error. For example: "/monday/0/value"
     """
 
-    def __init__(self, message, *args, **kwargs):
-        super(ValueErrorWithMessage, self).__init__(message, *args, **kwargs)
+    def __init__(self, message, *args, pointer=None):
+        super(ValueErrorWithMessage, self).__init__(message, *args)
         self.message = message
+        self.pointer = pointer
@@ -1,18 +1,39 @@
 """Format restaurant opening hours
 """
-from jsonschema import ValidationError
-
-from src.request.query import get_query_param, QueryError
-from src.request.parse import decode_and_load_json, ParseError
-from src.request.validate import validate_request
+from src import settings
+from src.batch import convert_batch_item, format_week
+from src.cache import canonicalize, create_cache_key, ResponseCache
+from src.constants import SECONDS_IN_WEEK
+from src.metrics import create_stage_timer, NULL_TIMER
+from src.pipeline import create_week
+from src.profiling import profile_sampled
+from src.request.body import get_body, BodyError
+from src.request.headers import get_accepted_encoding
+from src.request.query import (
+    get_integer_query_param,
+    get_query_param,
+    QueryError
+)
+from src.request.parse import decode_and_load_json, load_json, ParseError
+from src.request.validate import validate_batch_request, ValidationError
 from src.response import (
     create_bad_request_response,
     create_successfull_resonse,
     create_unprocessable_entity_response
 )
-from src.working_hours import Week, WorkingHoursError
+from src.response.compression import (
+    compress_response,
+    ENCODINGS,
+    should_compress
+)
+from src.working_hours import WorkingHoursError
 
 
+# Responses are cached between warm invocations
+RESPONSE_CACHE = ResponseCache(settings.RESPONSE_CACHE_MAX_BYTES)
+
+
+@profile_sampled
 def handler(event, _):
     """Main API handler.
 
@@ -26,7 +47,9 @@ def handler(event, _):
                 'query': str
             }
         ]
-        Query is base64 encoded JSON with opening hours
+        Query is base64 encoded JSON with opening hours.
+        Optional "Accept-Encoding" in 'headers' allows to compress
+        large response with gzip or deflate
 
     Returns:
         Response dict. Format:
@@ -35,31 +58,240 @@ def handler(event, _):
             'body': str
         }
         "body" is JSON with result of the response.
+        Compressed response also has 'headers' with "Content-Encoding",
+        and 'isBase64Encoded': True, body is base64 encoded
+        compressed JSON.
         Successful response:
         {
             'working_hours': str
         }
         Error response:
         {
-            'error': str
+            'error': str,
+            'pointer': str
         }
+        "pointer" is JSON pointer to invalid part of working hours,
+        added if error is caused by invalid working hours
     """
+    timer = create_stage_timer('handler')
     try:
         request = get_query_param(event, 'query')
-        decoded_request = decode_and_load_json(request)
-        validate_request(decoded_request)
-    except (QueryError, ParseError, ValidationError) as err:
-        return create_bad_request_response(err.message)
+    except QueryError as err:
+        return timer.finish(create_bad_request_response(err.message))
+    timer.mark('get_query_param')
     # We do not catch KeyError from get_query_param on purpose here
     # We want to fail fast if event format has changed
     # 500 server error response and logging will be handled by AWS Lambda
+    encoding = get_accepted_encoding(event, ENCODINGS)
+    if not RESPONSE_CACHE.is_enabled:
+        response = _create_working_hours_response(request, timer)
+        return timer.finish(
+            _compress_if_accepted(response, encoding, timer), request)
+    # Response depends only on query and settings of conversion,
+    # so it is cached by their hash
+    query_key = create_cache_key(
+        settings.PIPELINE, settings.SHIFTS, settings.OUTPUT, request)
+    response = RESPONSE_CACHE.get(query_key)
+    timer.mark('cache')
+    if response is None:
+        response = _create_working_hours_response(request, timer, query_key)
+        RESPONSE_CACHE.set(query_key, response)
+        timer.mark('cache')
+    if should_compress(response, encoding):
+        # Compressed response is cached alongside uncompressed one,
+        # so that the same body is not compressed again
+        compressed_key = create_cache_key(
+            query_key, encoding, str(settings.RESPONSE_COMPRESSION_LEVEL))
+        compressed_response = RESPONSE_CACHE.get(compressed_key)
+        timer.mark('cache')
+        if compressed_response is None:
+            compressed_response = compress_response(response, encoding)
+            timer.mark('compress')
+            RESPONSE_CACHE.set(compressed_key, compressed_response)
+            timer.mark('cache')
+        response = compressed_response
+    return timer.finish(response, request)
+
+
+def _compress_if_accepted(response, encoding, timer=NULL_TIMER):
+    """Return *response* compressed with *encoding*, if it should be
+    compressed, or *response* itself
+    """
+    if not should_compress(response, encoding):
+        return response
+    response = compress_response(response, encoding)
+    timer.mark('compress')
+    return response
+
+
+def _create_working_hours_response(request, timer, query_key=None):
+    """Convert working hours from query to human readable format
+    and create response.
+
+    If response is cached, cache is also checked and updated
+    with hash of decoded working hours: the same working hours
+    can be encoded to different queries
+    """
+    try:
+        decoded_request = decode_and_load_json(request)
+    except ParseError as err:
+        return create_bad_request_response(err.message)
+    timer.mark('decode_and_load_json')
+    if query_key is not None:
+        schedule_key = create_cache_key(
+            settings.PIPELINE, settings.SHIFTS, settings.OUTPUT,
+            canonicalize(decoded_request))
+        response = RESPONSE_CACHE.get(schedule_key)
+        timer.mark('cache')
+        if response is None:
+            response = _create_working_hours_response_from_json(
+                decoded_request, timer)
+            RESPONSE_CACHE.set(schedule_key, response)
+        return response
+    return _create_working_hours_response_from_json(decoded_request, timer)
+
+
+def _create_working_hours_response_from_json(decoded_request, timer):
+    """Convert decoded working hours to human readable format
+    and create response
+    """
+    try:
+        week = create_week(decoded_request)
+    except ValidationError as err:
+        return create_bad_request_response(err.message, err.pointer)
+    except WorkingHoursError as err:
+        return create_unprocessable_entity_response(err.message, err.pointer)
+    # Fused pipeline validates request while it creates week,
+    # so validation is a part of this stage
+    timer.mark('create_week')
+    response_body = {
+        'working_hours': format_week(week)
+    }
+    timer.mark('to_human_readable_format')
+    response = create_successfull_resonse(response_body)
+    timer.mark('json_dumps')
+    return response
+
+
+@profile_sampled
+def open_at_handler(event, _):
+    """Opening status API handler.
+
+    Find if restaurant is open at some moment of the week
+    and when it opens or closes next
+
+    Args:
+        event (dict): Request in format of API Gateway
+        Expected to be have this format:
+        {
+            'queryStringParameters': {
+                'query': str,
+                'at': str
+            }
+        ]
+        Query is base64 encoded JSON with opening hours, same as
+        in the main handler. "at" is moment of the week:
+        seconds since monday midnight
+
+    Returns:
+        Response dict. Format:
+        {
+            'statusCode': int,
+            'body': str
+        }
+        "body" is JSON with result of the response.
+        Successful response:
+        {
+            'is_open': bool,
+            'next_opening': int,
+            'next_closing': int
+        }
+        "next_opening" and "next_closing" are seconds since monday midnight.
+        They are null if restaurant is always open or always closed.
+        If restaurant is open, "next_opening" is the next opening after
+        it closes. Error response is the same as in the main handler.
+    """
     try:
-        working_hours_in_human_readable_format = Week.\
-            create_week_from_json(decoded_request).\
-            to_human_readable_format()
+        request = get_query_param(event, 'query')
+        seconds = get_integer_query_param(
+            event, 'at', min_value=0, max_value=SECONDS_IN_WEEK - 1)
+        decoded_request = decode_and_load_json(request)
+        week = create_week(decoded_request)
+    except (QueryError, ParseError, ValidationError) as err:
+        return create_bad_request_response(err.message, err.pointer)
     except WorkingHoursError as err:
-        return create_unprocessable_entity_response(err.message)
+        return create_unprocessable_entity_response(err.message, err.pointer)
+    timeline = week.create_timeline()
     response_body = {
-        'working_hours': working_hours_in_human_readable_format
+        'is_open': timeline.is_open_at(seconds),
+        'next_opening': timeline.get_next_opening(seconds),
+        'next_closing': timeline.get_next_closing(seconds)
     }
     return create_successfull_resonse(response_body)
+
+
+@profile_sampled
+def batch_handler(event, _):
+    """Batch API handler.
+
+    Convert opening hours of many restaurants to human readable format
+    in one invocation. Every restaurant is validated and converted
+    separately, so one invalid item does not fail the whole batch.
+
+    Args:
+        event (dict): Request in format of API Gateway
+        Expected to be have this format:
+        {
+            'body': str,
+            'isBase64Encoded': bool
+        }
+        Body is JSON with list of restaurants. Format:
+        [
+            {
+                'id': str or int,
+                'working_hours': dict
+            }
+        ]
+        "working_hours" has the same format as query of the main handler.
+        Response is compressed as in the main handler
+
+    Returns:
+        Response dict. Format:
+        {
+            'statusCode': int,
+            'body': str
+        }
+        "body" is JSON with result of the response.
+        Successful response contains result for every item,
+        in the same order as items in request:
+        {
+            'results': [
+                {
+                    'id': str or int,
+                    'status': int,
+                    'working_hours': list
+                }
+            ]
+        }
+        Items, which could not be converted, have "error" and "pointer"
+        fields instead of "working_hours" and status 400 or 422.
+        Pointer is relative to the item.
+        Error response, if the whole batch can not be processed:
+        {
+            'error': str
+        }
+    """
+    try:
+        body = get_body(event)
+        items = load_json(body)
+        validate_batch_request(items)
+    except (BodyError, ParseError, ValidationError) as err:
+        return create_bad_request_response(err.message)
+    response_body = {
+        'results': [
+            convert_batch_item(item) for item in items
+        ]
+    }
+    return _compress_if_accepted(
+        create_successfull_resonse(response_body),
+        get_accepted_encoding(event, ENCODINGS))
@@ -0,0 +1,177 @@
+"""Latency of handler stages.
+
+Handler marks the end of every stage with StageTimer, so every stage
+costs one clock read. When request is finished, durations are:
+- printed as CloudWatch Embedded Metric Format (EMF) line, from which
+  CloudWatch creates metrics without API calls
+- passed to metrics hooks, added with add_metrics_hook
+- logged with payload hash if request is slower than threshold
+
+Metrics are configured with settings.METRICS. If they are disabled,
+handler gets NULL_TIMER, which does nothing.
+"""
+import json
+import time
+
+from src import settings
+from src.cache import create_cache_key
+
+
+# Namespace of metrics in CloudWatch
+METRICS_NAMESPACE = 'OpeningHours'
+
+# Name of metric with total duration of request
+TOTAL_METRIC = 'total'
+
+# Functions, called with durations of every finished request
+_METRICS_HOOKS = []
+
+
+def add_metrics_hook(hook):
+    """Call *hook* with durations of every finished request
+
+    Args:
+        hook (function): Function with arguments: handler name (str),
+        stages durations in milliseconds (dict), total duration
+        in milliseconds (float) and response status code (int)
+    """
+    _METRICS_HOOKS.append(hook)
+
+
+def remove_metrics_hook(hook):
+    """Stop calling *hook*, added with add_metrics_hook
+    """
+    _METRICS_HOOKS.remove(hook)
+
+
+class StageTimer:
+    """
+    Durations of stages of one request.
+
+    Stage lasts from the previous mark, or from the start of request,
+    to its own mark. Durations of stages, marked many times, are summed.
+
+    Attributes:
+        handler_name (str): Name of handler, which serves request
+        started (float): Start of request, from time.perf_counter
+        stages (dict): Duration of every stage in milliseconds,
+        in order of marks
+    """
+
+    __slots__ = ('handler_name', 'started', 'stages', '_last_mark')
+
+    def __init__(self, handler_name):
+        """Return StageTimer for request, which starts now
+        """
+        self.handler_name = handler_name
+        self.started = self._last_mark = time.perf_counter()
+        self.stages = {}
+
+    def mark(self, stage):
+        """Finish *stage*: it lasted since the previous mark
+        """
+        now = time.perf_counter()
+        self.stages[stage] = \
+            self.stages.get(stage, 0) + (now - self._last_mark) * 1000
+        self._last_mark = now
+
+    def finish(self, response, payload=None):
+        """Finish request and report durations of its stages
+
+        Args:
+            response (dict): Response of handler
+            payload (str): Request payload. Its hash is logged
+            if request is slow
+
+        Returns:
+            *response*, so that handler can return the result of the call
+        """
+        total = (time.perf_counter() - self.started) * 1000
+        status_code = response['statusCode']
+        if settings.METRICS == settings.EMF_METRICS:
+            print(create_emf_line(
+                self.handler_name, self.stages, total, status_code))
+        for hook in _METRICS_HOOKS:
+            hook(self.handler_name, self.stages, total, status_code)
+        if total >= settings.SLOW_REQUEST_THRESHOLD_MS:
+            _log_slow_request(
+                self.handler_name, self.stages, total, status_code, payload)
+        return response
+
+
+class NullTimer:
+    """
+    Timer, which does not measure anything. Used if metrics are disabled
+    """
+
+    __slots__ = ()
+
+    def mark(self, stage):
+        """Do nothing
+        """
+
+    def finish(self, response, payload=None):
+        """Return *response*
+        """
+        return response
+
+
+NULL_TIMER = NullTimer()
+
+
+def create_stage_timer(handler_name):
+    """Return StageTimer for request to handler or NULL_TIMER
+    if metrics are disabled
+    """
+    if settings.METRICS == settings.NO_METRICS:
+        return NULL_TIMER
+    return StageTimer(handler_name)
+
+
+def create_emf_line(handler_name, stages, total, status_code):
+    """Return CloudWatch Embedded Metric Format line with durations
+    of stages and whole request in milliseconds.
+    Metrics have handler name as dimension
+    """
+    metric_names = list(stages) + [TOTAL_METRIC]
+    return json.dumps({
+        '_aws': {
+            'Timestamp': int(time.time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': METRICS_NAMESPACE,
+                'Dimensions': [['Handler']],
+                'Metrics': [
+                    {'Name': name, 'Unit': 'Milliseconds'}
+                    for name in metric_names
+                ],
+            }],
+        },
+        'Handler': handler_name,
+        'StatusCode': status_code,
+        **stages,
+        TOTAL_METRIC: total,
+    })
+
+
+def hash_payload(payload):
+    """Return hex hash of request payload, so that slow requests
+    can be found and replayed without logging restaurant data
+    """
+    return create_cache_key(payload).hex()
+
+
+def _log_slow_request(handler_name, stages, total, status_code, payload):
+    """Log durations of slow request with hash of its payload
+    """
+    # Imported here: logging is not needed for fast requests
+    # and slows down cold start
+    import logging
+    logging.getLogger(__name__).warning(
+        'Slow request: %s', json.dumps({
+            'handler': handler_name,
+            'status_code': status_code,
+            'total_ms': total,
+            'stages_ms': stages,
+            'payload_hash':
+                None if payload is None else hash_payload(payload),
+        }))
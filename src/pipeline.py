@@ -0,0 +1,369 @@
+"""Validate working hours request and create week.
+
+Fused pipeline checks request structure and creates shifts
+in one pass over decoded request, without intermediate lists.
+Reference pipeline validates the whole request first and then
+creates week with working_hours classes. Both pipelines raise
+the same errors with the same messages, errors of fused pipeline
+also have JSON pointers. Pipeline is selected with settings.PIPELINE.
+
+Normalization accepts hours in any order and merges overlapping
+and touching shifts. It is enabled with settings.SHIFTS
+"""
+import json
+
+from src import settings
+from src.request.validate import (
+    prepend_to_pointer,
+    validate_day,
+    validate_hour,
+    validate_request,
+    ValidationError,
+    MAX_HOUR_VALUE,
+    MIN_HOUR_VALUE
+)
+from src.working_hours import Shift, Week, Weekday, WorkingHoursError
+from src.working_hours.constants import (
+    SECONDS_IN_DAY,
+    SECONDS_IN_WEEK,
+    WEEKDAYS)
+
+
+def create_week(working_hours_json):
+    """Validate working hours and create week with pipeline
+    from settings
+
+    Raises ValidationError if request structure is invalid
+    Raises WorkingHoursError if shifts can not be created
+
+    Args:
+        working_hours_json (dict): Decoded working hours request
+
+    Returns:
+        Week object with weekdays and shifts
+    """
+    if settings.SHIFTS == settings.NORMALIZED_SHIFTS:
+        return create_normalized_week(working_hours_json)
+    if settings.PIPELINE == settings.REFERENCE_PIPELINE:
+        return create_week_with_reference_pipeline(working_hours_json)
+    return create_week_in_one_pass(working_hours_json)
+
+
+def create_week_with_reference_pipeline(working_hours_json):
+    """Validate the whole request and then create week from it
+    """
+    validate_request(working_hours_json)
+    return Week.create_week_from_json(working_hours_json)
+
+
+def create_week_in_one_pass(working_hours_json):
+    """Validate request and create week in one pass over request
+
+    Opening hours, which are last on their day, are matched with
+    closing hours, which are first on one of the next days, while days
+    are traversed. Days without hours between them are skipped.
+    Closing hour, which comes before any other hours of the week,
+    is matched with the last opening hour after traversal.
+
+    Errors are reported in the same order as in reference pipeline:
+    invalid structure of any day is reported before missing days,
+    missing days before invalid shifts of any day, and invalid shifts
+    before hours, which are not matched between days.
+
+    Raises ValidationError if request structure is invalid
+    Raises WorkingHoursError if shifts can not be created.
+    Both errors have JSON pointer to the invalid part of request
+    """
+    if not isinstance(working_hours_json, dict):
+        validate_request(working_hours_json)
+    weekdays = {}
+    # Last opening hour of one of the previous days, which needs
+    # closing hour from the first hour of the current day,
+    # and index of its day
+    unmatched_opening_hour = None
+    unmatched_opening_hour_pointer = None
+    unmatched_opening_day_index = None
+    # Closing hour, which comes before any other hours of the week,
+    # and index of its day. It closes shift started at the end of the week
+    first_closing_hour = None
+    first_closing_day_index = None
+    has_hours_before = False
+    # Error of hours, which are not matched between days. Hours of
+    # every day are checked first in reference pipeline, so it is raised
+    # only if hours of all days can be paired
+    unmatched_hours_error = None
+    for day_index, weekday_name in enumerate(WEEKDAYS):
+        try:
+            hours = working_hours_json[weekday_name]
+        except KeyError:
+            _raise_after_validating(
+                working_hours_json, day_index,
+                ValidationError(
+                    '%r is a required property' % weekday_name,
+                    pointer='/' + weekday_name))
+        if hours.__class__ is not list:
+            validate_day(hours, weekday_name)
+        shifts = []
+        opening_hour = None
+        for index, hour in enumerate(hours):
+            try:
+                hour_type = hour['type']
+                value = hour['value']
+            except (KeyError, TypeError, IndexError):
+                hour_type = value = None
+            if not _is_valid_hour(hour_type, value):
+                try:
+                    validate_hour(hour)
+                except ValidationError as err:
+                    prepend_to_pointer(err, weekday_name, index)
+                    raise
+            if hour_type == 'open':
+                if opening_hour is not None:
+                    _raise_invalid_day_error(working_hours_json, day_index)
+                opening_hour = value
+            elif opening_hour is not None:
+                if opening_hour > value:
+                    _raise_invalid_day_error(working_hours_json, day_index)
+                shifts.append(Shift(opening_hour, value))
+                opening_hour = None
+            elif index != 0:
+                _raise_invalid_day_error(working_hours_json, day_index)
+            elif unmatched_opening_hour is not None:
+                # Shift started on one of the previous days
+                weekdays[WEEKDAYS[unmatched_opening_day_index]].add_shift(
+                    Shift(
+                        unmatched_opening_hour, value,
+                        day_index - unmatched_opening_day_index))
+                unmatched_opening_hour = None
+            elif not has_hours_before:
+                # Shift started at the end of the week,
+                # matched after traversal
+                first_closing_hour = value
+                first_closing_day_index = day_index
+            elif unmatched_hours_error is None:
+                unmatched_hours_error = _create_unmatched_closing_hour_error(
+                    weekday_name, 0)
+        if hours:
+            # Day without hours does not close shift of previous days
+            if unmatched_opening_hour is not None and \
+                    unmatched_hours_error is None:
+                unmatched_hours_error = _create_unmatched_opening_hour_error(
+                    unmatched_opening_hour_pointer)
+            has_hours_before = True
+        if opening_hour is not None:
+            unmatched_opening_hour = opening_hour
+            unmatched_opening_hour_pointer = '/{day}/{index}'.format(
+                day=weekday_name, index=len(hours) - 1)
+            unmatched_opening_day_index = day_index
+        weekdays[weekday_name] = Weekday(weekday_name, shifts)
+    if unmatched_hours_error is not None:
+        raise unmatched_hours_error
+    # Match shift, which continues on the next week
+    if unmatched_opening_hour is not None:
+        if first_closing_hour is None:
+            raise _create_unmatched_opening_hour_error(
+                unmatched_opening_hour_pointer)
+        weekdays[WEEKDAYS[unmatched_opening_day_index]].add_shift(
+            Shift(
+                unmatched_opening_hour, first_closing_hour,
+                len(WEEKDAYS) - unmatched_opening_day_index +
+                first_closing_day_index))
+    elif first_closing_hour is not None:
+        raise _create_unmatched_closing_hour_error(
+            WEEKDAYS[first_closing_day_index], 0)
+    return Week(**weekdays)
+
+
+def create_normalized_week(working_hours_json):
+    """Validate request and create week with canonical shifts
+    from hours in any order
+
+    Hours of the whole week are sorted by moment of the week.
+    Restaurant opens, when number of open shifts becomes positive,
+    and closes, when it drops to zero. So overlapping shifts,
+    including shift, which continues on the next day and overlaps
+    its first shift, and touching shifts are merged into one.
+    Shifts, which close at the same moment they open, are dropped.
+    Closing hours at the start of the week close shifts, which open
+    at the end of the week. Takes O(n log n) time for n hours.
+
+    Raises ValidationError if request structure is invalid
+    Raises WorkingHoursError if numbers of opening and closing hours
+    are different
+    """
+    hours = _get_hours_of_week(working_hours_json)
+    # Opening hours are sorted before closing hours at the same moment,
+    # so that touching shifts do not close
+    hours.sort()
+    closing_hours_count = sum(is_closing for _, is_closing in hours)
+    if 2 * closing_hours_count < len(hours):
+        raise _create_unmatched_opening_hour_error(None)
+    if 2 * closing_hours_count > len(hours):
+        raise WorkingHoursError(
+            'Found closing hours without corresponding opening hours')
+    # Start from the moment with the least number of open shifts:
+    # all shifts are closed then. Hours before it are moved to the next week
+    open_shifts_count = lowest_count = lowest_index = 0
+    for index, (_, is_closing) in enumerate(hours):
+        open_shifts_count += -1 if is_closing else 1
+        if open_shifts_count < lowest_count:
+            lowest_count = open_shifts_count
+            lowest_index = index + 1
+    # Number of open shifts is zero again after all hours
+    shifts = []
+    start = None
+    for index in range(lowest_index, lowest_index + len(hours)):
+        seconds, is_closing = hours[index % len(hours)]
+        if index >= len(hours):
+            seconds += SECONDS_IN_WEEK
+        if not is_closing:
+            if not open_shifts_count:
+                start = seconds
+            open_shifts_count += 1
+            continue
+        open_shifts_count -= 1
+        if not open_shifts_count and seconds > start:
+            if start >= SECONDS_IN_WEEK:
+                shifts.append(
+                    (start - SECONDS_IN_WEEK, seconds - SECONDS_IN_WEEK))
+            else:
+                shifts.append((start, seconds))
+    # Shifts are created from sorted pairs: compiled week is not needed
+    shifts.sort()
+    return Week.create_week_from_compiled(shifts)
+
+
+def _get_hours_of_week(working_hours_json):
+    """Return list of (seconds since monday midnight, is closing hour)
+    of all hours. The whole request is validated only if some hour
+    does not pass fast check
+
+    Raises ValidationError if request structure is invalid
+    """
+    hours = []
+    is_valid = working_hours_json.__class__ is dict
+    for day_index, weekday_name in enumerate(WEEKDAYS):
+        day_hours = working_hours_json.get(weekday_name) if is_valid else None
+        if day_hours.__class__ is not list:
+            is_valid = False
+            break
+        day_start = day_index * SECONDS_IN_DAY
+        for hour in day_hours:
+            try:
+                hour_type = hour['type']
+                value = hour['value']
+            except (KeyError, TypeError, IndexError):
+                hour_type = value = None
+            if not _is_valid_hour(hour_type, value):
+                is_valid = False
+                break
+            hours.append((day_start + value, hour_type == 'close'))
+    if is_valid:
+        return hours
+    validate_request(working_hours_json)
+    return [
+        (day_index * SECONDS_IN_DAY + hour['value'], hour['type'] == 'close')
+        for day_index, weekday_name in enumerate(WEEKDAYS)
+        for hour in working_hours_json[weekday_name]
+    ]
+
+
+def _is_valid_hour(hour_type, value):
+    """Fast check for the most common valid hours.
+    Hours, which do not pass it, are validated with validate_hour
+    """
+    return (hour_type == 'open' or hour_type == 'close') and \
+        (value.__class__ is int or value.__class__ is float) and \
+        MIN_HOUR_VALUE <= value <= MAX_HOUR_VALUE
+
+
+def _raise_after_validating(working_hours_json, day_index, error):
+    """Raise *error* if days starting from *day_index* are valid.
+
+    Structure errors take precedence over missing days and
+    missing days over invalid shifts, as in the reference pipeline.
+    Days before *day_index* are already validated
+    """
+    _validate_remaining_days(working_hours_json, day_index)
+    raise error
+
+
+def _raise_invalid_day_error(working_hours_json, day_index):
+    """Raise error for the first pair of hours of the day, which can not
+    form shift, if days starting from *day_index* are valid.
+
+    Hours are paired as in reference pipeline: closing hour, which is
+    first on its day, and opening hour, which is last, are matched
+    between days, the other hours form pairs in order
+    """
+    _validate_remaining_days(working_hours_json, day_index)
+    weekday_name = WEEKDAYS[day_index]
+    hours = working_hours_json[weekday_name]
+    start = 1 if hours[0]['type'] == 'close' else 0
+    end = len(hours) - 1 if hours[-1]['type'] == 'open' else len(hours)
+    for index in range(start, end, 2):
+        if index + 1 == end:
+            raise _create_unpaired_hour_error(
+                hours[index], weekday_name, index)
+        opening_hour = hours[index]
+        closing_hour = hours[index + 1]
+        if opening_hour['type'] != 'open' or \
+                closing_hour['type'] != 'close' or \
+                opening_hour['value'] > closing_hour['value']:
+            raise _create_invalid_shift_error(
+                opening_hour['value'], closing_hour['value'],
+                weekday_name, index + 1)
+
+
+def _validate_remaining_days(working_hours_json, day_index):
+    """Validate days starting from *day_index*
+
+    Raises ValidationError for invalid structure of any day
+    before missing days
+    """
+    remaining_weekdays = WEEKDAYS[day_index:]
+    for weekday_name in remaining_weekdays:
+        if weekday_name in working_hours_json:
+            validate_day(working_hours_json[weekday_name], weekday_name)
+    for weekday_name in remaining_weekdays:
+        if weekday_name not in working_hours_json:
+            raise ValidationError(
+                '%r is a required property' % weekday_name,
+                pointer='/' + weekday_name)
+
+
+def _create_invalid_shift_error(opening_hour, closing_hour, day, index):
+    """Create error for shift with opening hour after closing hour
+    or with two opening hours in a row
+    """
+    return WorkingHoursError(
+        'Invalid opening and closing hours found. '
+        'Opening hour should be before closing hour. '
+        'Opening hour: {opening_hour}, Closing hour: {closing_hour}'.
+        format(opening_hour=opening_hour, closing_hour=closing_hour),
+        pointer='/{day}/{index}'.format(day=day, index=index))
+
+
+def _create_unpaired_hour_error(hour, day, index):
+    """Create error for hour without pair among hours of one day,
+    which are not matched between days
+    """
+    return WorkingHoursError(
+        'Found unmatched hours. {}'.format(json.dumps([hour])),
+        pointer='/{day}/{index}'.format(day=day, index=index))
+
+
+def _create_unmatched_opening_hour_error(pointer):
+    """Create error for opening hour without closing hour
+    """
+    return WorkingHoursError(
+        'Found opening hours without corresponding closing hours',
+        pointer=pointer)
+
+
+def _create_unmatched_closing_hour_error(day, index):
+    """Create error for closing hour without opening hour
+    """
+    return WorkingHoursError(
+        'Found closing hours without corresponding opening hours',
+        pointer='/{day}/{index}'.format(day=day, index=index))
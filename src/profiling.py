@@ -0,0 +1,120 @@
+"""Profile sampled handler invocations in production.
+
+Handlers are wrapped with profile_sampled. If profiling is enabled
+with settings.PROFILE, part of invocations (settings.PROFILE_RATE)
+runs under cProfile and/or tracemalloc, and profiles are written to
+settings.PROFILE_DIRECTORY. Memory profile is tracemalloc snapshot
+of memory, held after invocation, and JSON file with peak memory,
+allocated during invocation, including freed temporary objects.
+File name contains hash of request payload, the same as in slow
+request logs of src.metrics, so that profile of slow request
+can be found.
+
+Profiles are combined into report of hot functions and allocations
+with scripts/profile_report.py
+"""
+import functools
+import json
+import os
+import time
+
+from src import settings
+from src.metrics import hash_payload
+
+
+# Extensions of cProfile and tracemalloc profiles
+CPU_PROFILE_EXTENSION = '.prof'
+
+MEMORY_PROFILE_EXTENSION = '.tracemalloc'
+
+MEMORY_PEAK_EXTENSION = '.memory.json'
+
+# Number of frames stored for every allocation
+TRACEMALLOC_FRAMES = 10
+
+
+def profile_sampled(handler_function):
+    """Decorate handler, so that sampled invocations are profiled
+    """
+    @functools.wraps(handler_function)
+    def profiled_handler(event, context):
+        if settings.PROFILE == settings.NO_PROFILE or \
+                not _is_sampled(settings.PROFILE_RATE):
+            return handler_function(event, context)
+        return profile_call(handler_function, event, context)
+    return profiled_handler
+
+
+def _is_sampled(rate):
+    """Check if invocation is sampled with probability *rate*
+    """
+    # Imported here: random is not needed if profiling is disabled
+    import random
+    return random.random() < rate
+
+
+def profile_call(handler_function, event, context):
+    """Call handler with profilers from settings.PROFILE and write
+    profiles, also if handler raises exception.
+
+    Returns:
+        Response of handler
+    """
+    import cProfile
+    import tracemalloc
+    profile_cpu = \
+        settings.PROFILE in (settings.CPU_PROFILE, settings.ALL_PROFILES)
+    profile_memory = \
+        settings.PROFILE in (settings.MEMORY_PROFILE, settings.ALL_PROFILES)
+    path = create_profile_path(
+        settings.PROFILE_DIRECTORY, handler_function.__name__, event)
+    profiler = cProfile.Profile() if profile_cpu else None
+    is_tracing = tracemalloc.is_tracing()
+    if profile_memory:
+        if not is_tracing:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        elif hasattr(tracemalloc, 'reset_peak'):
+            # Added in Python 3.9. On older versions peak of tracing,
+            # started before invocation, can be higher
+            tracemalloc.reset_peak()
+        started_size, _ = tracemalloc.get_traced_memory()
+    try:
+        if profiler is None:
+            return handler_function(event, context)
+        return profiler.runcall(handler_function, event, context)
+    finally:
+        if profile_memory:
+            size, peak_size = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            if not is_tracing:
+                tracemalloc.stop()
+            snapshot.dump(path + MEMORY_PROFILE_EXTENSION)
+            with open(path + MEMORY_PEAK_EXTENSION, 'w') as peak_file:
+                json.dump({
+                    'peak_bytes': peak_size - started_size,
+                    'held_bytes': size - started_size,
+                }, peak_file)
+        if profiler is not None:
+            profiler.dump_stats(path + CPU_PROFILE_EXTENSION)
+
+
+def create_profile_path(directory, handler_name, event):
+    """Return path to profiles of invocation without extension:
+    handler name, payload hash, time in milliseconds and process id
+    """
+    return os.path.join(
+        directory,
+        '{handler}-{payload_hash}-{time}-{pid}'.format(
+            handler=handler_name,
+            payload_hash=hash_payload(_get_payload(event)),
+            time=int(time.time() * 1000),
+            pid=os.getpid()))
+
+
+def _get_payload(event):
+    """Return query of GET request or body of POST request
+    """
+    query = (event.get('queryStringParameters') or {}).get('query')
+    if query is not None:
+        return query
+    return event.get('body') or ''
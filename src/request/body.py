@@ -0,0 +1,36 @@
+"""Parse request body
+"""
+import base64
+import binascii
+
+from src.exceptions import ValueErrorWithMessage
+
+
+class BodyError(ValueErrorWithMessage):
+    """Error to be raised if request body is missing or can not be decoded
+    """
+    pass
+
+
+def get_body(request):
+    """Get body from request
+
+    Decodes body from base64 if API Gateway marked it as base64 encoded.
+    Raises BodyError if body is missing or can not be decoded
+    Raises KeyError if request format is invalid
+
+    Args:
+        request (dict)
+
+    Returns:
+        Request body
+    """
+    body = request['body']
+    if not body:
+        raise BodyError('Request body is missing')
+    if not request.get('isBase64Encoded'):
+        return body
+    try:
+        return base64.b64decode(body)
+    except binascii.Error:
+        raise BodyError('Invalid base64 format')
@@ -0,0 +1,59 @@
+"""Parse request headers
+"""
+
+
+def get_header(request, header_name):
+    """Get header value from request. Header names are case-insensitive,
+    as client can send them in any case
+
+    Args:
+        request (dict)
+        header_name (str): Header name
+
+    Returns:
+        Header value or None if header is missing
+    """
+    headers = request.get('headers') or {}
+    header_name = header_name.lower()
+    for name, value in headers.items():
+        if name.lower() == header_name:
+            return value
+    return None
+
+
+def get_accepted_encoding(request, encodings):
+    """Choose content encoding of response from Accept-Encoding header.
+    Encodings with the same quality are preferred in order of *encodings*,
+    "*" matches encodings, which are not listed in header
+
+    Args:
+        request (dict)
+        encodings (list): Supported encodings in order of preference
+
+    Returns:
+        Encoding with the highest quality or None if client does not
+        accept any of *encodings* or header is missing
+    """
+    header = get_header(request, 'Accept-Encoding')
+    if not header:
+        return None
+    qualities = {}
+    for coding in header.split(','):
+        name, *params = coding.split(';')
+        quality = 1.0
+        for param in params:
+            param_name, _, value = param.partition('=')
+            if param_name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.strip().lower()] = quality
+    accepted_encoding = None
+    accepted_quality = 0.0
+    for encoding in encodings:
+        quality = qualities.get(encoding, qualities.get('*', 0.0))
+        if quality > accepted_quality:
+            accepted_encoding = encoding
+            accepted_quality = quality
+    return accepted_encoding
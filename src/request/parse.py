@@ -28,7 +28,21 @@ def decode_and_load_json(query):
         decoded_query = base64.b64decode(query)
     except binascii.Error:
         raise ParseError('Invalid base64 format')
+    return load_json(decoded_query)
+
+
+def load_json(document):
+    """Parse json
+
+    Throws ParseError if json is invalid
+
+    Args:
+        document (str or bytes): json document
+
+    Returns:
+        Parsed JSON document
+    """
     try:
-        return json.loads(decoded_query)
-    except json.JSONDecodeError:
+        return json.loads(document)
+    except (json.JSONDecodeError, UnicodeDecodeError):
         raise ParseError('Invalid json format')
@@ -29,3 +29,35 @@ def get_query_param(request, query_param):
         raise QueryError(
             'Query parameter "{parameter}" is missing'.
             format(parameter=query_param))
+
+
+def get_integer_query_param(request, query_param, min_value, max_value):
+    """Get integer query parameter value from request
+
+    Raises QueryError if parameter is missing or is not integer
+    from *min_value* to *max_value*
+    Raises KeyError if request format is invalid
+
+    Args:
+        request (dict)
+        query_param (str): Parameter name
+        min_value (int): Minimal allowed value
+        max_value (int): Maximal allowed value
+
+    Returns:
+        Query parameter value converted to int
+    """
+    value = get_query_param(request, query_param)
+    try:
+        value = int(value)
+    except ValueError:
+        value = None
+    if value is None or not min_value <= value <= max_value:
+        raise QueryError(
+            'Query parameter "{parameter}" should be integer '
+            'from {min_value} to {max_value}'.
+            format(
+                parameter=query_param,
+                min_value=min_value,
+                max_value=max_value))
+    return value
@@ -1,11 +1,25 @@
 """Validate request schema
+
+Schemas are fixed, so instead of interpreting them with jsonschema
+on every request, validation is done by functions specialized
+for exactly these schemas. Error messages are the same as
+jsonschema would produce for the first found error.
 """
-from jsonschema import validate
+import numbers
 
 from src.constants import DAYS_OF_WEEK
+from src.exceptions import ValueErrorWithMessage
+
+
+HOUR_TYPES = ['open', 'close']
+
+MIN_HOUR_VALUE = 0
 
+MAX_HOUR_VALUE = 86399  # Max value for working hour (11.59:59 PM)
 
-# JSON schema for working hours request
+# JSON schema for working hours request.
+# Used as specification of validate_request and as reference
+# implementation in tests and benchmarks
 
 ONE_DAY_SCHEMA = {
     "type": "array",
@@ -14,12 +28,12 @@ ONE_DAY_SCHEMA = {
         "properties": {
             "type": {
                 "type": "string",
-                "enum": ["open", "close"]
+                "enum": HOUR_TYPES
             },
             "value": {
                 "type": "number",
-                "minimum": 0,
-                "maximum": 86399,  # Max value for working hour (11.59:59 PM)
+                "minimum": MIN_HOUR_VALUE,
+                "maximum": MAX_HOUR_VALUE,
                 "exclusiveMaximum": False
             },
         },
@@ -36,10 +50,167 @@ WORKING_HOURS_SCHEMA = {
     "required": DAYS_OF_WEEK
 }
 
+# JSON schema for batch request.
+# Working hours of every item are validated separately,
+# so one invalid item does not fail the whole batch
+
+BATCH_SCHEMA = {
+    "type": "array"
+}
+
+BATCH_ITEM_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "id": {
+            "type": ["string", "integer"]
+        },
+        "working_hours": {
+            "type": "object"
+        }
+    },
+    "required": ["id", "working_hours"]
+}
+
+
+class ValidationError(ValueErrorWithMessage):
+    """Error to be raised if request does not match schema
+
+    Pointer is JSON pointer to the invalid value or missing property
+    """
+    pass
+
 
 def validate_request(request):
-    """Validate request using jsonschema
+    """Validate request against WORKING_HOURS_SCHEMA
+
+    Raises ValidationError if request is invalid
+    """
+    if not isinstance(request, dict):
+        raise _create_type_error(request, 'object')
+    for day_of_week in DAYS_OF_WEEK:
+        if day_of_week in request:
+            validate_day(request[day_of_week], day_of_week)
+    _check_required(request, DAYS_OF_WEEK)
+
+
+def validate_day(hours, day_of_week):
+    """Validate working hours of one day against ONE_DAY_SCHEMA
+
+    Raises ValidationError if hours are invalid
+    """
+    if not isinstance(hours, list):
+        raise _create_type_error(hours, 'array', pointer='/' + day_of_week)
+    for index, hour in enumerate(hours):
+        try:
+            validate_hour(hour)
+        except ValidationError as err:
+            prepend_to_pointer(err, day_of_week, index)
+            raise
+
+
+def validate_hour(hour):
+    """Validate one opening or closing hour against ONE_DAY_SCHEMA items
+
+    Raises ValidationError if hour is invalid.
+    Error pointer is relative to the hour
+    """
+    if not isinstance(hour, dict):
+        raise _create_type_error(hour, 'object')
+    if 'type' in hour:
+        hour_type = hour['type']
+        if not isinstance(hour_type, str):
+            raise _create_type_error(hour_type, 'string', pointer='/type')
+        if hour_type not in HOUR_TYPES:
+            raise ValidationError(
+                '%r is not one of %r' % (hour_type, HOUR_TYPES),
+                pointer='/type')
+    if 'value' in hour:
+        value = hour['value']
+        if not _is_number(value):
+            raise _create_type_error(value, 'number', pointer='/value')
+        if value < MIN_HOUR_VALUE:
+            raise ValidationError(
+                '%r is less than the minimum of %r' % (
+                    value, MIN_HOUR_VALUE),
+                pointer='/value')
+        if value > MAX_HOUR_VALUE:
+            raise ValidationError(
+                '%r is greater than the maximum of %r' % (
+                    value, MAX_HOUR_VALUE),
+                pointer='/value')
+    if 'type' not in hour or 'value' not in hour:
+        _check_required(hour, ('type', 'value'))
+
+
+def validate_batch_request(request):
+    """Validate that batch request is a list of items
+
+    Raises ValidationError if request is invalid
+    """
+    if not isinstance(request, list):
+        raise _create_type_error(request, 'array')
+
+
+def validate_batch_item(item):
+    """Validate that batch item has id and working hours
+
+    Working hours themselves are validated with *validate_request*
+
+    Raises ValidationError if item is invalid
+    """
+    if not isinstance(item, dict):
+        raise _create_type_error(item, 'object')
+    if 'id' in item:
+        item_id = item['id']
+        if not isinstance(item_id, str) and not _is_integer(item_id):
+            raise _create_type_error(
+                item_id, 'string', 'integer', pointer='/id')
+    if 'working_hours' in item and \
+            not isinstance(item['working_hours'], dict):
+        raise _create_type_error(
+            item['working_hours'], 'object', pointer='/working_hours')
+    _check_required(item, ('id', 'working_hours'))
+
+
+def prepend_to_pointer(err, *tokens):
+    """Make error pointer relative to the parent of invalid value.
+    *tokens* are keys or indexes of the path from parent to the value
+    """
+    err.pointer = ''.join(
+        '/{}'.format(token) for token in tokens) + (err.pointer or '')
+
+
+def _is_number(value):
+    """Check if value is a number. Booleans are not numbers in JSON schema
+    """
+    value_type = value.__class__
+    if value_type is int or value_type is float:
+        return True
+    return isinstance(value, numbers.Number) and \
+        not isinstance(value, bool)
+
+
+def _is_integer(value):
+    """Check if value is an integer. Booleans are not integers in JSON schema
+    """
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _check_required(instance, properties):
+    """Raise ValidationError for the first missing property.
+    Error points to the missing property
+    """
+    for property_name in properties:
+        if property_name not in instance:
+            raise ValidationError(
+                '%r is a required property' % property_name,
+                pointer='/' + property_name)
+
 
-    Raises jsonschema.ValidationError if request is invalid
+def _create_type_error(instance, *types, pointer=''):
+    """Create error for instance, which does not have any of *types*
     """
-    validate(request, WORKING_HOURS_SCHEMA)
+    return ValidationError(
+        '%r is not of type %s' % (
+            instance, ', '.join(repr(type_) for type_ in types)),
+        pointer=pointer)
@@ -1,7 +1,13 @@
 """Helpers to create response dict
 """
 import json
-import http
+
+
+# HTTP status codes. http.HTTPStatus is not used on purpose:
+# creating this enum takes noticeable part of AWS Lambda cold start
+HTTP_STATUS_OK = 200
+HTTP_STATUS_BAD_REQUEST = 400
+HTTP_STATUS_UNPROCESSABLE_ENTITY = 422
 
 
 def _create_response(status_code, body):
@@ -13,31 +19,44 @@ def _create_response(status_code, body):
     }
 
 
-def _create_error_response(status_code, error_message):
-    """Create response with status code from args request
-    and JSON body: { "error": error_message }
+def _create_error_body(error_message, pointer):
+    """Create error body: { "error": error_message, "pointer": pointer }
+    Pointer is JSON pointer to invalid part of request, added if known
     """
     body = {
         'error': error_message
     }
-    return _create_response(status_code, body)
+    if pointer is not None:
+        body['pointer'] = pointer
+    return body
 
 
-def create_bad_request_response(error_message):
+def _create_error_response(status_code, error_message, pointer):
+    """Create response with status code from args request
+    and JSON body: { "error": error_message, "pointer": pointer }
+    """
+    return _create_response(
+        status_code, _create_error_body(error_message, pointer))
+
+
+def create_bad_request_response(error_message, pointer=None):
     """Create response with status code 400 bad request
-    and JSON body: { "error": error_message }
+    and JSON body: { "error": error_message, "pointer": pointer }
     """
     return _create_error_response(
-        status_code=http.HTTPStatus.BAD_REQUEST, error_message=error_message)
+        status_code=HTTP_STATUS_BAD_REQUEST,
+        error_message=error_message,
+        pointer=pointer)
 
 
-def create_unprocessable_entity_response(error_message):
+def create_unprocessable_entity_response(error_message, pointer=None):
     """Create response with status code 422 unprocessable entity
-    and JSON body: { "error": error_message }
+    and JSON body: { "error": error_message, "pointer": pointer }
     """
     return _create_error_response(
-        status_code=http.HTTPStatus.UNPROCESSABLE_ENTITY,
-        error_message=error_message)
+        status_code=HTTP_STATUS_UNPROCESSABLE_ENTITY,
+        error_message=error_message,
+        pointer=pointer)
 
 
 def create_successfull_resonse(body):
@@ -45,4 +64,46 @@ def create_successfull_resonse(body):
     and JSON body received as argument
     """
     return _create_response(
-        status_code=http.HTTPStatus.OK, body=body)
+        status_code=HTTP_STATUS_OK, body=body)
+
+
+def create_batch_item_result(item_id, status_code, body):
+    """Create result of one batch item with its id, status code
+    and fields from *body*.
+    Batch items are serialized together with the whole batch response
+    """
+    return {
+        'id': item_id,
+        'status': status_code,
+        **body
+    }
+
+
+def create_successfull_batch_item_result(item_id, body):
+    """Create batch item result with status code 200 ok
+    and fields from *body*
+    """
+    return create_batch_item_result(
+        item_id=item_id, status_code=HTTP_STATUS_OK, body=body)
+
+
+def create_bad_request_batch_item_result(
+        item_id, error_message, pointer=None):
+    """Create batch item result with status code 400 bad request
+    and error message: { "error": error_message, "pointer": pointer }
+    """
+    return create_batch_item_result(
+        item_id=item_id,
+        status_code=HTTP_STATUS_BAD_REQUEST,
+        body=_create_error_body(error_message, pointer))
+
+
+def create_unprocessable_entity_batch_item_result(
+        item_id, error_message, pointer=None):
+    """Create batch item result with status code 422 unprocessable entity
+    and error message: { "error": error_message, "pointer": pointer }
+    """
+    return create_batch_item_result(
+        item_id=item_id,
+        status_code=HTTP_STATUS_UNPROCESSABLE_ENTITY,
+        body=_create_error_body(error_message, pointer))
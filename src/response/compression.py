@@ -0,0 +1,60 @@
+"""Compress response body with encoding, accepted by client.
+
+API Gateway passes binary body of response base64 encoded,
+so compressed body is encoded and response is marked
+with isBase64Encoded
+"""
+import base64
+import zlib
+
+from src import settings
+
+
+GZIP_ENCODING = 'gzip'
+
+DEFLATE_ENCODING = 'deflate'
+
+# Supported encodings in order of preference
+ENCODINGS = [GZIP_ENCODING, DEFLATE_ENCODING]
+
+# zlib window bits of every encoding: gzip header and trailer
+# are written with 16 added to window size, "deflate" in HTTP
+# is zlib format
+_WINDOW_BITS = {
+    GZIP_ENCODING: 16 + zlib.MAX_WBITS,
+    DEFLATE_ENCODING: zlib.MAX_WBITS,
+}
+
+
+def should_compress(response, encoding):
+    """Return flag to show if *response* should be compressed:
+    client accepts *encoding*, compression is enabled
+    and body is not smaller than threshold
+    """
+    return (
+        encoding is not None and
+        settings.RESPONSE_COMPRESSION_LEVEL > 0 and
+        len(response['body']) >= settings.RESPONSE_COMPRESSION_MIN_BYTES)
+
+
+def compress_response(response, encoding):
+    """Return copy of *response* with body compressed with *encoding*
+    and encoded with base64. Content-Encoding header is added,
+    and Vary header tells HTTP caches, that body depends
+    on Accept-Encoding header of request
+    """
+    compressor = zlib.compressobj(
+        settings.RESPONSE_COMPRESSION_LEVEL, zlib.DEFLATED,
+        _WINDOW_BITS[encoding])
+    body = compressor.compress(response['body'].encode())
+    body += compressor.flush()
+    return {
+        **response,
+        'headers': {
+            **(response.get('headers') or {}),
+            'Content-Encoding': encoding,
+            'Vary': 'Accept-Encoding',
+        },
+        'body': base64.b64encode(body).decode(),
+        'isBase64Encoded': True,
+    }
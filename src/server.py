@@ -0,0 +1,694 @@
+"""HTTP server for AWS Lambda handlers.
+
+Serves handlers without API Gateway: every HTTP/1.1 request is converted
+to API Gateway proxy event, handler is called, and its response is sent
+back. Connections are kept alive, and pipelined requests are answered
+in order. Handlers are fast and synchronous, so they are called
+directly in the event loop.
+
+With --workers the server is pre-forked: master process warms up
+handlers, forks worker processes, which share listening port,
+and restarts them gracefully on SIGHUP.
+
+Run from repository root:
+python3 -m src.server [--host HOST] [--port PORT] [--workers N]
+"""
+import argparse
+import asyncio
+import base64
+import gc
+import http
+import json
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+import urllib.parse
+
+from src.exceptions import ValueErrorWithMessage
+from src.handler import (
+    batch_handler,
+    handler,
+    open_at_handler,
+    RESPONSE_CACHE
+)
+from src.response import HTTP_STATUS_BAD_REQUEST
+
+
+logger = logging.getLogger(__name__)
+
+# Handler and HTTP method of every path, as in template.yaml.
+# Paths are matched without trailing slash
+ROUTES = {
+    '/openinghours': ('GET', handler),
+    '/openinghours/batch': ('POST', batch_handler),
+    '/openinghours/open': ('GET', open_at_handler),
+}
+
+# Maximal size of request body, the same as in API Gateway
+MAX_BODY_BYTES = 10 * 2 ** 20
+
+# Seconds to wait for the next request on idle connection
+KEEP_ALIVE_TIMEOUT = 60
+
+# Seconds to wait for responses to requests in progress, when server stops
+GRACEFUL_SHUTDOWN_TIMEOUT = 30
+
+# Maximal number of connections waiting to be accepted
+LISTEN_BACKLOG = 1024
+
+# Worker, which exits faster, is not restarted: it would fail again
+MIN_WORKER_LIFETIME = 1
+
+# Signals, handled by master process of worker pool
+MASTER_SIGNALS = {signal.SIGCHLD, signal.SIGHUP, signal.SIGINT, signal.SIGTERM}
+
+# Working hours used to warm up handlers, with shift closing on the next day
+WARM_UP_WORKING_HOURS = {
+    'monday': [],
+    'tuesday': [
+        {'type': 'open', 'value': 36000},
+        {'type': 'close', 'value': 64800},
+    ],
+    'wednesday': [],
+    'thursday': [],
+    'friday': [{'type': 'open', 'value': 64800}],
+    'saturday': [{'type': 'close', 'value': 3600}],
+    'sunday': [],
+}
+
+HTTP_STATUS_NOT_FOUND = 404
+
+HTTP_STATUS_METHOD_NOT_ALLOWED = 405
+
+HTTP_STATUS_PAYLOAD_TOO_LARGE = 413
+
+HTTP_STATUS_INTERNAL_SERVER_ERROR = 500
+
+HTTP_STATUS_NOT_IMPLEMENTED = 501
+
+
+class RequestError(ValueErrorWithMessage):
+    """Error to be raised if HTTP request can not be served.
+    Connection is closed after error response
+    """
+
+    def __init__(self, status_code, message):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class Request:
+    """
+    Parsed HTTP request
+
+    Attributes:
+        method (str): HTTP method
+        target (str): Request target: path and query string
+        version (str): HTTP version, for example "HTTP/1.1"
+        headers (dict): Headers with names as sent by client
+        body (bytes): Request body
+    """
+
+    __slots__ = ('method', 'target', 'version', 'headers', 'body')
+
+    def __init__(self, method, target, version, headers, body=b''):
+        """Return a Request object
+        """
+        self.method = method
+        self.target = target
+        self.version = version
+        self.headers = headers
+        self.body = body
+
+    def get_header(self, name, default=None):
+        """Return value of header *name* regardless of case
+        """
+        name = name.lower()
+        for header_name, value in self.headers.items():
+            if header_name.lower() == name:
+                return value
+        return default
+
+    @property
+    def keep_alive(self):
+        """Returns flag to show if connection is kept open after response
+        """
+        connection = self.get_header('Connection', '').lower()
+        if self.version == 'HTTP/1.0':
+            return connection == 'keep-alive'
+        return connection != 'close'
+
+    def to_event(self):
+        """Return API Gateway proxy event for the request
+        """
+        path, _, query_string = self.target.partition('?')
+        query = _parse_query_string(query_string)
+        try:
+            body = self.body.decode()
+            is_base64_encoded = False
+        except UnicodeDecodeError:
+            body = base64.b64encode(self.body).decode()
+            is_base64_encoded = True
+        return {
+            'resource': path,
+            'path': path,
+            'httpMethod': self.method,
+            'headers': self.headers or None,
+            'multiValueHeaders': {
+                name: [value] for name, value in self.headers.items()
+            } or None,
+            'queryStringParameters': {
+                name: values[-1] for name, values in query.items()
+            } or None,
+            'multiValueQueryStringParameters': query or None,
+            'pathParameters': None,
+            'body': body or None,
+            'isBase64Encoded': is_base64_encoded,
+        }
+
+
+def _parse_query_string(query_string):
+    """Parse query string to dict with list of values of every parameter.
+    Plus sign is not replaced with space, as in API Gateway,
+    so base64 encoded values can be sent without escaping
+    """
+    query = {}
+    for parameter in query_string.split('&'):
+        if not parameter:
+            continue
+        name, _, value = parameter.partition('=')
+        query.setdefault(urllib.parse.unquote(name), []).append(
+            urllib.parse.unquote(value))
+    return query
+
+
+async def read_request_line(reader):
+    """Wait for request line. Empty lines before it are skipped
+
+    Returns:
+        Request line or empty bytes if connection was closed
+    """
+    request_line = await _read_line(reader)
+    while request_line == b'\r\n':
+        request_line = await _read_line(reader)
+    return request_line
+
+
+async def read_request(reader, writer, request_line):
+    """Read HTTP request with *request_line* from *reader*
+
+    Raises RequestError if request is invalid
+
+    Returns:
+        Request object
+    """
+    try:
+        method, target, version = request_line.decode('latin-1').split()
+    except ValueError:
+        raise RequestError(
+            HTTP_STATUS_BAD_REQUEST, 'Invalid request line')
+    if version not in ('HTTP/1.0', 'HTTP/1.1'):
+        raise RequestError(
+            HTTP_STATUS_NOT_IMPLEMENTED, 'Unsupported HTTP version')
+    headers = {}
+    while True:
+        line = await _read_line(reader)
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, separator, value = line.decode('latin-1').partition(':')
+        if not separator:
+            raise RequestError(HTTP_STATUS_BAD_REQUEST, 'Invalid header')
+        headers[name.strip()] = value.strip()
+    request = Request(method, target, version, headers)
+    if request.get_header('Expect', '').lower() == '100-continue':
+        writer.write(b'HTTP/1.1 100 Continue\r\n\r\n')
+    request.body = await _read_body(reader, request)
+    return request
+
+
+async def _read_line(reader):
+    """Read line, which should not be longer than reader limit
+    """
+    try:
+        return await reader.readline()
+    except ValueError:
+        raise RequestError(HTTP_STATUS_BAD_REQUEST, 'Line is too long')
+
+
+async def _read_body(reader, request):
+    """Read request body with length from Content-Length header
+    or in chunks with chunked transfer encoding
+    """
+    transfer_encoding = request.get_header('Transfer-Encoding')
+    if transfer_encoding is not None:
+        if transfer_encoding.lower() != 'chunked':
+            raise RequestError(
+                HTTP_STATUS_NOT_IMPLEMENTED, 'Unsupported transfer encoding')
+        return await _read_chunked_body(reader)
+    try:
+        content_length = int(request.get_header('Content-Length', 0))
+    except ValueError:
+        content_length = -1
+    if content_length < 0:
+        raise RequestError(
+            HTTP_STATUS_BAD_REQUEST, 'Invalid Content-Length')
+    if content_length > MAX_BODY_BYTES:
+        raise RequestError(
+            HTTP_STATUS_PAYLOAD_TOO_LARGE, 'Request body is too large')
+    return await _read_exactly(reader, content_length)
+
+
+async def _read_chunked_body(reader):
+    """Read body sent with chunked transfer encoding
+    """
+    chunks = []
+    size = 0
+    while True:
+        size_line = await _read_line(reader)
+        try:
+            chunk_size = int(size_line.split(b';')[0], 16)
+        except ValueError:
+            raise RequestError(HTTP_STATUS_BAD_REQUEST, 'Invalid chunk size')
+        size += chunk_size
+        if size > MAX_BODY_BYTES:
+            raise RequestError(
+                HTTP_STATUS_PAYLOAD_TOO_LARGE, 'Request body is too large')
+        if not chunk_size:
+            break
+        chunks.append(await _read_exactly(reader, chunk_size))
+        await _read_line(reader)
+    # Skip trailers
+    while (await _read_line(reader)) not in (b'\r\n', b'\n', b''):
+        pass
+    return b''.join(chunks)
+
+
+async def _read_exactly(reader, size):
+    """Read *size* bytes of body
+    """
+    try:
+        return await reader.readexactly(size)
+    except asyncio.IncompleteReadError:
+        raise RequestError(HTTP_STATUS_BAD_REQUEST, 'Incomplete body')
+
+
+def serve_request(request):
+    """Call handler of request path and return its response
+
+    Returns:
+        Response dict in format of AWS Lambda handler response
+    """
+    path = request.target.partition('?')[0].rstrip('/') or '/'
+    try:
+        method, route_handler = ROUTES[path]
+    except KeyError:
+        return _create_error_response(HTTP_STATUS_NOT_FOUND, 'Not found')
+    if request.method != method:
+        response = _create_error_response(
+            HTTP_STATUS_METHOD_NOT_ALLOWED, 'Method not allowed')
+        response['headers'] = {'Allow': method}
+        return response
+    try:
+        return route_handler(request.to_event(), None)
+    except Exception:
+        # AWS Lambda responds with 502 through API Gateway,
+        # here error is logged and connection is kept
+        logger.exception('Handler failed')
+        return _create_error_response(
+            HTTP_STATUS_INTERNAL_SERVER_ERROR, 'Internal server error')
+
+
+def _create_error_response(status_code, error_message):
+    """Create response of the server itself
+    """
+    return {
+        'statusCode': status_code,
+        'body': json.dumps({'error': error_message})
+    }
+
+
+def serialize_response(response, keep_alive):
+    """Serialize handler response to HTTP/1.1 response
+
+    Args:
+        response (dict): Handler response with 'statusCode', 'body'
+        and optional 'headers' and 'isBase64Encoded'
+        keep_alive (bool): Keep connection open after response
+
+    Returns:
+        Response bytes
+    """
+    status_code = response['statusCode']
+    body = response.get('body') or ''
+    if response.get('isBase64Encoded'):
+        body = base64.b64decode(body)
+    else:
+        body = body.encode()
+    headers = {
+        'Content-Type': 'application/json',
+        **(response.get('headers') or {}),
+        'Content-Length': str(len(body)),
+        'Connection': 'keep-alive' if keep_alive else 'close',
+    }
+    lines = ['HTTP/1.1 {status_code} {reason}'.format(
+        status_code=status_code, reason=_get_reason_phrase(status_code))]
+    lines.extend(
+        '{name}: {value}'.format(name=name, value=value)
+        for name, value in headers.items())
+    lines.extend(['', ''])
+    return '\r\n'.join(lines).encode('latin-1') + body
+
+
+def _get_reason_phrase(status_code):
+    """Return reason phrase of HTTP status code
+    """
+    try:
+        return http.HTTPStatus(status_code).phrase
+    except ValueError:
+        return ''
+
+
+class HttpServer:
+    """
+    HTTP server for ROUTES, which can be stopped gracefully
+
+    Attributes:
+        server (asyncio.Server): Listening server, None before start
+        connections (dict): Tasks, serving open connections.
+        Value is True if connection is idle: it was kept alive
+        after response and waits for the next request
+        is_closing (bool): Server is being stopped. Connections are closed
+        after current request
+    """
+
+    def __init__(self):
+        """Return HttpServer, which is not started
+        """
+        self.server = None
+        self.connections = {}
+        self.is_closing = False
+
+    @property
+    def sockets(self):
+        """Returns listening sockets
+        """
+        return self.server.sockets
+
+    async def start(self, host=None, port=None, sock=None, reuse_port=None):
+        """Start listening on *host* and *port* or on listening socket *sock*
+        """
+        self.server = await asyncio.start_server(
+            self.handle_connection, host=host, port=port, sock=sock,
+            reuse_port=reuse_port)
+
+    async def shutdown(self, timeout=GRACEFUL_SHUTDOWN_TIMEOUT):
+        """Stop accepting connections, close idle connections and wait
+        up to *timeout* seconds until other connections get responses
+        """
+        self.is_closing = True
+        self.server.close()
+        # Let connections, which were just accepted, start.
+        # They are answered: client has already sent request
+        await asyncio.sleep(0)
+        for task, is_idle in list(self.connections.items()):
+            if is_idle:
+                task.cancel()
+        if self.connections:
+            _, not_done = await asyncio.wait(
+                list(self.connections), timeout=timeout)
+            for task in not_done:
+                task.cancel()
+        await self.server.wait_closed()
+
+    async def handle_connection(self, reader, writer):
+        """Serve requests from one connection until client closes it,
+        asks to close it, connection is idle for KEEP_ALIVE_TIMEOUT,
+        or server is stopped.
+
+        Pipelined requests are read from the same buffer
+        one after another, so responses are sent in order
+        """
+        task = asyncio.current_task()
+        self.connections[task] = False
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(
+                        read_request_line(reader), KEEP_ALIVE_TIMEOUT)
+                    if not request_line:
+                        break
+                    self.connections[task] = False
+                    request = await asyncio.wait_for(
+                        read_request(reader, writer, request_line),
+                        KEEP_ALIVE_TIMEOUT)
+                except RequestError as err:
+                    writer.write(serialize_response(
+                        _create_error_response(
+                            err.status_code, err.message),
+                        keep_alive=False))
+                    break
+                except asyncio.TimeoutError:
+                    break
+                keep_alive = request.keep_alive and not self.is_closing
+                writer.write(
+                    serialize_response(serve_request(request), keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+                self.connections[task] = True
+            await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.connections.pop(task, None)
+            writer.close()
+
+
+async def serve_until_terminated(
+        host=None, port=None, sock=None, reuse_port=None):
+    """Serve requests until SIGTERM, then stop gracefully
+    """
+    server = HttpServer()
+    await server.start(host, port, sock, reuse_port)
+    for listening_socket in server.sockets:
+        logger.info(
+            'Process %d is serving on %s:%s', os.getpid(),
+            *listening_socket.getsockname()[:2])
+    terminated = asyncio.Event()
+    asyncio.get_running_loop().add_signal_handler(
+        signal.SIGTERM, terminated.set)
+    await terminated.wait()
+    await server.shutdown()
+
+
+def warm_up():
+    """Call every handler once, so that lazily imported modules
+    and caches are ready. Cached responses are removed
+    """
+    query = base64.b64encode(
+        json.dumps(WARM_UP_WORKING_HOURS).encode()).decode()
+    for event, route_handler in [
+            ({'queryStringParameters': {'query': query}}, handler),
+            ({'queryStringParameters': {'query': query, 'at': '0'}},
+             open_at_handler),
+            ({'body': json.dumps([{
+                'id': 1, 'working_hours': WARM_UP_WORKING_HOURS}]),
+              'isBase64Encoded': False}, batch_handler)]:
+        route_handler(event, None)
+    RESPONSE_CACHE.clear()
+
+
+class WorkerPool:
+    """
+    Pre-forked worker processes, which serve requests on the same port.
+
+    Workers share listening socket of the master process, or bind
+    their own sockets with SO_REUSEPORT, and kernel distributes
+    connections between them. Master process restarts workers,
+    which exit unexpectedly, and handles signals:
+    - SIGTERM, SIGINT: stop workers gracefully and exit
+    - SIGHUP: start new workers and stop old ones gracefully
+
+    Attributes:
+        workers_count (int): Number of workers
+        host (str)
+        port (int)
+        reuse_port (bool): Workers bind own sockets with SO_REUSEPORT
+        sock (socket.socket): Listening socket, shared by workers.
+        None if workers bind own sockets
+        generation (int): Number of restarts. Only workers
+        of current generation are restarted if they exit
+        workers (dict): Generation and start time of every worker pid
+        is_stopping (bool): Workers are being stopped
+    """
+
+    def __init__(self, workers_count, host, port, reuse_port=False):
+        """Return WorkerPool without workers
+        """
+        self.workers_count = workers_count
+        self.host = host
+        self.port = port
+        self.reuse_port = reuse_port
+        self.sock = None
+        self.generation = 0
+        self.workers = {}
+        self.is_stopping = False
+
+    def run(self):
+        """Fork workers and supervise them until they are stopped
+
+        Raises RuntimeError if worker exits right after start
+        """
+        if not self.reuse_port:
+            self.sock = socket.create_server(
+                (self.host, self.port), backlog=LISTEN_BACKLOG)
+        # Imports and caches are shared by workers as copy-on-write memory.
+        # Objects are moved out of garbage collector, which would
+        # otherwise touch, and so copy, them in every worker
+        warm_up()
+        gc.collect()
+        gc.freeze()
+        signal.pthread_sigmask(signal.SIG_BLOCK, MASTER_SIGNALS)
+        try:
+            for _ in range(self.workers_count):
+                self._spawn_worker()
+            self._supervise()
+        finally:
+            if self.sock is not None:
+                self.sock.close()
+
+    def _supervise(self):
+        """Handle signals until all workers are stopped
+        """
+        deadline = None
+        while self.workers:
+            if deadline is None:
+                signal_info = signal.sigwaitinfo(MASTER_SIGNALS)
+            else:
+                signal_info = signal.sigtimedwait(
+                    MASTER_SIGNALS, max(deadline - time.monotonic(), 0))
+            if signal_info is None:
+                # Workers did not stop in time
+                for pid in self.workers:
+                    os.kill(pid, signal.SIGKILL)
+                deadline = None
+            elif signal_info.si_signo == signal.SIGCHLD:
+                self._reap_workers()
+            elif signal_info.si_signo == signal.SIGHUP:
+                self._restart_workers()
+            elif not self.is_stopping:
+                self.is_stopping = True
+                deadline = time.monotonic() + GRACEFUL_SHUTDOWN_TIMEOUT + 1
+                self._stop_workers(list(self.workers))
+
+    def _spawn_worker(self):
+        """Fork worker process
+        """
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker()
+        self.workers[pid] = (self.generation, time.monotonic())
+
+    def _run_worker(self):
+        """Serve requests in forked worker process and exit
+        """
+        exit_code = 0
+        try:
+            # Interrupt from terminal and restart are handled by master
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, MASTER_SIGNALS)
+            if self.sock is None:
+                asyncio.run(serve_until_terminated(
+                    self.host, self.port, reuse_port=True))
+            else:
+                asyncio.run(serve_until_terminated(sock=self.sock))
+        except Exception:
+            logger.exception('Worker %d failed', os.getpid())
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def _reap_workers(self):
+        """Wait for exited workers and replace workers
+        of current generation
+        """
+        while True:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if not pid:
+                return
+            generation, started = self.workers.pop(pid, (None, None))
+            if self.is_stopping or generation != self.generation:
+                continue
+            if time.monotonic() - started < MIN_WORKER_LIFETIME:
+                self.is_stopping = True
+                self._stop_workers(list(self.workers))
+                raise RuntimeError(
+                    'Worker {} exited right after start'.format(pid))
+            logger.warning('Worker %d exited, starting new one', pid)
+            self._spawn_worker()
+
+    def _restart_workers(self):
+        """Start new generation of workers and stop old workers
+        """
+        if self.is_stopping:
+            return
+        old_workers = list(self.workers)
+        self.generation += 1
+        for _ in range(self.workers_count):
+            self._spawn_worker()
+        self._stop_workers(old_workers)
+
+    def _stop_workers(self, pids):
+        """Ask workers to stop gracefully
+        """
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+
+def main(arguments):
+    """Main script
+
+    Serve handlers on host and port in one process
+    or with pool of worker processes
+    """
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        '--host', help="Host to listen on", type=str, default='127.0.0.1')
+    parser.add_argument(
+        '--port', help="Port to listen on", type=int, default=3000)
+    parser.add_argument(
+        '--workers', help="Number of pre-forked worker processes",
+        type=int, default=None)
+    parser.add_argument(
+        '--reuse-port', help="Workers bind own sockets with SO_REUSEPORT "
+        "instead of sharing socket of master process",
+        action='store_true')
+    args = parser.parse_args(arguments)
+    if args.workers is not None and args.workers < 1:
+        parser.error('--workers should be positive')
+    logging.basicConfig(level=logging.INFO)
+    if args.workers is not None:
+        WorkerPool(
+            args.workers, args.host, args.port, args.reuse_port).run()
+        return
+    try:
+        asyncio.run(serve_until_terminated(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
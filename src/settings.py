@@ -0,0 +1,95 @@
+"""Service settings, configured with environment variables
+"""
+import os
+
+
+REFERENCE_PIPELINE = 'reference'
+
+FUSED_PIPELINE = 'fused'
+
+# Pipeline, which validates request and creates week:
+# - "fused": one pass over request, see src.pipeline
+# - "reference": validate whole request, then create week
+PIPELINE = os.environ.get('OPENING_HOURS_PIPELINE', FUSED_PIPELINE)
+
+STRICT_SHIFTS = 'strict'
+
+NORMALIZED_SHIFTS = 'normalize'
+
+# How shifts are created from hours of every day:
+# - "strict": hours should be sorted, every opening hour is followed
+#   by closing hour, otherwise request is rejected
+# - "normalize": hours can be in any order, overlapping and touching
+#   shifts are merged, see src.pipeline.create_normalized_week
+SHIFTS = os.environ.get('OPENING_HOURS_SHIFTS', STRICT_SHIFTS)
+
+DAYS_OUTPUT = 'days'
+
+COMPACT_OUTPUT = 'compact'
+
+# How working hours are printed:
+# - "days": one string per weekday of request
+# - "compact": consecutive weekdays with the same shifts are grouped
+#   to ranges, like "Monday - Friday: 9 AM - 5 PM"
+OUTPUT = os.environ.get('OPENING_HOURS_OUTPUT', DAYS_OUTPUT)
+
+# Memory limit of in-process response cache in bytes.
+# Responses are not cached if limit is 0
+RESPONSE_CACHE_MAX_BYTES = int(
+    os.environ.get('OPENING_HOURS_RESPONSE_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+
+# zlib level of response compression from 1 (fastest) to 9 (smallest).
+# Responses are not compressed if level is 0
+RESPONSE_COMPRESSION_LEVEL = int(
+    os.environ.get('OPENING_HOURS_COMPRESSION_LEVEL', 6))
+
+# Responses with body of at least this number of bytes are compressed
+# with gzip or deflate, if client accepts it in Accept-Encoding header
+RESPONSE_COMPRESSION_MIN_BYTES = int(
+    os.environ.get('OPENING_HOURS_COMPRESSION_MIN_BYTES', 1024))
+
+# Clock used to print working hours: "12h" (10:30 PM) or "24h" (22:30)
+TIME_FORMAT_CLOCK = os.environ.get('OPENING_HOURS_CLOCK', '12h')
+
+# Locale used to print working hours, one of src.time_format.LOCALES
+TIME_FORMAT_LOCALE = os.environ.get('OPENING_HOURS_LOCALE', 'en')
+
+NO_METRICS = 'off'
+
+HOOKS_METRICS = 'hooks'
+
+EMF_METRICS = 'emf'
+
+# Latency of handler stages, see src.metrics:
+# - "off": stages are not timed
+# - "hooks": durations are passed to metrics hooks and slow requests
+#   are logged
+# - "emf": also print CloudWatch Embedded Metric Format line per request
+METRICS = os.environ.get('OPENING_HOURS_METRICS', NO_METRICS)
+
+# Requests, which take longer in milliseconds, are logged
+# with durations of stages and payload hash, if metrics are enabled
+SLOW_REQUEST_THRESHOLD_MS = float(
+    os.environ.get('OPENING_HOURS_SLOW_REQUEST_MS', 100))
+
+NO_PROFILE = 'off'
+
+CPU_PROFILE = 'cpu'
+
+MEMORY_PROFILE = 'memory'
+
+ALL_PROFILES = 'all'
+
+# Profiling of sampled handler invocations, see src.profiling:
+# - "off": invocations are not profiled
+# - "cpu": cProfile
+# - "memory": tracemalloc
+# - "all": cProfile and tracemalloc. Allocation tracing slows down
+#   code, so cProfile times are inflated
+PROFILE = os.environ.get('OPENING_HOURS_PROFILE', NO_PROFILE)
+
+# Part of invocations, which are profiled, from 0 to 1
+PROFILE_RATE = float(os.environ.get('OPENING_HOURS_PROFILE_RATE', 0.01))
+
+# Directory for profiles. /tmp is the only writable directory in AWS Lambda
+PROFILE_DIRECTORY = os.environ.get('OPENING_HOURS_PROFILE_DIR', '/tmp')
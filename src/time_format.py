@@ -0,0 +1,140 @@
+"""Format time of day in human readable format.
+
+Formatted times are precomputed once for every minute of the day,
+so formatting is a lookup in a table and does not depend
+on process locale. Seconds are not shown, so they are dropped.
+"""
+from src import settings
+
+
+TWELVE_HOUR_CLOCK = '12h'
+
+TWENTY_FOUR_HOUR_CLOCK = '24h'
+
+MINUTES_IN_DAY = 24 * 60
+
+# Words and separators used to format time in supported locales:
+# - am, pm: periods of 12-hour clock
+# - separator: separator of hours and minutes
+LOCALES = {
+    'en': {
+        'am': 'AM',
+        'pm': 'PM',
+        'separator': ':',
+    },
+    'fi': {
+        'am': 'ap.',
+        'pm': 'ip.',
+        'separator': '.',
+    },
+    'de': {
+        'am': 'vorm.',
+        'pm': 'nachm.',
+        'separator': ':',
+    },
+}
+
+_TIME_TABLES = {}
+
+
+def create_time_table(clock, locale):
+    """Create table with formatted time for every minute of the day
+
+    12-hour clock omits zero minutes: "10 AM", "10:30 AM".
+    24-hour clock always shows minutes: "10:00", "22:30".
+
+    Raises ValueError if clock or locale is not supported
+
+    Args:
+        clock (str): TWELVE_HOUR_CLOCK or TWENTY_FOUR_HOUR_CLOCK
+        locale (str): One of LOCALES
+
+    Returns:
+        Tuple with formatted time. Index is minute of the day
+    """
+    try:
+        words = LOCALES[locale]
+    except KeyError:
+        raise ValueError('Unsupported locale: {}'.format(locale))
+    if clock == TWELVE_HOUR_CLOCK:
+        format_day = _format_twelve_hour_clock
+    elif clock == TWENTY_FOUR_HOUR_CLOCK:
+        format_day = _format_twenty_four_hour_clock
+    else:
+        raise ValueError('Unsupported clock: {}'.format(clock))
+    # Table is created at import, so hours and minutes are formatted
+    # separately and concatenated to keep cold start short
+    return tuple(format_day(range(24), words))
+
+
+def get_time_table(clock=None, locale=None):
+    """Return table with formatted time for every minute of the day.
+    Tables are created once and reused.
+
+    Clock and locale from settings are used by default
+    """
+    key = (
+        clock or settings.TIME_FORMAT_CLOCK,
+        locale or settings.TIME_FORMAT_LOCALE)
+    try:
+        return _TIME_TABLES[key]
+    except KeyError:
+        return _TIME_TABLES.setdefault(key, create_time_table(*key))
+
+
+def format_time(seconds, time_table=None):
+    """Format time of the day
+
+    Args:
+        seconds (int): Seconds since midnight
+        time_table (tuple): Table, created by get_time_table.
+        Default table from settings is used if it is not passed
+
+    Returns:
+        String with time in human readable format
+    """
+    return (time_table or DEFAULT_TIME_TABLE)[
+        int(seconds) // 60 % MINUTES_IN_DAY]
+
+
+def _format_twelve_hour_clock(hours, words):
+    """Format every minute of the day in 12-hour clock: "10 AM", "10:30 PM"
+    """
+    # Zero minutes are omitted
+    minutes = [''] + [
+        '{separator}{minute:02d}'.format(
+            separator=words['separator'], minute=minute)
+        for minute in range(1, 60)
+    ]
+    return [
+        str(hour % 12 or 12) + minute + period
+        for hour, period in zip(hours, _get_periods(hours, words))
+        for minute in minutes
+    ]
+
+
+def _get_periods(hours, words):
+    """Return 12-hour clock period for every hour, with leading space
+    """
+    return [
+        ' ' + (words['am'] if hour < 12 else words['pm'])
+        for hour in hours
+    ]
+
+
+def _format_twenty_four_hour_clock(hours, words):
+    """Format every minute of the day in 24-hour clock: "09:00", "22:30"
+    """
+    minutes = [
+        '{separator}{minute:02d}'.format(
+            separator=words['separator'], minute=minute)
+        for minute in range(60)
+    ]
+    return [
+        '{hour:02d}'.format(hour=hour) + minute
+        for hour in hours
+        for minute in minutes
+    ]
+
+
+DEFAULT_TIME_TABLE = get_time_table()
@@ -3,8 +3,12 @@
 - Create week and weekdays
 - Create working shifts using working hours from different day
 - Print working hour in human readable format
+- Compile week to sorted arrays of shifts
+- Find if restaurant is open at some moment and when it opens or closes next
 """
+from src.working_hours.compiled_week import CompiledWeek
 from src.working_hours.exceptions import WorkingHoursError
 from src.working_hours.shift import Shift
+from src.working_hours.timeline import Timeline
 from src.working_hours.week import Week
 from src.working_hours.weekday import Weekday
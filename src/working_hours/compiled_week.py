@@ -0,0 +1,59 @@
+"""Compiled working week.
+
+Compact representation of week for keeping many weeks in memory
+and for fast lookups: shifts are stored as sorted arrays
+of seconds since monday midnight
+"""
+import array
+
+
+# Type code of arrays with seconds: signed int, 4 bytes
+SECONDS_TYPECODE = 'i'
+
+
+class CompiledWeek:
+    """
+    Restaurant working week as sorted arrays of shift starts and ends.
+
+    Shift start and end are seconds since monday midnight.
+    Shifts are sorted by start. Shift, which ends on the next week
+    (from sunday to monday or through several days), ends after
+    the end of the week, i.e. its end is greater than SECONDS_IN_WEEK.
+
+    Attributes:
+        starts (array.array): Seconds, when shifts start
+        ends (array.array): Seconds, when shifts end
+    """
+
+    __slots__ = ('starts', 'ends')
+
+    def __init__(self, starts, ends):
+        """Return a CompiledWeek object with shifts, which
+        start at *starts* and end at *ends*.
+        Shifts are expected to be sorted by start
+        """
+        self.starts = array.array(SECONDS_TYPECODE, starts)
+        self.ends = array.array(SECONDS_TYPECODE, ends)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __iter__(self):
+        return zip(self.starts, self.ends)
+
+    def __eq__(self, other):
+        if not isinstance(other, CompiledWeek):
+            return NotImplemented
+        return self.starts == other.starts and self.ends == other.ends
+
+    def __repr__(self):
+        return 'CompiledWeek({})'.format(list(self))
+
+    @classmethod
+    def create_from_shifts(cls, shifts):
+        """Create compiled week from (start, end) pairs in any order
+        """
+        shifts = sorted(shifts)
+        return cls(
+            [start for start, _ in shifts],
+            [end for _, end in shifts])
@@ -1,12 +1,8 @@
 """Weekdays names and order numbers
 """
-
-WEEKDAYS = [
-    'monday', 'tuesday', 'wednesday',
-    'thursday', 'friday', 'saturday', 'sunday'
-]
-
-WEEKDAYS_WITH_ORDER = {
-    name: index
-    for index, name in enumerate(WEEKDAYS)
-}
+from src.constants import (
+    DAYS_OF_WEEK as WEEKDAYS,
+    DAYS_OF_WEEK_WITH_ORDER as WEEKDAYS_WITH_ORDER,
+    SECONDS_IN_DAY,
+    SECONDS_IN_WEEK
+)
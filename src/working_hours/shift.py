@@ -10,10 +10,8 @@ from src.working_hours.utils import (
     is_closing_hour,
     is_opening_hour,
 )
-from src.utils import (
-    split_to_pairs,
-    print_time
-)
+from src.time_format import format_time
+from src.utils import split_to_pairs
 
 
 class Shift:
@@ -25,36 +23,47 @@ class Shift:
     Attributes:
         open (int): UNIX time, that shows when shift starts
         close (int): UNIX time, that shows when restaurant ends
+        close_day_offset (int): Number of days between opening
+        and closing day. 1 if shift closes on the next day,
+        more if restaurant is open during the whole days between them
     """
 
-    def __init__(self, open_hour, close_hour):
+    __slots__ = ('open', 'close', 'close_day_offset')
+
+    def __init__(self, open_hour, close_hour, close_day_offset=0):
         """Return a Shift object, which start at *open_hour*
-        and ends at *close_hour*
+        and ends at *close_hour* after *close_day_offset* days
         """
         self.open = open_hour
         self.close = close_hour
+        self.close_day_offset = close_day_offset
 
     def need_closing_hour(self):
         """Check if current shift is incomplete and closing hour is missing
         """
-        return self.open and not self.close
+        return self.close is None
 
     def need_opening_hour(self):
         """Check if current shift is incomplete and opening hour is missing
         """
-        return self.close and not self.open
+        return self.open is None
 
     def to_dict(self):
         """Return dict, created from object fields
         """
-        return self.__dict__
-
-    def to_human_readable_format(self):
-        """Return string with shift opening and closing hours
+        return {
+            'open': self.open,
+            'close': self.close,
+        }
+
+    def to_human_readable_format(self, time_table=None):
+        """Return string with shift opening and closing hours.
+        Time is formatted with *time_table* from src.time_format
+        or with default one
         """
         return '{opening_hour} - {closing_hour}'.format(
-            opening_hour=print_time(self.open),
-            closing_hour=print_time(self.close)
+            opening_hour=format_time(self.open, time_table),
+            closing_hour=format_time(self.close, time_table)
         )
 
     @classmethod
@@ -140,10 +149,14 @@ class Shift:
         return cls(opening_hour['value'], closing_hour['value'])
 
     @classmethod
-    def merge_shifts(cls, shift_with_opening_hour, shift_with_closing_hour):
+    def merge_shifts(
+            cls, shift_with_opening_hour, shift_with_closing_hour,
+            close_day_offset=1):
         """Return new shift with opening hour from *shift_with_opening_hour*
-        and closing hour from *shift_with_closing_hour*
+        and closing hour from *shift_with_closing_hour*,
+        which is *close_day_offset* days later (on the next day by default)
         """
         return cls(
             shift_with_opening_hour.open,
-            shift_with_closing_hour.close)
+            shift_with_closing_hour.close,
+            close_day_offset=close_day_offset)
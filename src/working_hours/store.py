@@ -0,0 +1,142 @@
+"""Columnar store of working weeks of many restaurants.
+
+Working intervals of all restaurants are packed into flat NumPy arrays,
+so queries like "which restaurants are open at this moment" are answered
+with vectorized operations instead of loop over Week objects.
+
+Depends on NumPy, which is not a runtime dependency of AWS Lambda
+handler, so the store is not imported by src.working_hours package.
+"""
+import numpy
+
+from src.pipeline import create_week
+from src.working_hours.constants import SECONDS_IN_WEEK
+
+
+class WeekStore:
+    """
+    Working intervals of many restaurants.
+
+    Intervals of restaurant *i* are starts[offsets[i]:offsets[i + 1]]
+    and ends[offsets[i]:offsets[i + 1]]. Intervals are seconds since monday
+    midnight within one week: interval, which starts on sunday and ends
+    on monday, is split at the end of the week. Intervals of one restaurant
+    are merged, so they do not overlap and restaurant is open
+    at some moment in at most one interval.
+
+    Attributes:
+        offsets (numpy.ndarray): Index of the first interval of every
+        restaurant and total number of intervals in the end
+        starts (numpy.ndarray): Seconds, when intervals start
+        ends (numpy.ndarray): Seconds, when intervals end
+        restaurants (numpy.ndarray): Index of restaurant of every interval
+    """
+
+    __slots__ = ('offsets', 'starts', 'ends', 'restaurants')
+
+    def __init__(self, offsets, starts, ends):
+        """Return a WeekStore object with intervals *starts* and *ends*
+        of restaurants, which begin at *offsets*
+        """
+        self.offsets = numpy.asarray(offsets, dtype=numpy.int64)
+        self.starts = numpy.asarray(starts, dtype=numpy.int32)
+        self.ends = numpy.asarray(ends, dtype=numpy.int32)
+        self.restaurants = numpy.repeat(
+            numpy.arange(len(self), dtype=numpy.int64),
+            numpy.diff(self.offsets))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def is_open_at(self, seconds):
+        """Find restaurants, which are open at *seconds* since monday midnight
+
+        Returns:
+            Boolean array, where item *i* shows if restaurant *i* is open
+        """
+        seconds %= SECONDS_IN_WEEK
+        return self._find_restaurants(
+            (self.starts <= seconds) & (seconds < self.ends))
+
+    def count_open_at(self, seconds):
+        """Count restaurants, which are open at *seconds* since monday midnight
+        """
+        seconds %= SECONDS_IN_WEEK
+        return int(numpy.count_nonzero(
+            (self.starts <= seconds) & (seconds < self.ends)))
+
+    def is_open_during(self, start, end):
+        """Find restaurants, which are open during the whole window
+        from *start* to *end*, not including *end*.
+
+        Window is seconds since monday midnight. Window, which starts
+        on sunday and ends on monday, ends after the end of the week.
+
+        Raises ValueError if window is empty or longer than week
+
+        Returns:
+            Boolean array, where item *i* shows if restaurant *i* is open
+        """
+        if not 0 < end - start <= SECONDS_IN_WEEK:
+            raise ValueError(
+                'Window should be not empty and not longer than week')
+        end -= start - start % SECONDS_IN_WEEK
+        start %= SECONDS_IN_WEEK
+        if end <= SECONDS_IN_WEEK:
+            return self._find_restaurants(
+                (self.starts <= start) & (end <= self.ends))
+        # Window continues on monday of the next week, so restaurant
+        # should be open until the end of the week and from monday midnight
+        return self._find_restaurants(
+            (self.starts <= start) & (self.ends == SECONDS_IN_WEEK)) & \
+            self._find_restaurants(
+                (self.starts == 0) & (end - SECONDS_IN_WEEK <= self.ends))
+
+    def count_open_during(self, start, end):
+        """Count restaurants, which are open during the whole window
+        from *start* to *end*, not including *end*.
+        See is_open_during
+        """
+        return int(numpy.count_nonzero(self.is_open_during(start, end)))
+
+    def _find_restaurants(self, interval_mask):
+        """Convert mask of intervals to mask of restaurants,
+        which have at least one of the intervals
+        """
+        found = numpy.zeros(len(self), dtype=bool)
+        found[self.restaurants[interval_mask]] = True
+        return found
+
+    @classmethod
+    def create_from_json(cls, schedules):
+        """Create store from list of working hours in the same format
+        as in Week.create_week_from_json
+
+        Raises ValidationError or WorkingHoursError if any working hours
+        are invalid
+        """
+        return cls.create_from_timelines(
+            create_week(json).create_timeline() for json in schedules)
+
+    @classmethod
+    def create_from_timelines(cls, timelines):
+        """Create store from Timeline objects
+        """
+        offsets = [0]
+        starts = []
+        ends = []
+        for timeline in timelines:
+            bounds = timeline.bounds
+            if bounds and bounds[-1] > SECONDS_IN_WEEK:
+                # Split interval from sunday to monday at the end of week.
+                # Its monday part is the first interval of the week
+                starts.append(0)
+                ends.append(bounds[-1] - SECONDS_IN_WEEK)
+                starts.extend(bounds[0:-1:2])
+                ends.extend(bounds[1:-1:2])
+                ends.append(SECONDS_IN_WEEK)
+            else:
+                starts.extend(bounds[0::2])
+                ends.extend(bounds[1::2])
+            offsets.append(len(starts))
+        return cls(offsets, starts, ends)
@@ -0,0 +1,128 @@
+"""Working week timeline.
+
+Answers if restaurant is open at some moment of the week and when
+it opens or closes next. Moments are seconds since monday midnight.
+Every answer is found with binary search in sorted array of bounds
+of working intervals.
+"""
+import array
+import bisect
+
+from src.working_hours.compiled_week import SECONDS_TYPECODE
+from src.working_hours.constants import SECONDS_IN_WEEK
+
+
+class Timeline:
+    """
+    Restaurant working intervals during the week.
+
+    Intervals do not overlap or touch and are sorted. They are stored
+    as flat array of bounds: [start, end, start, end, ...].
+    Interval includes its start and does not include its end.
+    Only the last interval can end after the end of the week:
+    it continues on the next week.
+
+    Attributes:
+        bounds (array.array): Starts and ends of working intervals
+    """
+
+    __slots__ = ('bounds',)
+
+    def __init__(self, bounds):
+        """Return a Timeline object with working intervals *bounds*
+        """
+        self.bounds = array.array(SECONDS_TYPECODE, bounds)
+
+    @property
+    def is_always_open(self):
+        """Returns flag to show if restaurant is open during the whole week
+        """
+        return len(self.bounds) == 2 and \
+            self.bounds[1] - self.bounds[0] >= SECONDS_IN_WEEK
+
+    def is_open_at(self, seconds):
+        """Check if restaurant is open at *seconds* since monday midnight
+        """
+        return self._find_interval(seconds) is not None
+
+    def get_next_opening(self, seconds):
+        """Return seconds since monday midnight, when restaurant opens
+        after *seconds*. If restaurant is open at *seconds*, it is the
+        next opening after current working interval ends.
+
+        Returns None if restaurant never opens or is always open
+        """
+        if not self.bounds or self.is_always_open:
+            return None
+        index = self._find_next_start(seconds)
+        return self.bounds[index] % SECONDS_IN_WEEK
+
+    def get_next_closing(self, seconds):
+        """Return seconds since monday midnight, when restaurant closes
+        after *seconds*. If restaurant is closed at *seconds*, it is the
+        end of the next working interval.
+
+        Returns None if restaurant never opens or is always open
+        """
+        if not self.bounds or self.is_always_open:
+            return None
+        interval_end = self._find_interval(seconds)
+        if interval_end is None:
+            interval_end = self.bounds[self._find_next_start(seconds) + 1]
+        return interval_end % SECONDS_IN_WEEK
+
+    def _find_interval(self, seconds):
+        """Return end of working interval, which includes *seconds*,
+        or None if restaurant is closed
+        """
+        seconds %= SECONDS_IN_WEEK
+        index = bisect.bisect_right(self.bounds, seconds)
+        if index % 2:
+            return self.bounds[index]
+        # Interval can start on sunday and continue on monday
+        if self.bounds and self.bounds[-1] > SECONDS_IN_WEEK:
+            index = bisect.bisect_right(
+                self.bounds, seconds + SECONDS_IN_WEEK)
+            if index % 2:
+                return self.bounds[index]
+        return None
+
+    def _find_next_start(self, seconds):
+        """Return index of the first interval start after *seconds*
+        """
+        seconds %= SECONDS_IN_WEEK
+        index = bisect.bisect_right(self.bounds, seconds)
+        # Skip end of the current interval
+        index += index % 2
+        if index >= len(self.bounds):
+            # Restaurant opens next week
+            index = 0
+        return index
+
+    @classmethod
+    def create_from_compiled_week(cls, compiled_week):
+        """Create timeline from compiled week.
+
+        Overlapping and touching shifts are merged into one interval.
+        Shift, which continues on monday of the next week, is merged
+        with monday shifts it overlaps or touches.
+        Shifts, which close at the same moment they open, are skipped.
+        """
+        bounds = []
+        for start, end in compiled_week:
+            if start >= end:
+                continue
+            if bounds and start <= bounds[-1]:
+                bounds[-1] = max(bounds[-1], end)
+            else:
+                bounds.extend((start, end))
+        # Merge the last interval with the first intervals of the week,
+        # which it covers after the end of the week
+        while len(bounds) > 2 and \
+                bounds[-1] >= bounds[0] + SECONDS_IN_WEEK:
+            bounds[-1] = max(bounds[-1], bounds[1] + SECONDS_IN_WEEK)
+            del bounds[:2]
+        if len(bounds) == 2 and bounds[1] - bounds[0] >= SECONDS_IN_WEEK:
+            # Restaurant is open during the whole week
+            bounds = [0, SECONDS_IN_WEEK]
+        return cls(bounds)
@@ -0,0 +1,302 @@
+"""Convert many working weeks to human readable format at once.
+
+Hours of all weeks are flattened into NumPy arrays. Shifts are created
+and checked for all weeks with array operations, and time is formatted
+with shared time table from src.time_format. Weeks, which do not pass
+fast checks, are converted one by one with src.pipeline.create_week,
+so results and errors are the same as for single week. Fast checks
+expect sorted hours, so all weeks are converted one by one,
+if shifts are normalized (see settings.SHIFTS).
+
+Depends on NumPy, which is not a runtime dependency of AWS Lambda
+handler, so the module is not imported by src.working_hours package.
+"""
+import gc
+import itertools
+import operator
+
+import numpy
+
+from src import settings
+from src.pipeline import create_week
+from src.request.validate import (
+    ValidationError,
+    MAX_HOUR_VALUE,
+    MIN_HOUR_VALUE
+)
+from src.time_format import DEFAULT_TIME_TABLE, MINUTES_IN_DAY
+from src.working_hours.constants import WEEKDAYS
+from src.working_hours.exceptions import WorkingHoursError
+
+
+DAYS_IN_WEEK = len(WEEKDAYS)
+
+_get_weekdays = operator.itemgetter(*WEEKDAYS)
+
+_get_type = operator.itemgetter('type')
+
+_get_value = operator.itemgetter('value')
+
+# Codes of hour types
+_HOUR_TYPE_CODES = {
+    'close': 0,
+    'open': 1,
+}
+
+_INVALID_HOUR_TYPE_CODE = -1
+
+
+def convert_weeks_to_human_readable_format(schedules, time_table=None):
+    """Convert working hours of many restaurants to human readable format
+
+    Args:
+        schedules (list): Working hours of restaurants in the same format
+        as in Week.create_week_from_json
+        time_table (tuple): Table, created by src.time_format.get_time_table.
+        Default table is used if it is not passed
+
+    Returns:
+        List with result for every restaurant: the same list of strings
+        as Week.to_human_readable_format returns, or ValidationError
+        or WorkingHoursError if working hours are invalid
+    """
+    # Conversion does not create reference cycles, but it creates
+    # many lists, which trigger garbage collection over all schedules
+    is_gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        if settings.SHIFTS == settings.NORMALIZED_SHIFTS:
+            return [
+                _convert_week(schedule, time_table or DEFAULT_TIME_TABLE)
+                for schedule in schedules
+            ]
+        return _convert_weeks(
+            list(schedules), time_table or DEFAULT_TIME_TABLE)
+    finally:
+        if is_gc_enabled:
+            gc.enable()
+
+
+def _convert_weeks(schedules, time_table):
+    """Convert working hours of many restaurants to human readable format.
+    See convert_weeks_to_human_readable_format
+    """
+    weekdays, hours_per_day, is_invalid = _get_all_weekdays(schedules)
+    hours = list(itertools.chain.from_iterable(weekdays))
+    is_opening, values, is_invalid_hour = _get_types_and_values(hours)
+    # Index of restaurant, weekday and position in restaurant week
+    # of every hour
+    hours_per_schedule = hours_per_day.reshape(-1, DAYS_IN_WEEK).sum(axis=1)
+    schedule_offsets = numpy.concatenate(
+        ([0], numpy.cumsum(hours_per_schedule)))
+    schedule_of_hour = numpy.repeat(
+        numpy.arange(len(schedules)), hours_per_schedule)
+    day_of_hour = numpy.repeat(
+        numpy.tile(numpy.arange(DAYS_IN_WEEK), len(schedules)),
+        hours_per_day)
+    position = numpy.arange(len(hours)) - schedule_offsets[schedule_of_hour]
+    # Hours of week alternate: opening hour is followed by closing hour.
+    # Week, which starts with closing hour, ends with opening hour of
+    # shift from sunday to monday
+    starts_with_closing = numpy.zeros(len(schedules), dtype=bool)
+    not_empty = hours_per_schedule > 0
+    starts_with_closing[not_empty] = \
+        ~is_opening[schedule_offsets[:-1][not_empty]]
+    is_opening_expected = \
+        (position + starts_with_closing[schedule_of_hour]) % 2 == 0
+    is_invalid_hour |= is_opening != is_opening_expected
+    is_invalid[schedule_of_hour[is_invalid_hour]] = True
+    is_invalid |= hours_per_schedule % 2 == 1
+    # Match every opening hour with the next closing hour
+    openings = numpy.flatnonzero(
+        is_opening & ~is_invalid[schedule_of_hour])
+    closings = openings + 1
+    is_last = position[openings] == hours_per_schedule[
+        schedule_of_hour[openings]] - 1
+    closings[is_last] = schedule_offsets[schedule_of_hour[openings[is_last]]]
+    is_same_day = (closings > openings) & \
+        (day_of_hour[closings] == day_of_hour[openings])
+    # Shift is either within one day and does not close before it opens,
+    # or it starts with the last hour of the day and ends with the first
+    # hour of one of the next days, up to the same weekday of the next
+    # week. Days between them do not have hours, restaurant is open
+    # during these days
+    is_invalid_shift = is_same_day & (values[openings] > values[closings])
+    is_invalid[schedule_of_hour[openings[is_invalid_shift]]] = True
+    is_valid_shift = ~is_invalid[schedule_of_hour[openings]]
+    openings = openings[is_valid_shift]
+    closings = closings[is_valid_shift]
+    close_day_offsets = numpy.where(
+        is_same_day[is_valid_shift], 0,
+        (day_of_hour[closings] - day_of_hour[openings] - 1) % DAYS_IN_WEEK +
+        1)
+    # Shifts are added to the day they start on in order of opening hours,
+    # as in Week, so shifts of every day are consecutive
+    days = _format_days(
+        schedule_of_hour[openings] * DAYS_IN_WEEK + day_of_hour[openings],
+        values[openings], values[closings], close_day_offsets,
+        time_table, len(weekdays))
+    results = days.reshape(-1, DAYS_IN_WEEK).tolist()
+    for index in numpy.flatnonzero(is_invalid).tolist():
+        results[index] = _convert_week(schedules[index], time_table)
+    return results
+
+
+def _convert_week(schedule, time_table):
+    """Convert working hours of one restaurant with Week
+    or return raised error
+    """
+    try:
+        return create_week(schedule).to_human_readable_format(time_table)
+    except (ValidationError, WorkingHoursError) as err:
+        return err
+
+
+def _get_all_weekdays(schedules):
+    """Return list with hours of every weekday of every restaurant,
+    array with number of hours of every weekday and mask of restaurants,
+    which do not have all weekdays as lists.
+    Hours of such restaurants are replaced with empty lists
+    """
+    is_invalid = numpy.zeros(len(schedules), dtype=bool)
+    try:
+        weekdays = list(itertools.chain.from_iterable(
+            map(_get_weekdays, schedules)))
+    except (KeyError, TypeError, IndexError):
+        weekdays = []
+        for index, schedule in enumerate(schedules):
+            try:
+                weekdays.extend(_get_weekdays(schedule))
+            except (KeyError, TypeError, IndexError):
+                weekdays.extend([[]] * DAYS_IN_WEEK)
+                is_invalid[index] = True
+    try:
+        # list.__len__ fails if weekday is not a list
+        hours_per_day = numpy.fromiter(
+            map(list.__len__, weekdays), dtype=numpy.int64,
+            count=len(weekdays))
+    except TypeError:
+        for index, weekday in enumerate(weekdays):
+            if weekday.__class__ is not list:
+                weekdays[index] = []
+                is_invalid[index // DAYS_IN_WEEK] = True
+        hours_per_day = numpy.fromiter(
+            map(len, weekdays), dtype=numpy.int64, count=len(weekdays))
+    return weekdays, hours_per_day, is_invalid
+
+
+def _get_types_and_values(hours):
+    """Return mask of opening hours, array of values of *hours* and mask
+    of hours, which do not pass fast checks. Values of such hours
+    are replaced with 0
+    """
+    try:
+        type_codes = numpy.fromiter(
+            map(_HOUR_TYPE_CODES.__getitem__, map(_get_type, hours)),
+            dtype=numpy.int8, count=len(hours))
+        values = list(map(_get_value, hours))
+    except (KeyError, TypeError, IndexError):
+        type_codes = numpy.fromiter(
+            (_get_type_code(hour) for hour in hours),
+            dtype=numpy.int8, count=len(hours))
+        values = [_get_item_or_none(hour, 'value') for hour in hours]
+    is_opening = type_codes == _HOUR_TYPE_CODES['open']
+    is_invalid = type_codes == _INVALID_HOUR_TYPE_CODE
+    if set(map(type, values)) - {int}:
+        is_invalid |= numpy.fromiter(
+            (value.__class__ is not int for value in values),
+            dtype=bool, count=len(values))
+        values = [
+            value if value.__class__ is int else 0 for value in values]
+    try:
+        values = numpy.fromiter(
+            values, dtype=numpy.int64, count=len(values))
+    except OverflowError:
+        values = numpy.array(
+            [
+                value if MIN_HOUR_VALUE <= value <= MAX_HOUR_VALUE
+                else MAX_HOUR_VALUE + 1
+                for value in values
+            ],
+            dtype=numpy.int64)
+    is_invalid |= (values < MIN_HOUR_VALUE) | (values > MAX_HOUR_VALUE)
+    values[is_invalid] = 0
+    return is_opening, values, is_invalid
+
+
+def _get_type_code(hour):
+    """Return code of hour type or _INVALID_HOUR_TYPE_CODE
+    """
+    hour_type = _get_item_or_none(hour, 'type')
+    if hour_type.__class__ is not str:
+        return _INVALID_HOUR_TYPE_CODE
+    return _HOUR_TYPE_CODES.get(hour_type, _INVALID_HOUR_TYPE_CODE)
+
+
+def _get_item_or_none(hour, key):
+    """Return item of hour or None if hour does not have it
+    """
+    try:
+        return hour[key]
+    except (KeyError, TypeError, IndexError):
+        return None
+
+
+def _format_days(
+        day_of_shift, opening_hours, closing_hours, close_day_offsets,
+        time_table, days_count):
+    """Return object array with every weekday of every restaurant
+    in human readable format
+
+    Args:
+        day_of_shift (numpy.ndarray): Index of weekday of every shift
+        in all weeks. Shifts of one weekday are consecutive
+        opening_hours (numpy.ndarray): Opening hours of shifts
+        closing_hours (numpy.ndarray): Closing hours of shifts
+        close_day_offsets (numpy.ndarray): Number of days after opening
+        day, when shifts close. Days between them do not have shifts
+        and are printed as open 24 hours
+        time_table (tuple): Table, created by src.time_format.get_time_table
+        days_count (int): Number of weekdays in all weeks
+    """
+    names = [weekday.capitalize() + ': ' for weekday in WEEKDAYS]
+    # Tables with every formatted time, prefixed with weekday name
+    # for the first shift of weekday and with comma for the others,
+    # so that every shift is formatted with one lookup in every table
+    first_opening_times = numpy.array(
+        [name + time + ' - ' for name in names for time in time_table],
+        dtype=object)
+    next_opening_times = numpy.array(
+        [', ' + time + ' - ' for time in time_table], dtype=object)
+    closing_times = numpy.array(time_table, dtype=object)
+    opening_minutes = opening_hours // 60 % MINUTES_IN_DAY
+    closing_minutes = closing_hours // 60 % MINUTES_IN_DAY
+    days = numpy.tile(
+        numpy.array([name + 'Closed' for name in names], dtype=object),
+        days_count // DAYS_IN_WEEK)
+    open_all_day = numpy.array(
+        [name + 'Open 24 hours' for name in names], dtype=object)
+    if not len(day_of_shift):
+        return days
+    week_start = day_of_shift - day_of_shift % DAYS_IN_WEEK
+    for day_offset in range(1, DAYS_IN_WEEK):
+        is_covered = close_day_offsets > day_offset
+        covered_days = week_start[is_covered] + (
+            day_of_shift[is_covered] + day_offset) % DAYS_IN_WEEK
+        days[covered_days] = open_all_day[covered_days % DAYS_IN_WEEK]
+    is_first = numpy.ones(len(day_of_shift), dtype=bool)
+    is_first[1:] = day_of_shift[1:] != day_of_shift[:-1]
+    open_days = day_of_shift[is_first]
+    days[open_days] = first_opening_times[
+        open_days % DAYS_IN_WEEK * MINUTES_IN_DAY +
+        opening_minutes[is_first]] + closing_times[closing_minutes[is_first]]
+    # Append the second, third, ... shifts of all weekdays at once
+    shift_index = numpy.arange(len(day_of_shift))
+    position = shift_index - numpy.maximum.accumulate(
+        numpy.where(is_first, shift_index, 0))
+    for shift_position in range(1, int(position.max()) + 1):
+        is_current = position == shift_position
+        days[day_of_shift[is_current]] += \
+            next_opening_times[opening_minutes[is_current]] + \
+            closing_times[closing_minutes[is_current]]
+    return days
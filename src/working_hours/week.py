@@ -3,16 +3,21 @@
 Responsible for week creation and printing in human readable format.
 Group shifts that start on one day and end on another
 """
-from src.utils import filter_dict_items
-from src.working_hours.constants import WEEKDAYS
+import itertools
+
+from src.working_hours.compiled_week import CompiledWeek
+from src.working_hours.constants import SECONDS_IN_DAY, WEEKDAYS
 from src.working_hours.exceptions import WorkingHoursError
 from src.working_hours.shift import Shift
-from src.working_hours.utils import (
-    get_or_throw_exception,
-    get_next_day)
+from src.working_hours.timeline import Timeline
+from src.working_hours.utils import get_or_throw_exception
 from src.working_hours.weekday import Weekday
 
 
+# Shifts of weekday, through which shift of previous weekday continues
+_OPEN_ALL_DAY = ((0, SECONDS_IN_DAY),)
+
+
 class Week:
     """
     Restaurant working week. Consists of weekdays, which could be None
@@ -27,6 +32,8 @@ class Week:
         sunday (working_hours.Weekday)
     """
 
+    __slots__ = tuple(WEEKDAYS)
+
     def __init__(self, **weekdays):
         """Return a Week object with weekdays from *weekdays*
         If some weekday was not passed, attribute will be set to None
@@ -47,15 +54,133 @@ class Week:
             if getattr(self, weekday)
         ]
 
-    def to_human_readable_format(self):
-        """Return string with week working hours
+    def to_human_readable_format(self, time_table=None):
+        """Return string with week working hours.
+        Time is formatted with *time_table* from src.time_format
+        or with default one
         """
+        weekdays = [getattr(self, weekday_name) for weekday_name in WEEKDAYS]
+        open_all_day = self._find_weekdays_open_all_day(weekdays)
         return [
-            getattr(self, weekday).to_human_readable_format()
-            for weekday in WEEKDAYS
-            if getattr(self, weekday)
+            weekday.to_human_readable_format(
+                time_table, open_all_day[weekday_index])
+            for weekday_index, weekday in enumerate(weekdays)
+            if weekday
         ]
 
+    def to_compact_human_readable_format(self, time_table=None):
+        """Return strings with week working hours, where consecutive
+        weekdays with the same shifts are grouped to ranges.
+        For example: "Monday - Friday: 9 AM - 5 PM".
+        Missing weekdays are printed as closed.
+        Time is formatted with *time_table* from src.time_format
+        or with default one
+        """
+        weekdays = [getattr(self, weekday_name) for weekday_name in WEEKDAYS]
+        open_all_day = self._find_weekdays_open_all_day(weekdays)
+        # Weekdays are compared by their shifts as seconds since
+        # weekday midnight, so that formatting is done once per range
+        keys = [
+            _OPEN_ALL_DAY if open_all_day[weekday_index] else tuple(
+                (shift.open,
+                 shift.close_day_offset * SECONDS_IN_DAY + shift.close)
+                for shift in weekday.shifts) if weekday else ()
+            for weekday_index, weekday in enumerate(weekdays)
+        ]
+        if all(key == () for key in keys):
+            return ['Closed all week']
+        # Shifts can overlap, so week is open 24 hours only if merged
+        # shifts cover it. Week with a closed day can not be open
+        if () not in keys and self.create_timeline().is_always_open:
+            return ['Open 24 hours']
+        human_readable_ranges = []
+        for key, indexes in itertools.groupby(
+                range(len(WEEKDAYS)), key=keys.__getitem__):
+            indexes = list(indexes)
+            if key == ():
+                shifts = 'Closed'
+            elif key == _OPEN_ALL_DAY:
+                shifts = 'Open 24 hours'
+            else:
+                shifts = ', '.join(
+                    shift.to_human_readable_format(time_table)
+                    for shift in weekdays[indexes[0]].shifts)
+            days = WEEKDAYS[indexes[0]].capitalize()
+            if len(indexes) > 1:
+                days += ' - ' + WEEKDAYS[indexes[-1]].capitalize()
+            human_readable_ranges.append('{days}: {shifts}'.format(
+                days=days, shifts=shifts))
+        return human_readable_ranges
+
+    @staticmethod
+    def _find_weekdays_open_all_day(weekdays):
+        """Return list with flag for every weekday of *weekdays*:
+        weekday has no shifts, but shift of some previous weekday
+        continues through it
+        """
+        # Index of the last weekday with shifts before current weekday:
+        # its shift can continue through the following days without shifts.
+        # Search starts on the previous week, which can continue on monday
+        last_index = None
+        for weekday_index in range(len(WEEKDAYS) - 1, -1, -1):
+            weekday = weekdays[weekday_index]
+            if weekday and weekday.shifts:
+                last_index = weekday_index - len(WEEKDAYS)
+                break
+        open_all_day = []
+        for weekday_index, weekday in enumerate(weekdays):
+            if weekday and weekday.shifts:
+                last_index = weekday_index
+                open_all_day.append(False)
+            else:
+                open_all_day.append(last_index is not None and any(
+                    shift.close_day_offset > weekday_index - last_index
+                    for shift in weekdays[last_index].shifts))
+        return open_all_day
+
+    def compile(self):
+        """Return compiled week with shifts of all weekdays
+        as seconds since monday midnight. Fractions of seconds
+        are truncated, as compiled week keeps integer seconds
+        """
+        shifts = []
+        for weekday_index, weekday_name in enumerate(WEEKDAYS):
+            weekday = getattr(self, weekday_name)
+            if not weekday:
+                continue
+            day_start = weekday_index * SECONDS_IN_DAY
+            for shift in weekday.shifts:
+                shifts.append((
+                    int(day_start + shift.open),
+                    int(day_start + shift.close_day_offset * SECONDS_IN_DAY +
+                        shift.close)))
+        return CompiledWeek.create_from_shifts(shifts)
+
+    def create_timeline(self):
+        """Return timeline, which answers if restaurant is open
+        at some moment and when it opens or closes next
+        """
+        return Timeline.create_from_compiled_week(self.compile())
+
+    @classmethod
+    def create_week_from_compiled(cls, compiled_week):
+        """Create week with all weekdays and shifts from compiled week
+        or from sorted list of (start, end) pairs of seconds since
+        monday midnight. Shifts of every weekday are sorted by opening hour
+        """
+        weekdays = {
+            weekday_name: Weekday(weekday_name, [])
+            for weekday_name in WEEKDAYS
+        }
+        for start, end in compiled_week:
+            # Pairs can have float seconds, then days are float too
+            weekday_index, open_hour = divmod(start, SECONDS_IN_DAY)
+            close_day, close_hour = divmod(end, SECONDS_IN_DAY)
+            weekday_index = int(weekday_index)
+            weekdays[WEEKDAYS[weekday_index]].add_shift(
+                Shift(open_hour, close_hour, int(close_day) - weekday_index))
+        return cls(**weekdays)
+
     @classmethod
     def create_week_from_json(cls, working_hours_json):
         """Create week with all weekdays and shifts from working_hours dict
@@ -97,40 +222,62 @@ class Week:
 
         Appends shifts for weekday in place.
 
+        Days are swept once in order. Opening hour, which is the last
+        on its day, is matched with closing hour, which is the first
+        on one of the next days. Days without hours between them are
+        skipped: restaurant is open during the whole day.
+        Closing hour, which comes before any other hours of the week,
+        closes shift, which starts at the end of the week,
+        and is matched after the sweep.
+
         Args:
             - weekdays (dict): Dict of weekdays. Keys are weekday names.
             Values are working_hours.Weekday objects
             - weekdays_with_incomplete_shifts (dict): Dict of weekdays.
-            Keys are weekday names and values are incomplete shifts
-            Values can be None
+            Keys are weekday names and values are lists with
+            incomplete shifts: closing hour first, then opening hour
         """
-        # Split shifts into two dicts:
-        # for shifts with opening hour and for shifts with closing hour
-        # Create dict for shifts with open hours
-        shifts_with_opening_hour = filter_dict_items(
-            weekdays_with_incomplete_shifts,
-            lambda shift: shift.need_closing_hour())
-        # Create dict for shifts with close hour
-        shifts_with_closing_hour = filter_dict_items(
-            weekdays_with_incomplete_shifts,
-            lambda shift: shift.need_opening_hour())
-        # Try find closing hour for opening hour
-        for weekday_name, shift in shifts_with_opening_hour.items():
-            if not shift:
+        # Shift with opening hour, which waits for closing hour,
+        # and index of its weekday
+        opening_shift = opening_day_index = None
+        # Shift with closing hour, found before any other hours
+        first_closing_shift = first_closing_day_index = None
+        has_hours_before = False
+        for day_index, weekday_name in enumerate(WEEKDAYS):
+            incomplete_shifts = weekdays_with_incomplete_shifts[weekday_name]
+            if not incomplete_shifts and weekdays[weekday_name].is_closed:
                 continue
-            # Find shift with closing hours
-            # for current shift with opening hours
-            next_day_name, next_day_shift = \
-                get_next_day(weekday_name, shifts_with_closing_hour)
-            if not next_day_shift:
+            if incomplete_shifts and incomplete_shifts[0].need_opening_hour():
+                if opening_shift is not None:
+                    weekdays[WEEKDAYS[opening_day_index]].add_shift(
+                        Shift.merge_shifts(
+                            opening_shift, incomplete_shifts[0],
+                            day_index - opening_day_index))
+                    opening_shift = None
+                elif has_hours_before:
+                    raise WorkingHoursError(
+                        'Found closing hours without corresponding '
+                        'opening hours')
+                else:
+                    first_closing_shift = incomplete_shifts[0]
+                    first_closing_day_index = day_index
+            elif opening_shift is not None:
+                raise WorkingHoursError(
+                    'Found opening hours without corresponding closing hours')
+            if incomplete_shifts and incomplete_shifts[-1].need_closing_hour():
+                opening_shift = incomplete_shifts[-1]
+                opening_day_index = day_index
+            has_hours_before = True
+        # Match shift, which continues on the next week
+        if opening_shift is not None:
+            if first_closing_shift is None:
                 raise WorkingHoursError(
                     'Found opening hours without corresponding closing hours')
-            # Create merged shift and add it to weekday, on which shift started
-            merged_shift = Shift.merge_shifts(shift, next_day_shift)
-            weekdays[weekday_name].add_shift(merged_shift)
-            # Remove shift with closing hours from a dict
-            shifts_with_closing_hour.pop(next_day_name, None)
-        # Raise error if any of closing hours were left unmatched
-        if shifts_with_closing_hour:
+            weekdays[WEEKDAYS[opening_day_index]].add_shift(
+                Shift.merge_shifts(
+                    opening_shift, first_closing_shift,
+                    len(WEEKDAYS) - opening_day_index +
+                    first_closing_day_index))
+        elif first_closing_shift is not None:
             raise WorkingHoursError(
                 'Found closing hours without corresponding opening hours')
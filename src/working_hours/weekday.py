@@ -16,6 +16,8 @@ class Weekday:
         shifts (list): List of working_hour.Shift objects
     """
 
+    __slots__ = ('name', 'shifts')
+
     def __init__(self, name, shifts):
         """Return a Weekday object with day_of_week name *name*
         and shifts list *shifts*
@@ -45,24 +47,28 @@ class Weekday:
             'is_open': not self.is_closed,
         }
 
-    def to_human_readable_format(self):
+    def to_human_readable_format(self, time_table=None, is_open_all_day=False):
         """Return string with weekday working hours in human-readable format.
         For example: "Monday: 8 AM - 1 PM, 6 PM - 1 PM"
+        Weekday without shifts is printed as open 24 hours
+        if *is_open_all_day*: shift of previous day continues through it
         """
-        shifts = self._get_shifts_in_human_readable_format()
+        shifts = self._get_shifts_in_human_readable_format(
+            time_table, is_open_all_day)
         return '{day_of_week}: {shifts}'.format(
             day_of_week=self.name.capitalize(),
             shifts=shifts)
 
-    def _get_shifts_in_human_readable_format(self):
+    def _get_shifts_in_human_readable_format(
+            self, time_table, is_open_all_day):
         """Return string with current weekday shifts in human-readable format.
         For example: "8 AM - 1 PM, 6 PM - 1 PM"
         """
         if self.is_closed:
-            return 'Closed'
+            return 'Open 24 hours' if is_open_all_day else 'Closed'
         return ', '.join(
             [
-                shift.to_human_readable_format()
+                shift.to_human_readable_format(time_table)
                 for shift in self.shifts
             ]
         )
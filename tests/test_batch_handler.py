@@ -0,0 +1,226 @@
+"""Test batch handler
+"""
+import base64
+import gzip
+import json
+import unittest
+from unittest import mock
+
+from src import settings
+from src.handler import batch_handler
+from tests.utils import (
+    generate_empty_request,
+    generate_valid_request)
+
+
+def generate_response(status_code, body):
+    """Help to generated expected response from batch handler
+    """
+    return {
+        'statusCode': status_code,
+        'body': json.dumps(body)
+    }
+
+
+def generate_request(items):
+    """Help to generate request to batch lambda handler
+    """
+    return {
+        'body': json.dumps(items),
+        'isBase64Encoded': False
+    }
+
+
+class TestBatchHandler(unittest.TestCase):
+    """Test batch handler response
+    """
+
+    def test_valid_batch(self):
+        """
+        We return 200 OK and working hours of every item
+        in the same order as in request
+        """
+        items = [
+            {
+                'id': 'first',
+                'working_hours': generate_valid_request()
+            },
+            {
+                'id': 2,
+                'working_hours': generate_empty_request()
+            }
+        ]
+        response = batch_handler(generate_request(items), None)
+        expected_response_body = {
+            'results': [
+                {
+                    'id': 'first',
+                    'status': 200,
+                    'working_hours': [
+                        'Monday: 9 AM - 11 AM',
+                        'Tuesday: 9 AM - 11 AM',
+                        'Wednesday: 9 AM - 11 AM',
+                        'Thursday: 9 AM - 11 AM',
+                        'Friday: 9 AM - 11 AM',
+                        'Saturday: 9 AM - 11 AM',
+                        'Sunday: 9 AM - 11 AM'
+                    ]
+                },
+                {
+                    'id': 2,
+                    'status': 200,
+                    'working_hours': [
+                        'Monday: Closed',
+                        'Tuesday: Closed',
+                        'Wednesday: Closed',
+                        'Thursday: Closed',
+                        'Friday: Closed',
+                        'Saturday: Closed',
+                        'Sunday: Closed'
+                    ]
+                }
+            ]
+        }
+        expected_response = generate_response(
+            status_code=200,
+            body=expected_response_body)
+        self.assertEqual(response, expected_response)
+
+    def test_invalid_items_do_not_fail_batch(self):
+        """
+        Invalid items get their own 400 or 422 status,
+        other items are still converted
+        """
+        missing_sunday = generate_empty_request()
+        missing_sunday.pop('sunday')
+        unmatched_hours = {
+            **generate_empty_request(),
+            'friday': [
+                {
+                    'type': 'close',
+                    'value': 3600
+                }
+            ]
+        }
+        items = [
+            {
+                'id': 1,
+                'working_hours': missing_sunday
+            },
+            {
+                'id': 2,
+                'working_hours': unmatched_hours
+            },
+            {
+                'working_hours': generate_empty_request()
+            },
+            'not-an-item',
+            {
+                'id': 3,
+                'working_hours': generate_empty_request()
+            }
+        ]
+        response = batch_handler(generate_request(items), None)
+        results = json.loads(response['body'])['results']
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(
+            [(result['id'], result['status']) for result in results],
+            [(1, 400), (2, 422), (None, 400), (None, 400), (3, 200)])
+        self.assertEqual(
+            results[0]['error'], '\'sunday\' is a required property')
+        self.assertEqual(
+            results[2]['error'], '\'id\' is a required property')
+
+    def test_base64_encoded_body(self):
+        """
+        Body encoded by API Gateway with base64 is decoded
+        """
+        items = [
+            {
+                'id': 1,
+                'working_hours': generate_empty_request()
+            }
+        ]
+        request = {
+            'body': base64.b64encode(json.dumps(items).encode()).decode(),
+            'isBase64Encoded': True
+        }
+        response = batch_handler(request, None)
+        self.assertEqual(response['statusCode'], 200)
+
+    @mock.patch.object(settings, 'RESPONSE_COMPRESSION_MIN_BYTES', 1024)
+    def test_large_response_is_compressed(self):
+        """
+        Response is compressed with gzip if client accepts it
+        and body is not smaller than threshold
+        """
+        items = [
+            {
+                'id': item_id,
+                'working_hours': generate_valid_request()
+            }
+            for item_id in range(10)
+        ]
+        request = generate_request(items)
+        response = batch_handler(request, None)
+        self.assertNotIn('headers', response)
+        request['headers'] = {'accept-encoding': 'gzip, deflate'}
+        compressed_response = batch_handler(request, None)
+        self.assertEqual(
+            compressed_response['headers']['Content-Encoding'], 'gzip')
+        self.assertTrue(compressed_response['isBase64Encoded'])
+        self.assertEqual(
+            gzip.decompress(
+                base64.b64decode(compressed_response['body'])).decode(),
+            response['body'])
+        self.assertEqual(
+            batch_handler(generate_request(items[:1]), None)['body'],
+            batch_handler(
+                dict(generate_request(items[:1]),
+                     headers={'accept-encoding': 'gzip'}), None)['body'])
+
+    def test_batch_is_not_a_list(self):
+        """
+        We return 400 bad request if body is not a list
+        """
+        response = batch_handler(generate_request({'id': 1}), None)
+        expected_response_body = {
+            'error': '{\'id\': 1} is not of type \'array\''
+        }
+        expected_response = generate_response(
+            status_code=400,
+            body=expected_response_body)
+        self.assertEqual(response, expected_response)
+
+    def test_invalid_json(self):
+        """
+        We return 400 bad request if body is not valid JSON
+        """
+        request = {
+            'body': '[{',
+            'isBase64Encoded': False
+        }
+        response = batch_handler(request, None)
+        expected_response_body = {
+            'error': 'Invalid json format'
+        }
+        expected_response = generate_response(
+            status_code=400,
+            body=expected_response_body)
+        self.assertEqual(response, expected_response)
+
+    def test_body_is_missing(self):
+        """
+        We return 400 bad request if body is missing
+        """
+        request = {
+            'body': None
+        }
+        response = batch_handler(request, None)
+        expected_response_body = {
+            'error': 'Request body is missing'
+        }
+        expected_response = generate_response(
+            status_code=400,
+            body=expected_response_body)
+        self.assertEqual(response, expected_response)
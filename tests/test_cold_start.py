@@ -0,0 +1,47 @@
+"""Test case for handler import cost
+"""
+import subprocess
+import sys
+import unittest
+
+
+# Modules, which are not needed to serve requests
+# and slow down AWS Lambda cold start
+MODULES_NOT_IMPORTED_BY_HANDLER = [
+    'hashlib',
+    'http',
+    'jsonschema',
+    'logging',
+]
+
+
+def get_modules_imported_by_handler(modules):
+    """Help to check which of *modules* are imported
+    with src.handler in fresh interpreter
+    """
+    code = (
+        'import sys\n'
+        'import src.handler\n'
+        'print(" ".join(m for m in {modules!r} if m in sys.modules))'.
+        format(modules=modules))
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True)
+    return result.stdout.split()
+
+
+class TestColdStart(unittest.TestCase):
+    """Test that handler import does not load modules,
+    which are not needed to serve requests
+    """
+
+    def test_unused_modules_are_not_imported(self):
+        """
+        Reference pipeline dependencies, jsonschema, hashlib, http
+        and logging are not imported with handler
+        """
+        self.assertEqual(
+            get_modules_imported_by_handler(MODULES_NOT_IMPORTED_BY_HANDLER),
+            [])
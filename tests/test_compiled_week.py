@@ -0,0 +1,149 @@
+"""Test case for compiled week
+"""
+import unittest
+
+from src.pipeline import create_week
+from src.working_hours import CompiledWeek, Shift, Week, Weekday
+from src.working_hours.constants import SECONDS_IN_DAY, SECONDS_IN_WEEK
+from tests.utils import (
+    generate_empty_request,
+    generate_valid_request)
+
+
+class TestCompiledWeek(unittest.TestCase):
+    """Test compiling week and creating week from compiled week
+    """
+
+    def test_shifts_are_seconds_since_monday(self):
+        """
+        Shifts are compiled to seconds since monday midnight
+        """
+        compiled_week = create_week(generate_valid_request()).compile()
+        self.assertEqual(
+            list(compiled_week),
+            [
+                (day * SECONDS_IN_DAY + 32400, day * SECONDS_IN_DAY + 39600)
+                for day in range(7)
+            ])
+
+    def test_shifts_are_sorted(self):
+        """
+        Shifts are sorted by start
+        """
+        week = Week(
+            monday=Weekday('monday', [Shift(57600, 82800), Shift(0, 3600)]))
+        self.assertEqual(
+            list(week.compile()), [(0, 3600), (57600, 82800)])
+
+    def test_shift_closing_on_next_day(self):
+        """
+        Shift, closing on the next day, ends on the next day
+        """
+        request = {
+            **generate_empty_request(),
+            'friday': [
+                {
+                    'type': 'open',
+                    'value': 72000,
+                }
+            ],
+            'saturday': [
+                {
+                    'type': 'close',
+                    'value': 3600,
+                }
+            ]
+        }
+        compiled_week = create_week(request).compile()
+        self.assertEqual(
+            list(compiled_week),
+            [(4 * SECONDS_IN_DAY + 72000, 5 * SECONDS_IN_DAY + 3600)])
+
+    def test_shift_from_sunday_to_monday_ends_after_week(self):
+        """
+        Shift from sunday to monday ends after the end of the week
+        """
+        request = {
+            **generate_empty_request(),
+            'sunday': [
+                {
+                    'type': 'open',
+                    'value': 72000,
+                }
+            ],
+            'monday': [
+                {
+                    'type': 'close',
+                    'value': 3600,
+                }
+            ]
+        }
+        compiled_week = create_week(request).compile()
+        self.assertEqual(
+            list(compiled_week),
+            [(6 * SECONDS_IN_DAY + 72000, SECONDS_IN_WEEK + 3600)])
+
+    def test_week_is_recreated_from_compiled_week(self):
+        """
+        Week created from compiled week has the same shifts
+        and the same human readable format
+        """
+        request = {
+            **generate_valid_request(),
+            'saturday': [
+                {
+                    'type': 'open',
+                    'value': 72000,
+                }
+            ],
+            'sunday': [
+                {
+                    'type': 'close',
+                    'value': 3600,
+                },
+                {
+                    'type': 'open',
+                    'value': 72000,
+                }
+            ],
+            'monday': [
+                {
+                    'type': 'close',
+                    'value': 7200,
+                },
+                {
+                    'type': 'open',
+                    'value': 32400,
+                },
+                {
+                    'type': 'close',
+                    'value': 39600,
+                }
+            ]
+        }
+        week = create_week(request)
+        recreated_week = Week.create_week_from_compiled(week.compile())
+        self.assertEqual(recreated_week.to_dict(), week.to_dict())
+        self.assertEqual(
+            recreated_week.to_human_readable_format(),
+            week.to_human_readable_format())
+        self.assertEqual(recreated_week.compile(), week.compile())
+
+    def test_compiled_weeks_are_compared_by_shifts(self):
+        """
+        Compiled weeks with the same shifts are equal
+        """
+        self.assertEqual(
+            CompiledWeek.create_from_shifts([(10, 20), (0, 5)]),
+            CompiledWeek([0, 10], [5, 20]))
+        self.assertNotEqual(
+            CompiledWeek([0, 10], [5, 20]), CompiledWeek([0], [5]))
+
+    def test_objects_do_not_have_dict(self):
+        """
+        Week objects use slots to save memory
+        """
+        week = create_week(generate_valid_request())
+        for obj in [week, week.monday, week.monday.shifts[0], week.compile()]:
+            with self.subTest(obj=obj):
+                self.assertFalse(hasattr(obj, '__dict__'))
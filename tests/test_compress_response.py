@@ -0,0 +1,82 @@
+"""Test case for response compression
+"""
+import base64
+import gzip
+import json
+import unittest
+import zlib
+from unittest import mock
+
+from src import settings
+from src.response.compression import (
+    compress_response,
+    DEFLATE_ENCODING,
+    GZIP_ENCODING,
+    should_compress
+)
+
+
+def generate_response(body_size):
+    """Help to generate response with body of *body_size* bytes
+    """
+    return {
+        'statusCode': 200,
+        'body': json.dumps({'working_hours': 'a' * (body_size - 21)})
+    }
+
+
+class TestCompressResponse(unittest.TestCase):
+    """Test compression of response body
+    """
+
+    def test_body_is_compressed_with_encoding(self):
+        """
+        Body is compressed with gzip or deflate and encoded with base64
+        """
+        response = generate_response(2048)
+        for encoding, decompress in [
+                (GZIP_ENCODING, gzip.decompress),
+                (DEFLATE_ENCODING, zlib.decompress)]:
+            with self.subTest(encoding=encoding):
+                compressed_response = compress_response(response, encoding)
+                self.assertEqual(
+                    compressed_response['headers'],
+                    {'Content-Encoding': encoding, 'Vary': 'Accept-Encoding'})
+                self.assertTrue(compressed_response['isBase64Encoded'])
+                self.assertEqual(compressed_response['statusCode'], 200)
+                self.assertEqual(
+                    decompress(base64.b64decode(
+                        compressed_response['body'])).decode(),
+                    response['body'])
+                self.assertLess(
+                    len(compressed_response['body']), len(response['body']))
+
+    def test_response_is_not_changed(self):
+        """
+        Compressed response is a copy, so that cached uncompressed
+        response stays the same
+        """
+        response = generate_response(2048)
+        expected_response = dict(response)
+        compress_response(response, GZIP_ENCODING)
+        self.assertEqual(response, expected_response)
+
+    @mock.patch.object(settings, 'RESPONSE_COMPRESSION_MIN_BYTES', 1024)
+    def test_small_body_is_not_compressed(self):
+        """
+        Body smaller than threshold or without accepted encoding
+        is not compressed
+        """
+        self.assertTrue(
+            should_compress(generate_response(1024), GZIP_ENCODING))
+        self.assertFalse(
+            should_compress(generate_response(1023), GZIP_ENCODING))
+        self.assertFalse(should_compress(generate_response(1024), None))
+
+    @mock.patch.object(settings, 'RESPONSE_COMPRESSION_LEVEL', 0)
+    def test_compression_is_disabled_with_level_0(self):
+        """
+        Nothing is compressed if compression level is 0
+        """
+        self.assertFalse(
+            should_compress(generate_response(4096), GZIP_ENCODING))
@@ -0,0 +1,89 @@
+"""Test case for conversion of NDJSON lines
+"""
+import io
+import json
+import unittest
+from unittest import mock
+
+from src import settings
+from src.batch import convert_ndjson
+from src.constants import DAYS_OF_WEEK
+from tests.utils import generate_valid_request
+
+
+def generate_line(item):
+    """Help to generate NDJSON line with batch item
+    """
+    return json.dumps(item).encode() + b'\n'
+
+
+class TestConvertNdjson(unittest.TestCase):
+    """Test converting batch items from NDJSON lines
+    """
+
+    def test_lines_are_converted_in_order(self):
+        """
+        Every line has result in the same order as lines,
+        invalid lines have errors
+        """
+        invalid_request = generate_valid_request()
+        del invalid_request['monday'][0]
+        valid_item = {'id': 1, 'working_hours': generate_valid_request()}
+        lines = io.BytesIO(
+            generate_line(valid_item) +
+            b'{"id": 2\n' +
+            generate_line({'id': 3, 'working_hours': invalid_request}) +
+            generate_line({'id': 4}))
+        results = list(convert_ndjson(lines))
+        self.assertEqual(
+            [(result['id'], result['status']) for result in results],
+            [(1, 200), (None, 400), (3, 422), (4, 400)])
+        self.assertEqual(
+            results[0]['working_hours'][0], 'Monday: 9 AM - 11 AM')
+        self.assertEqual(results[1]['error'], 'Invalid json format')
+        self.assertEqual(results[2]['pointer'], '/working_hours/monday/0')
+
+    @mock.patch.object(settings, 'OUTPUT', settings.COMPACT_OUTPUT)
+    def test_compact_output(self):
+        """
+        Working hours are printed in compact format, if it is configured
+        """
+        working_hours = {
+            weekday: [
+                {'type': 'open', 'value': 32400},
+                {'type': 'close', 'value': 61200},
+            ] if weekday in ['monday', 'tuesday', 'wednesday'] else []
+            for weekday in DAYS_OF_WEEK
+        }
+        results = list(convert_ndjson(
+            [generate_line({'id': 1, 'working_hours': working_hours})]))
+        self.assertEqual(
+            results[0]['working_hours'],
+            ['Monday - Wednesday: 9 AM - 5 PM', 'Thursday - Sunday: Closed'])
+
+    def test_blank_lines_are_skipped(self):
+        """
+        Blank lines do not have results
+        """
+        lines = [
+            '\n',
+            json.dumps({'id': 1, 'working_hours': generate_valid_request()}),
+            '  \n',
+        ]
+        self.assertEqual(
+            [result['id'] for result in convert_ndjson(lines)], [1])
+
+    def test_lines_are_read_lazily(self):
+        """
+        Line is read only when its result is needed
+        """
+        read_lines = []
+
+        def generate_lines():
+            for item_id in range(3):
+                read_lines.append(item_id)
+                yield json.dumps(
+                    {'id': item_id, 'working_hours': generate_valid_request()})
+        results = convert_ndjson(generate_lines())
+        next(results)
+        self.assertEqual(read_lines, [0])
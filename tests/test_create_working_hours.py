@@ -187,6 +187,96 @@ class TestCleanOpeningHours(unittest.TestCase):
         self.assertEqual(
             create_working_hours_from_json(hours), expected_result)
 
+    def test_closing_at_midnight_processed_successfully(self):
+        """
+        Restaurant shift, which closes at midnight of the next day,
+        is processed successfully
+        """
+        hours = {
+            **generate_empty_request(),
+            'friday': [
+                {
+                    'type': 'open',
+                    'value': 72000,
+                }
+            ],
+            'saturday': [
+                {
+                    'type': 'close',
+                    'value': 0,
+                }
+            ]
+        }
+        week = Week.create_week_from_json(hours)
+        self.assertEqual(
+            week.friday.to_dict()['hours'], [{'open': 72000, 'close': 0}])
+
+    def test_closing_after_several_days_processed_successfully(self):
+        """
+        Restaurant shift, which is open during the whole saturday
+        and closes on sunday, is processed successfully
+        """
+        hours = {
+            **generate_empty_request(),
+            'friday': [
+                {
+                    'type': 'open',
+                    'value': 82800,
+                }
+            ],
+            'sunday': [
+                {
+                    'type': 'close',
+                    'value': 3600,
+                },
+                {
+                    'type': 'open',
+                    'value': 36000,
+                },
+                {
+                    'type': 'close',
+                    'value': 50400,
+                }
+            ]
+        }
+        week = Week.create_week_from_json(hours)
+        self.assertEqual(
+            [
+                (shift.open, shift.close, shift.close_day_offset)
+                for shift in week.friday.shifts
+            ],
+            [(82800, 3600, 2)])
+        self.assertEqual(
+            week.sunday.to_dict()['hours'], [{'open': 36000, 'close': 50400}])
+
+    def test_closing_after_the_end_of_week_processed_successfully(self):
+        """
+        Restaurant shift, which opens on saturday and closes
+        on monday, is processed successfully
+        """
+        hours = {
+            **generate_empty_request(),
+            'monday': [
+                {
+                    'type': 'close',
+                    'value': 3600,
+                }
+            ],
+            'saturday': [
+                {
+                    'type': 'open',
+                    'value': 82800,
+                }
+            ]
+        }
+        week = Week.create_week_from_json(hours)
+        self.assertEqual(
+            [
+                (shift.open, shift.close, shift.close_day_offset)
+                for shift in week.saturday.shifts
+            ],
+            [(82800, 3600, 2)])
+
     def test_days_of_week_are_in_the_right_order(self):
         """
         Days of week are stored in the right order: from monday to sunday
@@ -294,3 +384,37 @@ class TestCleanOpeningHours(unittest.TestCase):
         }
         with self.assertRaises(WorkingHoursError):
             create_working_hours_from_json(hours)
+
+    def test_error_is_thrown_if_shift_is_not_closed_before_next_day_hours(
+            self):
+        """
+        Error is thrown if day after opening hour has hours
+        and does not start with closing hour
+        """
+        hours = {
+            **generate_empty_request(),
+            'friday': [
+                {
+                    'type': 'open',
+                    'value': 82800,
+                }
+            ],
+            'saturday': [
+                {
+                    'type': 'open',
+                    'value': 36000,
+                },
+                {
+                    'type': 'close',
+                    'value': 50400,
+                }
+            ],
+            'sunday': [
+                {
+                    'type': 'close',
+                    'value': 3600,
+                }
+            ]
+        }
+        with self.assertRaises(WorkingHoursError):
+            create_working_hours_from_json(hours)
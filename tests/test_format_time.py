@@ -0,0 +1,89 @@
+"""Test case for time_format.format_time
+"""
+import unittest
+
+from src.time_format import (
+    format_time,
+    get_time_table,
+    TWELVE_HOUR_CLOCK,
+    TWENTY_FOUR_HOUR_CLOCK)
+
+
+class TestFormatTime(unittest.TestCase):
+    """Test formatting time of the day
+    """
+
+    def test_whole_hours_are_printed_without_minutes(self):
+        """
+        Whole hours are printed in 12-hour clock without minutes
+        """
+        self.assertEqual(format_time(36000), '10 AM')
+        self.assertEqual(format_time(64800), '6 PM')
+
+    def test_midnight_and_noon(self):
+        """
+        Midnight and noon are printed as 12 AM and 12 PM
+        """
+        self.assertEqual(format_time(0), '12 AM')
+        self.assertEqual(format_time(43200), '12 PM')
+
+    def test_minutes_are_printed(self):
+        """
+        Minutes are printed if time is not whole hour
+        """
+        self.assertEqual(format_time(37800), '10:30 AM')
+        self.assertEqual(format_time(86399), '11:59 PM')
+
+    def test_seconds_are_dropped(self):
+        """
+        Seconds are not printed
+        """
+        self.assertEqual(format_time(36059), '10 AM')
+
+    def test_float_seconds(self):
+        """
+        Float seconds are formatted same as integer seconds
+        """
+        self.assertEqual(format_time(37800.5), '10:30 AM')
+
+    def test_twenty_four_hour_clock(self):
+        """
+        Time is printed with hours and minutes in 24-hour clock
+        """
+        time_table = get_time_table(clock=TWENTY_FOUR_HOUR_CLOCK)
+        self.assertEqual(format_time(0, time_table), '00:00')
+        self.assertEqual(format_time(32400, time_table), '09:00')
+        self.assertEqual(format_time(81000, time_table), '22:30')
+
+    def test_locale(self):
+        """
+        Periods and separator are taken from locale
+        """
+        time_table = get_time_table(
+            clock=TWELVE_HOUR_CLOCK, locale='fi')
+        self.assertEqual(format_time(37800, time_table), '10.30 ap.')
+        time_table = get_time_table(
+            clock=TWENTY_FOUR_HOUR_CLOCK, locale='fi')
+        self.assertEqual(format_time(81000, time_table), '22.30')
+
+    def test_time_tables_are_reused(self):
+        """
+        Time table is created once for clock and locale
+        """
+        self.assertIs(
+            get_time_table(TWENTY_FOUR_HOUR_CLOCK, 'de'),
+            get_time_table(TWENTY_FOUR_HOUR_CLOCK, 'de'))
+
+    def test_unsupported_locale(self):
+        """
+        Raise ValueError if locale is not supported
+        """
+        with self.assertRaises(ValueError):
+            get_time_table(locale='not-a-locale')
+
+    def test_unsupported_clock(self):
+        """
+        Raise ValueError if clock is not supported
+        """
+        with self.assertRaises(ValueError):
+            get_time_table(clock='36h')
@@ -2,7 +2,11 @@
 """
 import unittest
 
-from src.request.query import get_query_param, QueryError
+from src.request.query import (
+    get_integer_query_param,
+    get_query_param,
+    QueryError
+)
 
 
 class TestGetQueryParam(unittest.TestCase):
@@ -55,3 +59,34 @@ class TestGetQueryParam(unittest.TestCase):
         request = {}
         with self.assertRaises(KeyError):
             get_query_param(request, 'test-param')
+
+
+class TestGetIntegerQueryParam(unittest.TestCase):
+    """Test request.query.get_integer_query_param function
+    """
+
+    def test_param_value_converted_to_int(self):
+        """
+        Param value converted to int if it is in range
+        """
+        request = {
+            'queryStringParameters': {
+                'at': '3600'
+            }
+        }
+        self.assertEqual(
+            get_integer_query_param(request, 'at', 0, 3600), 3600)
+
+    def test_raise_query_error_if_param_is_not_integer(self):
+        """
+        Raise error if query param is not integer or is out of range
+        """
+        for value in ['', 'noon', '1.5', '-1', '3601']:
+            with self.subTest(value=value):
+                request = {
+                    'queryStringParameters': {
+                        'at': value
+                    }
+                }
+                with self.assertRaises(QueryError):
+                    get_integer_query_param(request, 'at', 0, 3600)
@@ -0,0 +1,61 @@
+"""Test case for request.body.get_body
+"""
+import base64
+import unittest
+
+from src.request.body import get_body, BodyError
+
+
+class TestGetBody(unittest.TestCase):
+    """Test request.body.get_body function
+    """
+
+    def test_body_returned_if_found(self):
+        """
+        Body returned if found
+        """
+        request = {
+            'body': '[]',
+            'isBase64Encoded': False
+        }
+        self.assertEqual(get_body(request), '[]')
+
+    def test_base64_encoded_body_is_decoded(self):
+        """
+        Body is decoded if API Gateway encoded it with base64
+        """
+        request = {
+            'body': base64.b64encode(b'[]').decode(),
+            'isBase64Encoded': True
+        }
+        self.assertEqual(get_body(request), b'[]')
+
+    def test_raise_body_error_if_body_is_empty(self):
+        """
+        Raise error if body is empty
+        """
+        request = {
+            'body': None
+        }
+        with self.assertRaises(BodyError):
+            get_body(request)
+
+    def test_raise_body_error_if_base64_encoding_is_invalid(self):
+        """
+        Raise error if body can not be decoded from base64
+        """
+        request = {
+            'body': 'invalid-base-64',
+            'isBase64Encoded': True
+        }
+        with self.assertRaises(BodyError):
+            get_body(request)
+
+    def test_raise_key_error_if_request_format_is_invalid(self):
+        """
+        Raise key error if body is missing in request.
+        Same as for query params, we fail fast if AWS event format changes
+        """
+        request = {}
+        with self.assertRaises(KeyError):
+            get_body(request)
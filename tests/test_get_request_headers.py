@@ -0,0 +1,100 @@
+"""Test case for request.headers
+"""
+import unittest
+
+from src.request.headers import get_accepted_encoding, get_header
+
+
+ENCODINGS = ['gzip', 'deflate']
+
+
+def generate_request(accept_encoding):
+    """Help to generate request with Accept-Encoding header
+    """
+    return {
+        'headers': {
+            'Accept-Encoding': accept_encoding
+        }
+    }
+
+
+class TestGetHeader(unittest.TestCase):
+    """Test request.headers.get_header function
+    """
+
+    def test_header_name_is_case_insensitive(self):
+        """
+        Header value returned if found in any case
+        """
+        request = {
+            'headers': {
+                'accept-encoding': 'gzip'
+            }
+        }
+        self.assertEqual(get_header(request, 'Accept-Encoding'), 'gzip')
+
+    def test_none_returned_if_header_does_not_exist(self):
+        """
+        None returned if header or all headers are missing
+        """
+        self.assertIsNone(get_header({'headers': {}}, 'Accept-Encoding'))
+        self.assertIsNone(get_header({'headers': None}, 'Accept-Encoding'))
+        self.assertIsNone(get_header({}, 'Accept-Encoding'))
+
+
+class TestGetAcceptedEncoding(unittest.TestCase):
+    """Test request.headers.get_accepted_encoding function
+    """
+
+    def test_supported_encoding_is_chosen(self):
+        """
+        The first supported encoding is chosen
+        """
+        for header, encoding in [
+                ('gzip, deflate, br', 'gzip'),
+                ('br, deflate', 'deflate'),
+                ('GZIP', 'gzip'),
+                ('br', None),
+                ('identity', None),
+                ('', None)]:
+            with self.subTest(header=header):
+                self.assertEqual(
+                    get_accepted_encoding(
+                        generate_request(header), ENCODINGS),
+                    encoding)
+
+    def test_encoding_with_higher_quality_is_chosen(self):
+        """
+        Encoding with higher quality is preferred,
+        encodings with zero quality are not accepted
+        """
+        for header, encoding in [
+                ('gzip;q=0.5, deflate', 'deflate'),
+                ('gzip; q=1.0, deflate; q=0.9', 'gzip'),
+                ('gzip;q=0, deflate;q=0', None),
+                ('gzip;q=invalid', None)]:
+            with self.subTest(header=header):
+                self.assertEqual(
+                    get_accepted_encoding(
+                        generate_request(header), ENCODINGS),
+                    encoding)
+
+    def test_wildcard_matches_encodings_not_listed(self):
+        """
+        "*" accepts encodings, which are not listed in header
+        """
+        for header, encoding in [
+                ('*', 'gzip'),
+                ('gzip;q=0, *', 'deflate'),
+                ('*;q=0', None)]:
+            with self.subTest(header=header):
+                self.assertEqual(
+                    get_accepted_encoding(
+                        generate_request(header), ENCODINGS),
+                    encoding)
+
+    def test_none_returned_without_header(self):
+        """
+        Response is not compressed if header is missing
+        """
+        self.assertIsNone(get_accepted_encoding({}, ENCODINGS))
@@ -3,8 +3,11 @@
 import base64
 import json
 import unittest
+from unittest import mock
 
-from src.handler import handler
+from src import settings
+from src.handler import handler, open_at_handler
+from tests.utils import generate_valid_request
 
 
 def generate_response(status_code, body):
@@ -123,7 +126,8 @@ class TestMainHandler(unittest.TestCase):
         request = generate_request(payload=request_payload)
         response = handler(request, None)
         expected_response_body = {
-            'error': '\'sunday\' is a required property'
+            'error': '\'sunday\' is a required property',
+            'pointer': '/sunday'
         }
         expected_response = generate_response(
             status_code=400,
@@ -147,16 +151,45 @@ class TestMainHandler(unittest.TestCase):
                     'type': 'close',
                     'value': 3600
                 },
+            ]
+        }
+        request = generate_request(payload=request_payload)
+        response = handler(request, None)
+        expected_response_body = {
+            'error': 'Found closing hours without '
+                     'corresponding opening hours',
+            'pointer': '/sunday/0'
+        }
+        expected_response = generate_response(
+            status_code=422,
+            body=expected_response_body)
+        self.assertEqual(response, expected_response)
+
+    @mock.patch.object(settings, 'PIPELINE', settings.REFERENCE_PIPELINE)
+    def test_create_week_failed_with_reference_pipeline(self):
+        """
+        We return 422 unprocessable entity without pointer
+        if reference pipeline can not create week
+        """
+        request_payload = {
+            'monday': [],
+            'tuesday': [],
+            'wednesday': [],
+            'thursday': [],
+            'friday': [],
+            'saturday': [],
+            'sunday': [
                 {
-                    'type': 'open',
-                    'value': 43200
+                    'type': 'close',
+                    'value': 3600
                 },
             ]
         }
         request = generate_request(payload=request_payload)
         response = handler(request, None)
         expected_response_body = {
-            'error': 'Missing day: monday'
+            'error': 'Found closing hours without '
+                     'corresponding opening hours'
         }
         expected_response = generate_response(
             status_code=422,
@@ -198,3 +231,69 @@ class TestMainHandler(unittest.TestCase):
             status_code=400,
             body=expected_response_body)
         self.assertEqual(response, expected_response)
+
+
+class TestOpenAtHandler(unittest.TestCase):
+    """Test opening status handler response
+    """
+
+    def test_valid_request(self):
+        """
+        We return 200 OK with opening status and next opening and closing
+        """
+        request = generate_request(generate_valid_request())
+        request['queryStringParameters']['at'] = '36000'
+        self.assertEqual(
+            open_at_handler(request, None),
+            generate_response(
+                200,
+                {
+                    'is_open': True,
+                    'next_opening': 118800,
+                    'next_closing': 39600
+                }))
+
+    def test_float_hours(self):
+        """
+        We return 200 OK for hours with fractions of seconds,
+        which are truncated to whole seconds
+        """
+        payload = generate_valid_request()
+        payload['monday'][0]['value'] = 32400.5
+        request = generate_request(payload)
+        request['queryStringParameters']['at'] = '0'
+        self.assertEqual(
+            open_at_handler(request, None),
+            generate_response(
+                200,
+                {
+                    'is_open': False,
+                    'next_opening': 32400,
+                    'next_closing': 39600
+                }))
+
+    def test_invalid_moment(self):
+        """
+        We return 400 Bad Request if moment of the week is invalid
+        """
+        request = generate_request(generate_valid_request())
+        request['queryStringParameters']['at'] = '604800'
+        self.assertEqual(
+            open_at_handler(request, None),
+            generate_response(
+                400,
+                {
+                    'error': 'Query parameter "at" should be integer '
+                             'from 0 to 604799'
+                }))
+
+    def test_create_week_failed(self):
+        """
+        We return 422 Unprocessable Entity if working hours are invalid
+        """
+        payload = generate_valid_request()
+        del payload['monday'][0]
+        request = generate_request(payload)
+        request['queryStringParameters']['at'] = '0'
+        response = open_at_handler(request, None)
+        self.assertEqual(response['statusCode'], 422)
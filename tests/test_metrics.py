@@ -0,0 +1,115 @@
+"""Test latency metrics of handler stages
+"""
+import io
+import json
+import unittest
+from unittest import mock
+
+from src import settings
+from src.handler import handler, RESPONSE_CACHE
+from src.metrics import (
+    add_metrics_hook,
+    create_stage_timer,
+    hash_payload,
+    NULL_TIMER,
+    remove_metrics_hook
+)
+from tests.test_handler import generate_request
+from tests.utils import generate_valid_request
+
+
+# Stages of request, which is converted without cache
+CONVERSION_STAGES = [
+    'get_query_param',
+    'decode_and_load_json',
+    'create_week',
+    'to_human_readable_format',
+    'json_dumps',
+]
+
+
+class TestHandlerMetrics(unittest.TestCase):
+    """Test durations of handler stages
+    """
+
+    def setUp(self):
+        self.calls = []
+        add_metrics_hook(self.record)
+        self.addCleanup(remove_metrics_hook, self.record)
+        patcher = mock.patch.object(RESPONSE_CACHE, 'max_bytes', 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def record(self, *args):
+        """Help to record calls of metrics hook
+        """
+        self.calls.append(args)
+
+    @mock.patch.object(settings, 'METRICS', settings.NO_METRICS)
+    def test_metrics_are_disabled(self):
+        """
+        Stages are not timed and hooks are not called
+        if metrics are disabled
+        """
+        self.assertIs(create_stage_timer('handler'), NULL_TIMER)
+        handler(generate_request(generate_valid_request()), None)
+        self.assertEqual(self.calls, [])
+
+    @mock.patch.object(settings, 'METRICS', settings.HOOKS_METRICS)
+    def test_hook_gets_stage_durations(self):
+        """
+        Hook is called with duration of every stage and the whole request
+        """
+        response = handler(generate_request(generate_valid_request()), None)
+        self.assertEqual(response['statusCode'], 200)
+        [(handler_name, stages, total, status_code)] = self.calls
+        self.assertEqual(handler_name, 'handler')
+        self.assertEqual(list(stages), CONVERSION_STAGES)
+        self.assertGreaterEqual(total, sum(stages.values()))
+        self.assertEqual(status_code, 200)
+
+    @mock.patch.object(settings, 'METRICS', settings.HOOKS_METRICS)
+    def test_hook_gets_error_status_code(self):
+        """
+        Stages before error are timed and status code of error is passed
+        """
+        handler(generate_request({}), None)
+        [(_, stages, _, status_code)] = self.calls
+        self.assertEqual(
+            list(stages), ['get_query_param', 'decode_and_load_json'])
+        self.assertEqual(status_code, 400)
+
+    @mock.patch.object(settings, 'METRICS', settings.EMF_METRICS)
+    def test_emf_line(self):
+        """
+        Durations are printed in CloudWatch Embedded Metric Format
+        """
+        with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            handler(generate_request(generate_valid_request()), None)
+        line = json.loads(stdout.getvalue())
+        [metrics] = line['_aws']['CloudWatchMetrics']
+        self.assertEqual(
+            [metric['Name'] for metric in metrics['Metrics']],
+            CONVERSION_STAGES + ['total'])
+        self.assertEqual(metrics['Dimensions'], [['Handler']])
+        self.assertEqual(line['Handler'], 'handler')
+        self.assertEqual(line['StatusCode'], 200)
+        for name in CONVERSION_STAGES + ['total']:
+            self.assertIsInstance(line[name], float)
+
+    @mock.patch.object(settings, 'METRICS', settings.HOOKS_METRICS)
+    @mock.patch.object(settings, 'SLOW_REQUEST_THRESHOLD_MS', 0)
+    def test_slow_request_is_logged(self):
+        """
+        Request slower than threshold is logged with stages
+        and payload hash
+        """
+        request = generate_request(generate_valid_request())
+        with self.assertLogs('src.metrics', 'WARNING') as logs:
+            handler(request, None)
+        [message] = logs.output
+        logged = json.loads(message.split('Slow request: ', 1)[1])
+        self.assertEqual(list(logged['stages_ms']), CONVERSION_STAGES)
+        self.assertEqual(
+            logged['payload_hash'],
+            hash_payload(request['queryStringParameters']['query']))
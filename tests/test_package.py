@@ -0,0 +1,45 @@
+"""Test case for production zip package
+"""
+import os
+import tempfile
+import unittest
+import zipfile
+
+from scripts.package import create_zip_package, PRODUCTION_EXCLUDED_MODULES
+
+
+class TestProductionPackage(unittest.TestCase):
+    """Test content of production package
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        directory = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(directory.cleanup)
+        package_path, _ = create_zip_package(
+            os.path.join(directory.name, 'opening_hours'), production=True)
+        with zipfile.ZipFile(package_path) as package:
+            cls.names = package.namelist()
+
+    def test_handler_is_packaged(self):
+        """
+        Handler module is packaged with its bytecode
+        """
+        self.assertIn('src/handler.py', self.names)
+        self.assertTrue(any(
+            name.startswith('src/__pycache__/handler.')
+            for name in self.names))
+
+    def test_unused_modules_are_not_packaged(self):
+        """
+        Modules, which are not used by handlers, are not packaged
+        with their bytecode
+        """
+        for module in PRODUCTION_EXCLUDED_MODULES:
+            directory, filename = os.path.split(module)
+            bytecode_prefix = '{directory}/__pycache__/{name}.'.format(
+                directory=directory, name=filename[:-len('.py')])
+            with self.subTest(module=module):
+                self.assertNotIn(module, self.names)
+                self.assertFalse(any(
+                    name.startswith(bytecode_prefix) for name in self.names))
@@ -0,0 +1,82 @@
+"""Test case for parallel conversion of NDJSON file
+"""
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from scripts.convert_ndjson import (
+    convert_file,
+    convert_file_in_parallel,
+    ConversionStats,
+    split_into_chunks)
+from tests.utils import generate_valid_request
+
+
+class TestParallelConversion(unittest.TestCase):
+    """Test splitting NDJSON file into chunks and converting them
+    with pool of processes
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'restaurants.ndjson')
+        lines = [
+            json.dumps(
+                {'id': item_id, 'working_hours': generate_valid_request()})
+            for item_id in range(50)
+        ]
+        lines[10] = '{"id": 10'
+        lines[20] = ''
+        with open(self.path, 'w') as output_file:
+            output_file.write('\n'.join(lines))
+
+    def convert_sequentially(self):
+        """Help to convert file without workers
+        """
+        output_file = io.StringIO()
+        with open(self.path, 'rb') as input_file:
+            convert_file(input_file, output_file, ConversionStats())
+        return output_file.getvalue()
+
+    def test_chunks_end_on_line_boundaries(self):
+        """
+        Chunks cover the whole file and split it on line boundaries
+        """
+        with open(self.path, 'rb') as input_file:
+            content = input_file.read()
+        for chunks_count in [1, 3, 7, 100]:
+            with self.subTest(chunks_count=chunks_count):
+                chunks = split_into_chunks(self.path, chunks_count)
+                self.assertLessEqual(len(chunks), chunks_count)
+                self.assertEqual(
+                    b''.join(content[start:end] for start, end in chunks),
+                    content)
+                for _, end in chunks[:-1]:
+                    self.assertEqual(content[end - 1:end], b'\n')
+
+    def test_ordered_results_are_the_same_as_sequential(self):
+        """
+        Results of parallel conversion are the same as of sequential one
+        """
+        output_file = io.StringIO()
+        stats = ConversionStats()
+        convert_file_in_parallel(self.path, output_file, stats, workers=3)
+        self.assertEqual(output_file.getvalue(), self.convert_sequentially())
+        self.assertEqual(stats.records, 49)
+        self.assertEqual(stats.errors, 1)
+        self.assertEqual(stats.bytes, os.path.getsize(self.path))
+
+    def test_unordered_results_have_the_same_lines(self):
+        """
+        Results of unordered conversion have the same lines
+        """
+        output_file = io.StringIO()
+        convert_file_in_parallel(
+            self.path, output_file, ConversionStats(), workers=3,
+            ordered=False)
+        self.assertEqual(
+            sorted(output_file.getvalue().splitlines()),
+            sorted(self.convert_sequentially().splitlines()))
@@ -0,0 +1,517 @@
+"""Test case for fused, reference and normalized pipelines
+"""
+import random
+import unittest
+from unittest import mock
+
+from src import pipeline, settings
+from src.pipeline import (
+    create_normalized_week,
+    create_week_in_one_pass,
+    create_week_with_reference_pipeline)
+from src.request.validate import ValidationError
+from src.working_hours import WorkingHoursError
+from src.working_hours.constants import WEEKDAYS
+from tests.utils import (
+    generate_empty_request,
+    generate_invalid_shifts_request,
+    generate_invalid_structure_request,
+    generate_max_size_request,
+    generate_multi_shift_request,
+    generate_overnight_request,
+    generate_random_request,
+    generate_valid_request)
+
+
+def create_week(create_week_function, request):
+    """Help to create week and return it as dict or type and message
+    of raised error. Pointer is returned only for validation errors:
+    reference pipeline does not point to unmatched hours
+    """
+    try:
+        return create_week_function(request).to_dict()
+    except ValidationError as err:
+        return type(err), err.message, err.pointer
+    except WorkingHoursError as err:
+        return type(err), err.message
+
+
+class TestFusedPipeline(unittest.TestCase):
+    """Test that fused pipeline creates the same week and raises
+    the same errors as reference pipeline
+    """
+
+    def assert_same_result(self, request):
+        """Check that both pipelines have the same result for request
+        """
+        self.assertEqual(
+            create_week(create_week_in_one_pass, request),
+            create_week(create_week_with_reference_pipeline, request))
+
+    def test_random_requests(self):
+        """
+        Random requests give the same result in both pipelines
+        """
+        rand = random.Random(42)
+        for _ in range(2000):
+            request = generate_random_request(rand)
+            with self.subTest(request=request):
+                self.assert_same_result(request)
+
+    def test_synthetic_requests(self):
+        """
+        Requests, used in benchmarks, give the same result
+        in both pipelines
+        """
+        for generate_request in [
+                generate_multi_shift_request,
+                generate_overnight_request,
+                generate_max_size_request,
+                generate_invalid_structure_request,
+                generate_invalid_shifts_request]:
+            with self.subTest(generate_request=generate_request.__name__):
+                self.assert_same_result(generate_request())
+
+    def test_shifts_through_midnight(self):
+        """
+        Shifts which close on the next day, including sunday to monday,
+        are created in both pipelines
+        """
+        request = {
+            **generate_valid_request(),
+            'sunday': [
+                {
+                    'type': 'open',
+                    'value': 32400,
+                },
+                {
+                    'type': 'close',
+                    'value': 39600,
+                },
+                {
+                    'type': 'open',
+                    'value': 72000,
+                },
+            ],
+            'monday': [
+                {
+                    'type': 'close',
+                    'value': 3600,
+                },
+                {
+                    'type': 'open',
+                    'value': 72000,
+                },
+            ],
+            'tuesday': [
+                {
+                    'type': 'close',
+                    'value': 3600,
+                },
+            ]
+        }
+        self.assert_same_result(request)
+        week = create_week_in_one_pass(request)
+        self.assertEqual(
+            week.sunday.to_dict()['hours'],
+            [
+                {'open': 32400, 'close': 39600},
+                {'open': 72000, 'close': 3600}
+            ])
+
+    def test_shift_closed_at_midnight(self):
+        """
+        Shift closed at midnight of the next day is created
+        """
+        request = {
+            **generate_empty_request(),
+            'friday': [
+                {
+                    'type': 'open',
+                    'value': 72000,
+                },
+            ],
+            'saturday': [
+                {
+                    'type': 'close',
+                    'value': 0,
+                },
+            ]
+        }
+        week = create_week_in_one_pass(request)
+        self.assertEqual(
+            week.friday.to_dict()['hours'], [{'open': 72000, 'close': 0}])
+
+    def test_shifts_through_several_days(self):
+        """
+        Shifts which close after days without hours, including
+        shift through the end of the week, are created in both pipelines
+        """
+        request = {
+            **generate_empty_request(),
+            'monday': [
+                {
+                    'type': 'close',
+                    'value': 0,
+                },
+            ],
+            'tuesday': [
+                {
+                    'type': 'open',
+                    'value': 36000,
+                },
+            ],
+            'thursday': [
+                {
+                    'type': 'close',
+                    'value': 3600,
+                },
+            ],
+            'friday': [
+                {
+                    'type': 'open',
+                    'value': 72000,
+                },
+            ],
+        }
+        self.assert_same_result(request)
+        week = create_week_in_one_pass(request)
+        self.assertEqual(
+            [
+                (shift.open, shift.close, shift.close_day_offset)
+                for day in [week.tuesday, week.friday]
+                for shift in day.shifts
+            ],
+            [(36000, 3600, 2), (72000, 0, 3)])
+
+
+class TestFusedPipelineErrors(unittest.TestCase):
+    """Test errors and their JSON pointers in fused pipeline
+    """
+
+    def assert_error(self, request, error_class, message, pointer):
+        """Check that fused pipeline raises error with message and pointer
+        """
+        with self.assertRaises(error_class) as context:
+            create_week_in_one_pass(request)
+        self.assertEqual(context.exception.message, message)
+        self.assertEqual(context.exception.pointer, pointer)
+
+    def test_invalid_hour_value(self):
+        """
+        Invalid hour value points to the value
+        """
+        request = generate_valid_request()
+        request['tuesday'][1]['value'] = 90000
+        self.assert_error(
+            request, ValidationError,
+            '90000 is greater than the maximum of 86399',
+            '/tuesday/1/value')
+
+    def test_invalid_day_is_reported_before_missing_day(self):
+        """
+        Invalid day is reported before missing days,
+        same as in reference pipeline
+        """
+        request = generate_valid_request()
+        request.pop('monday')
+        request['sunday'] = 'closed'
+        self.assert_error(
+            request, ValidationError,
+            '\'closed\' is not of type \'array\'',
+            '/sunday')
+
+    def test_invalid_structure_is_reported_before_unmatched_hours(self):
+        """
+        Invalid structure is reported before unmatched hours,
+        same as in reference pipeline
+        """
+        request = generate_valid_request()
+        request['monday'] = [
+            {
+                'type': 'close',
+                'value': 3600,
+            },
+            {
+                'type': 'close',
+                'value': 7200,
+            },
+        ]
+        request['friday'] = [{'type': 'open'}]
+        self.assert_error(
+            request, ValidationError,
+            '\'value\' is a required property',
+            '/friday/0/value')
+
+    def test_missing_day(self):
+        """
+        Missing day points to the day
+        """
+        request = generate_valid_request()
+        request.pop('wednesday')
+        self.assert_error(
+            request, ValidationError,
+            '\'wednesday\' is a required property',
+            '/wednesday')
+
+    def test_request_is_not_object(self):
+        """
+        Request of invalid type points to the whole request
+        """
+        self.assert_error(
+            [], ValidationError, '[] is not of type \'object\'', '')
+
+    def test_opening_hour_after_closing_hour(self):
+        """
+        Opening hour after closing hour points to closing hour
+        """
+        request = generate_valid_request()
+        request['thursday'][1]['value'] = 3600
+        self.assert_error(
+            request, WorkingHoursError,
+            'Invalid opening and closing hours found. '
+            'Opening hour should be before closing hour. '
+            'Opening hour: 32400, Closing hour: 3600',
+            '/thursday/1')
+
+    def test_two_closing_hours_in_a_row(self):
+        """
+        Pair of closing hours points to the second one
+        """
+        request = generate_valid_request()
+        request['thursday'].insert(1, {'type': 'close', 'value': 36000})
+        request['thursday'].append({'type': 'close', 'value': 72000})
+        self.assert_error(
+            request, WorkingHoursError,
+            'Invalid opening and closing hours found. '
+            'Opening hour should be before closing hour. '
+            'Opening hour: 39600, Closing hour: 72000',
+            '/thursday/3')
+
+    def test_hour_without_pair_on_its_day(self):
+        """
+        Hour, which has no pair on its day and is not matched
+        with hours of other days, points to the hour
+        """
+        request = generate_valid_request()
+        request['tuesday'].append({'type': 'close', 'value': 72000})
+        self.assert_error(
+            request, WorkingHoursError,
+            'Found unmatched hours. [{"type": "close", "value": 72000}]',
+            '/tuesday/2')
+
+    def test_hours_of_every_day_are_paired_before_matching(self):
+        """
+        Hours without pair on later day are reported before hours,
+        which are not matched between earlier days,
+        same as in reference pipeline
+        """
+        request = generate_valid_request()
+        request['monday'].append({'type': 'open', 'value': 72000})
+        request['friday'].append({'type': 'close', 'value': 72000})
+        self.assert_error(
+            request, WorkingHoursError,
+            'Found unmatched hours. [{"type": "close", "value": 72000}]',
+            '/friday/2')
+
+    def test_opening_hour_is_not_closed_on_next_day(self):
+        """
+        Opening hour without closing hour on the next day points
+        to opening hour
+        """
+        request = generate_valid_request()
+        request['saturday'].append({'type': 'open', 'value': 72000})
+        self.assert_error(
+            request, WorkingHoursError,
+            'Found opening hours without corresponding closing hours',
+            '/saturday/2')
+
+    def test_sunday_is_not_closed_on_monday(self):
+        """
+        Opening hour on sunday without closing hour on monday points
+        to opening hour
+        """
+        request = generate_valid_request()
+        request['sunday'].append({'type': 'open', 'value': 72000})
+        self.assert_error(
+            request, WorkingHoursError,
+            'Found opening hours without corresponding closing hours',
+            '/sunday/2')
+
+    def test_monday_is_not_opened_on_sunday(self):
+        """
+        Closing hour on monday without opening hour on sunday points
+        to closing hour
+        """
+        request = generate_valid_request()
+        request['monday'].insert(0, {'type': 'close', 'value': 3600})
+        self.assert_error(
+            request, WorkingHoursError,
+            'Found closing hours without corresponding opening hours',
+            '/monday/0')
+
+    def test_opening_hour_is_not_closed_before_next_hours(self):
+        """
+        Opening hour, followed by day with hours, which do not start
+        with closing hour, points to opening hour
+        """
+        request = generate_empty_request()
+        request['friday'] = [{'type': 'open', 'value': 72000}]
+        request['sunday'] = [
+            {'type': 'open', 'value': 36000},
+            {'type': 'close', 'value': 50400},
+        ]
+        self.assert_error(
+            request, WorkingHoursError,
+            'Found opening hours without corresponding closing hours',
+            '/friday/0')
+
+
+def create_shifts(request):
+    """Help to create normalized week and return its shifts
+    as (weekday, open, close, close_day_offset)
+    """
+    week = create_normalized_week(request)
+    return [
+        (weekday, shift.open, shift.close, shift.close_day_offset)
+        for weekday in WEEKDAYS
+        for shift in getattr(week, weekday).shifts
+    ]
+
+
+class TestNormalizedPipeline(unittest.TestCase):
+    """Test creating week with canonical shifts from hours in any order
+    """
+
+    def test_random_requests(self):
+        """
+        Valid random requests with shuffled hours give the same week
+        as fused pipeline with sorted hours
+        """
+        rand = random.Random(42)
+        for _ in range(1000):
+            request = generate_random_request(rand)
+            expected_result = create_week(create_week_in_one_pass, request)
+            if not isinstance(expected_result, list):
+                continue
+            for hours in request.values():
+                rand.shuffle(hours)
+            with self.subTest(request=request):
+                self.assertEqual(
+                    create_week(create_normalized_week, request),
+                    expected_result)
+
+    def test_touching_shifts_are_merged(self):
+        """
+        Shifts, where one closes when the other opens, are merged
+        """
+        request = generate_empty_request()
+        request['monday'] = [
+            {'type': 'open', 'value': 50400},
+            {'type': 'close', 'value': 64800},
+            {'type': 'open', 'value': 36000},
+            {'type': 'close', 'value': 50400},
+        ]
+        self.assertEqual(
+            create_shifts(request), [('monday', 36000, 64800, 0)])
+
+    def test_float_hours(self):
+        """
+        Hours with fractions of seconds give the same shifts
+        as in fused pipeline
+        """
+        request = generate_empty_request()
+        request['monday'] = [
+            {'type': 'close', 'value': 43200.5},
+            {'type': 'open', 'value': 36000.5},
+            {'type': 'close', 'value': 3600.5},
+        ]
+        request['saturday'] = [
+            {'type': 'open', 'value': 79200.5},
+        ]
+        self.assertEqual(
+            create_shifts(request),
+            [('monday', 36000.5, 43200.5, 0),
+             ('saturday', 79200.5, 3600.5, 2)])
+
+    def test_overlapping_shifts_are_merged(self):
+        """
+        Overlapping shifts and shifts inside other shifts are merged
+        """
+        request = generate_empty_request()
+        request['monday'] = [
+            {'type': 'open', 'value': 36000},
+            {'type': 'open', 'value': 43200},
+            {'type': 'close', 'value': 50400},
+            {'type': 'open', 'value': 46800},
+            {'type': 'close', 'value': 61200},
+            {'type': 'close', 'value': 57600},
+        ]
+        self.assertEqual(
+            create_shifts(request), [('monday', 36000, 61200, 0)])
+
+    def test_shift_overlapping_next_day_is_merged(self):
+        """
+        Shift, which continues on the next day and overlaps
+        its first shift, is merged with it
+        """
+        request = generate_empty_request()
+        request['sunday'] = [{'type': 'open', 'value': 79200}]
+        request['monday'] = [
+            {'type': 'close', 'value': 7200},
+            {'type': 'open', 'value': 3600},
+            {'type': 'close', 'value': 10800},
+            {'type': 'close', 'value': 43200},
+            {'type': 'open', 'value': 36000},
+        ]
+        self.assertEqual(
+            create_shifts(request),
+            [('monday', 36000, 43200, 0), ('sunday', 79200, 10800, 1)])
+
+    def test_empty_shift_is_dropped(self):
+        """
+        Shift, which closes at the same moment it opens, is dropped
+        """
+        request = generate_empty_request()
+        request['friday'] = [
+            {'type': 'close', 'value': 36000},
+            {'type': 'open', 'value': 36000},
+        ]
+        self.assertEqual(create_shifts(request), [])
+
+    def test_unmatched_hours(self):
+        """
+        Different numbers of opening and closing hours are not matched
+        """
+        for hour_type, message in [
+                ('open',
+                 'Found opening hours without corresponding closing hours'),
+                ('close',
+                 'Found closing hours without corresponding opening hours')]:
+            request = generate_valid_request()
+            request['friday'].append({'type': hour_type, 'value': 72000})
+            with self.subTest(hour_type=hour_type):
+                with self.assertRaises(WorkingHoursError) as context:
+                    create_normalized_week(request)
+                self.assertEqual(context.exception.message, message)
+
+    def test_invalid_structure(self):
+        """
+        Invalid structure is reported before hours are sorted
+        """
+        request = generate_valid_request()
+        request['friday'].append({'type': 'open'})
+        with self.assertRaises(ValidationError) as context:
+            create_normalized_week(request)
+        self.assertEqual(context.exception.pointer, '/friday/2/value')
+
+    @mock.patch.object(settings, 'SHIFTS', settings.NORMALIZED_SHIFTS)
+    def test_normalization_is_enabled_in_settings(self):
+        """
+        Shifts are normalized by create_week, if it is enabled in settings
+        """
+        request = generate_valid_request()
+        request['monday'].reverse()
+        self.assertEqual(
+            pipeline.create_week(request).monday.to_dict()['hours'],
+            [{'open': 32400, 'close': 39600}])
@@ -6,9 +6,8 @@ from src.working_hours import Week, Weekday, Shift
 from src.working_hours.constants import WEEKDAYS
 
 
-def print_working_hours(days):
-    """Help to create week with days and shifts,
-    and convert to human readable format.
+def create_week(days):
+    """Help to create week with days and shifts.
 
     Args:
         days (list): Weekdays in format:
@@ -19,6 +18,7 @@ def print_working_hours(days):
                     {
                         'open': int,
                         'close': int,
+                        'close_day_offset': int, optional
                     }
                 ]
             }
@@ -29,11 +29,43 @@ def print_working_hours(days):
         shifts = []
         for hour in day['hours']:
             shifts.append(
-                Shift(open_hour=hour['open'], close_hour=hour['close'])
+                Shift(
+                    open_hour=hour['open'], close_hour=hour['close'],
+                    close_day_offset=hour.get('close_day_offset', 0))
             )
         weekdays[day['day_of_week']] = \
             Weekday(name=day['day_of_week'], shifts=shifts)
-    return Week(**weekdays).to_human_readable_format()
+    return Week(**weekdays)
+
+
+def print_working_hours(days):
+    """Help to create week with days and shifts,
+    and convert to human readable format
+    """
+    return create_week(days).to_human_readable_format()
+
+
+def print_compact_working_hours(days):
+    """Help to create week with days and shifts,
+    and convert to compact human readable format
+    """
+    return create_week(days).to_compact_human_readable_format()
+
+
+def create_days(hours_of_days):
+    """Help to create days of the whole week from list
+    with list of (open, close) pairs for every weekday
+    """
+    return [
+        {
+            'day_of_week': weekday_name,
+            'hours': [
+                {'open': open_hour, 'close': close_hour}
+                for open_hour, close_hour in hours
+            ],
+        }
+        for weekday_name, hours in zip(WEEKDAYS, hours_of_days)
+    ]
 
 
 class TestPrintOpeningHours(unittest.TestCase):
@@ -108,3 +140,187 @@ class TestPrintOpeningHours(unittest.TestCase):
             'Monday: 6 AM - 11 AM, 4 PM - 9 PM'
         ]
         self.assertListEqual(print_working_hours(days), expected_message)
+
+    def test_minutes_are_printed(self):
+        """
+        Print minutes of hours, which are not whole
+        """
+        days = [
+            {
+                'day_of_week': 'friday',
+                'hours': [
+                    {
+                        'open': 37800,
+                        'close': 81000
+                    }
+                ],
+            },
+        ]
+        expected_message = [
+            'Friday: 10:30 AM - 10:30 PM'
+        ]
+        self.assertListEqual(print_working_hours(days), expected_message)
+
+    def test_day_inside_shift_is_printed_as_open_all_day(self):
+        """
+        Print day without shifts as open 24 hours, if shift
+        of previous day continues through it
+        """
+        days = [
+            {
+                'day_of_week': 'friday',
+                'hours': [
+                    {
+                        'open': 82800,
+                        'close': 3600,
+                        'close_day_offset': 2,
+                    }
+                ],
+            },
+            {
+                'day_of_week': 'saturday',
+                'hours': [],
+            },
+            {
+                'day_of_week': 'sunday',
+                'hours': [],
+            },
+        ]
+        expected_message = [
+            'Friday: 11 PM - 1 AM',
+            'Saturday: Open 24 hours',
+            'Sunday: Closed'
+        ]
+        self.assertListEqual(print_working_hours(days), expected_message)
+
+
+class TestPrintCompactOpeningHours(unittest.TestCase):
+    """Test printing opening hours with weekdays grouped to ranges
+    """
+
+    def test_consecutive_days_with_the_same_shifts_are_grouped(self):
+        """
+        Print range for consecutive days with the same shifts
+        """
+        days = create_days(
+            [[(32400, 61200)]] * 5 + [[(36000, 50400)], []])
+        expected_message = [
+            'Monday - Friday: 9 AM - 5 PM',
+            'Saturday: 10 AM - 2 PM',
+            'Sunday: Closed'
+        ]
+        self.assertListEqual(
+            print_compact_working_hours(days), expected_message)
+
+    def test_days_with_the_same_shifts_are_not_grouped_across_ranges(self):
+        """
+        Print separate ranges for the same shifts, which are not
+        consecutive, and do not group sunday with monday
+        """
+        days = create_days(
+            [[(32400, 61200)], [], [(32400, 61200)], [(32400, 61200)],
+             [], [], [(32400, 61200)]])
+        expected_message = [
+            'Monday: 9 AM - 5 PM',
+            'Tuesday: Closed',
+            'Wednesday - Thursday: 9 AM - 5 PM',
+            'Friday - Saturday: Closed',
+            'Sunday: 9 AM - 5 PM'
+        ]
+        self.assertListEqual(
+            print_compact_working_hours(days), expected_message)
+
+    def test_multiple_shifts_are_compared(self):
+        """
+        Group days only if all their shifts are the same
+        """
+        days = create_days(
+            [[(32400, 43200), (46800, 64800)]] * 2 +
+            [[(32400, 43200), (46800, 68400)]] * 5)
+        expected_message = [
+            'Monday - Tuesday: 9 AM - 12 PM, 1 PM - 6 PM',
+            'Wednesday - Sunday: 9 AM - 12 PM, 1 PM - 7 PM'
+        ]
+        self.assertListEqual(
+            print_compact_working_hours(days), expected_message)
+
+    def test_closed_all_week(self):
+        """
+        Print one string for week without shifts and without weekdays
+        """
+        self.assertListEqual(
+            print_compact_working_hours(create_days([[]] * 7)),
+            ['Closed all week'])
+        self.assertListEqual(
+            print_compact_working_hours([]), ['Closed all week'])
+
+    def test_missing_days_are_printed_as_closed(self):
+        """
+        Print weekdays, which are missing in week, as closed
+        """
+        days = create_days([[(32400, 61200)]] * 3)
+        expected_message = [
+            'Monday - Wednesday: 9 AM - 5 PM',
+            'Thursday - Sunday: Closed'
+        ]
+        self.assertListEqual(
+            print_compact_working_hours(days), expected_message)
+
+    def test_open_24_hours(self):
+        """
+        Print one string for week, where shift continues through
+        the whole week
+        """
+        days = create_days([[]] * 7)
+        days[0]['hours'] = [
+            {'open': 0, 'close': 0, 'close_day_offset': 7}]
+        self.assertListEqual(
+            print_compact_working_hours(days), ['Open 24 hours'])
+
+    def test_overlapping_shifts_are_not_open_24_hours(self):
+        """
+        Do not print week as open 24 hours, if total duration
+        of overlapping shifts is a week, but they leave gaps
+        """
+        days = create_days([[(3600, 82800)]] * 7)
+        for day in days:
+            day['hours'].append(
+                {'open': 84600, 'close': 7200, 'close_day_offset': 1})
+        self.assertListEqual(
+            print_compact_working_hours(days),
+            ['Monday - Sunday: 1 AM - 11 PM, 11:30 PM - 2 AM'])
+
+    def test_days_inside_shift_are_grouped_as_open_all_day(self):
+        """
+        Group days without shifts, through which shift of previous
+        day continues, as open 24 hours
+        """
+        days = create_days([[(32400, 61200)]] * 4 + [[]] * 3)
+        days[4]['hours'] = [
+            {'open': 64800, 'close': 7200, 'close_day_offset': 3}]
+        expected_message = [
+            'Monday - Thursday: 9 AM - 5 PM',
+            'Friday: 6 PM - 2 AM',
+            'Saturday - Sunday: Open 24 hours'
+        ]
+        self.assertListEqual(
+            print_compact_working_hours(days), expected_message)
+
+    def test_shifts_closing_on_different_days_are_not_grouped(self):
+        """
+        Do not group days, which print the same shifts,
+        if shifts close on different days
+        """
+        days = create_days([[]] * 7)
+        days[0]['hours'] = [
+            {'open': 64800, 'close': 7200, 'close_day_offset': 1}]
+        days[1]['hours'] = [
+            {'open': 64800, 'close': 7200, 'close_day_offset': 2}]
+        expected_message = [
+            'Monday: 6 PM - 2 AM',
+            'Tuesday: 6 PM - 2 AM',
+            'Wednesday: Open 24 hours',
+            'Thursday - Sunday: Closed'
+        ]
+        self.assertListEqual(
+            print_compact_working_hours(days), expected_message)
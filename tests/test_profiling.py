@@ -0,0 +1,121 @@
+"""Test profiling of sampled handler invocations
+"""
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from scripts.profile_report import (
+    create_cpu_report,
+    create_memory_report,
+    create_peak_memory_report,
+    find_profiles
+)
+from src import settings
+from src.handler import handler, RESPONSE_CACHE
+from src.metrics import hash_payload
+from src.profiling import (
+    CPU_PROFILE_EXTENSION,
+    MEMORY_PEAK_EXTENSION,
+    MEMORY_PROFILE_EXTENSION
+)
+from tests.test_handler import generate_request
+from tests.utils import generate_valid_request
+
+
+class TestProfiling(unittest.TestCase):
+    """Test profiles of handler invocations and report
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        for name, value in [
+                ('PROFILE_DIRECTORY', self.directory),
+                ('PROFILE_RATE', 1)]:
+            patcher = mock.patch.object(settings, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        # Profiled invocations convert working hours
+        patcher = mock.patch.object(RESPONSE_CACHE, 'max_bytes', 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def call_handler(self):
+        """Help to call handler and return hash of its payload
+        """
+        request = generate_request(generate_valid_request())
+        response = handler(request, None)
+        self.assertEqual(response['statusCode'], 200)
+        return hash_payload(request['queryStringParameters']['query'])
+
+    @mock.patch.object(settings, 'PROFILE', settings.NO_PROFILE)
+    def test_profiling_is_disabled(self):
+        """
+        Profiles are not written if profiling is disabled
+        """
+        self.call_handler()
+        self.assertEqual(os.listdir(self.directory), [])
+
+    @mock.patch.object(settings, 'PROFILE', settings.ALL_PROFILES)
+    @mock.patch.object(settings, 'PROFILE_RATE', 0)
+    def test_invocation_is_not_sampled(self):
+        """
+        Profiles are not written for invocations, which are not sampled
+        """
+        self.call_handler()
+        self.assertEqual(os.listdir(self.directory), [])
+
+    @mock.patch.object(settings, 'PROFILE', settings.CPU_PROFILE)
+    def test_cpu_profile(self):
+        """
+        cProfile profile is named with handler and payload hash
+        and is included in report
+        """
+        payload_hash = self.call_handler()
+        [profile] = os.listdir(self.directory)
+        self.assertTrue(profile.startswith('handler-' + payload_hash))
+        self.assertTrue(profile.endswith(CPU_PROFILE_EXTENSION))
+        report = create_cpu_report(
+            find_profiles([self.directory], CPU_PROFILE_EXTENSION),
+            top=50, sort='cumulative')
+        self.assertIn('create_week', report)
+
+    @mock.patch.object(settings, 'PROFILE', settings.ALL_PROFILES)
+    def test_profiles_are_combined(self):
+        """
+        cProfile and tracemalloc profiles are written for every invocation
+        and combined in reports
+        """
+        for _ in range(2):
+            self.call_handler()
+        cpu_profiles = find_profiles(
+            [self.directory], CPU_PROFILE_EXTENSION)
+        memory_profiles = find_profiles(
+            [self.directory], MEMORY_PROFILE_EXTENSION)
+        peak_profiles = find_profiles(
+            [self.directory], MEMORY_PEAK_EXTENSION)
+        self.assertEqual(len(cpu_profiles), 2)
+        self.assertEqual(len(memory_profiles), 2)
+        self.assertEqual(len(peak_profiles), 2)
+        self.assertIn(
+            '2 invocations', create_memory_report(memory_profiles, top=5))
+        self.assertIn(
+            '2 invocations', create_peak_memory_report(peak_profiles, top=5))
+
+    @mock.patch.object(settings, 'PROFILE', settings.MEMORY_PROFILE)
+    def test_peak_memory_includes_freed_objects(self):
+        """
+        Peak memory of invocation includes temporary objects,
+        which are freed before its end
+        """
+        payload_hash = self.call_handler()
+        [profile] = find_profiles([self.directory], MEMORY_PEAK_EXTENSION)
+        with open(profile) as peak_file:
+            memory = json.load(peak_file)
+        self.assertGreater(memory['peak_bytes'], memory['held_bytes'])
+        self.assertGreater(memory['peak_bytes'], 0)
+        report = create_peak_memory_report([profile], top=5)
+        self.assertIn('handler-' + payload_hash, report)
@@ -0,0 +1,228 @@
+"""Test case for in-process response cache
+"""
+import base64
+import gzip
+import json
+import unittest
+from unittest import mock
+
+from src import handler as handler_module, settings
+from src.cache import (
+    canonicalize,
+    create_cache_key,
+    ResponseCache,
+    ENTRY_OVERHEAD_BYTES)
+from src.handler import handler
+from tests.utils import generate_valid_request
+
+
+def generate_response(body):
+    """Help to generate cached response
+    """
+    return {
+        'statusCode': 200,
+        'body': body
+    }
+
+
+def generate_request(payload, **dumps_kwargs):
+    """Help to generate request to lambda handler
+    """
+    query = json.dumps(payload, **dumps_kwargs).encode()
+    return {
+        'queryStringParameters': {
+            'query': base64.b64encode(query).decode()
+        }
+    }
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test least recently used response cache
+    """
+
+    def test_cached_response_is_returned(self):
+        """
+        Response is returned for the same key and counted as hit
+        """
+        cache = ResponseCache(max_bytes=10000)
+        cache.set(b'key', generate_response('body'))
+        self.assertEqual(cache.get(b'key'), generate_response('body'))
+        self.assertIsNone(cache.get(b'another-key'))
+        self.assertEqual(
+            cache.stats(),
+            {
+                'hits': 1,
+                'misses': 1,
+                'evictions': 0,
+                'entries': 1,
+                'size_bytes': cache.size_bytes
+            })
+
+    def test_cached_response_is_copied(self):
+        """
+        Changes of returned response do not change cached response
+        """
+        cache = ResponseCache(max_bytes=10000)
+        cache.set(b'key', generate_response('body'))
+        cache.get(b'key')['body'] = 'changed'
+        self.assertEqual(cache.get(b'key'), generate_response('body'))
+
+    def test_least_recently_used_response_is_evicted(self):
+        """
+        Least recently used response is evicted when cache is full
+        """
+        cache = ResponseCache(max_bytes=3 * ENTRY_OVERHEAD_BYTES + 200)
+        for key in [b'first', b'second', b'third']:
+            cache.set(key, generate_response(''))
+        # Use first key, so that second key is least recently used
+        cache.get(b'first')
+        cache.set(b'fourth', generate_response(''))
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(cache.evictions, 1)
+        self.assertIsNone(cache.get(b'second'))
+        self.assertIsNotNone(cache.get(b'first'))
+        self.assertLessEqual(cache.size_bytes, cache.max_bytes)
+
+    def test_response_larger_than_cache_is_not_cached(self):
+        """
+        Response, which does not fit into cache, is not cached
+        """
+        cache = ResponseCache(max_bytes=ENTRY_OVERHEAD_BYTES)
+        cache.set(b'key', generate_response('body'))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size_bytes, 0)
+
+    def test_updated_response_replaces_previous(self):
+        """
+        Response set for existing key replaces previous one
+        """
+        cache = ResponseCache(max_bytes=10000)
+        cache.set(b'key', generate_response('body'))
+        cache.set(b'key', generate_response('updated-body'))
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.get(b'key'), generate_response('updated-body'))
+
+
+class TestCacheKey(unittest.TestCase):
+    """Test cache key creation
+    """
+
+    def test_key_depends_on_parts_boundaries(self):
+        """
+        Keys with the same concatenated parts are different
+        """
+        self.assertNotEqual(
+            create_cache_key('ab', 'c'), create_cache_key('a', 'bc'))
+
+    def test_str_and_bytes_parts_give_the_same_key(self):
+        """
+        String and its UTF-8 bytes give the same key
+        """
+        self.assertEqual(create_cache_key('query'), create_cache_key(b'query'))
+
+    def test_canonical_json_does_not_depend_on_keys_order(self):
+        """
+        Documents with different keys order have the same canonical form
+        """
+        self.assertEqual(
+            canonicalize({'a': 1, 'b': [1, 2]}),
+            canonicalize({'b': [1, 2], 'a': 1}))
+
+
+class TestHandlerResponseCache(unittest.TestCase):
+    """Test response caching in main handler
+    """
+
+    def setUp(self):
+        patcher = mock.patch.object(
+            handler_module, 'RESPONSE_CACHE', ResponseCache(10 ** 6))
+        self.cache = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_same_query_is_served_from_cache(self):
+        """
+        Response for the same query is found by query hash
+        """
+        request = generate_request(generate_valid_request())
+        response = handler(request, None)
+        self.assertEqual(handler(request, None), response)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_same_working_hours_are_served_from_cache(self):
+        """
+        Response for the same working hours in different query
+        is found by hash of canonical working hours
+        """
+        working_hours = generate_valid_request()
+        response = handler(generate_request(working_hours), None)
+        request_with_other_query = generate_request(
+            working_hours, indent=2, sort_keys=True)
+        self.assertEqual(handler(request_with_other_query, None), response)
+        # Miss by query hash, hit by working hours hash
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 3)
+
+    def test_response_depends_on_output_setting(self):
+        """
+        Response, cached with one output format, is not served
+        with another one
+        """
+        request = generate_request(generate_valid_request())
+        response = handler(request, None)
+        with mock.patch.object(
+                settings, 'OUTPUT', settings.COMPACT_OUTPUT):
+            compact_response = handler(request, None)
+        self.assertNotEqual(compact_response, response)
+        self.assertEqual(self.cache.hits, 0)
+        self.assertEqual(handler(request, None), response)
+
+    @mock.patch.object(settings, 'RESPONSE_COMPRESSION_MIN_BYTES', 0)
+    def test_compressed_response_is_cached_alongside(self):
+        """
+        Compressed response is cached separately for every encoding,
+        uncompressed response is served from the same cache
+        """
+        request = generate_request(generate_valid_request())
+        response = handler(request, None)
+        request['headers'] = {'Accept-Encoding': 'gzip'}
+        compressed_response = handler(request, None)
+        self.assertEqual(
+            compressed_response['headers']['Content-Encoding'], 'gzip')
+        self.assertEqual(
+            gzip.decompress(
+                base64.b64decode(compressed_response['body'])).decode(),
+            response['body'])
+        self.assertEqual(len(self.cache), 3)
+        self.assertEqual(handler(request, None), compressed_response)
+        request['headers'] = {'Accept-Encoding': 'deflate'}
+        self.assertEqual(
+            handler(request, None)['headers']['Content-Encoding'],
+            'deflate')
+        self.assertEqual(len(self.cache), 4)
+        del request['headers']
+        self.assertEqual(handler(request, None), response)
+
+    def test_errors_are_cached(self):
+        """
+        Error response depends only on query and is cached too
+        """
+        request = {
+            'queryStringParameters': {
+                'query': 'invalid-base-64'
+            }
+        }
+        response = handler(request, None)
+        self.assertEqual(handler(request, None), response)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_responses_are_not_cached_if_cache_is_disabled(self):
+        """
+        Nothing is cached if cache limit is 0
+        """
+        with mock.patch.object(
+                handler_module, 'RESPONSE_CACHE', ResponseCache(0)) as cache:
+            request = generate_request(generate_valid_request())
+            handler(request, None)
+            handler(request, None)
+            self.assertEqual(len(cache), 0)
+            self.assertEqual(cache.hits + cache.misses, 0)
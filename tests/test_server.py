@@ -0,0 +1,296 @@
+"""Test HTTP server for handlers
+"""
+import asyncio
+import base64
+import gzip
+import json
+import signal
+import socket
+import subprocess
+import sys
+import time
+import unittest
+from unittest import mock
+
+from src import settings
+from src.server import HttpServer
+from tests.utils import generate_valid_request
+
+
+def generate_query():
+    """Help to generate base64 encoded query with valid working hours
+    """
+    return base64.b64encode(
+        json.dumps(generate_valid_request()).encode()).decode()
+
+
+def generate_get_request(target, headers=''):
+    """Help to generate raw HTTP GET request
+    """
+    return (
+        'GET {target} HTTP/1.1\r\nHost: localhost\r\n{headers}\r\n'.format(
+            target=target, headers=headers)).encode()
+
+
+def parse_responses(data):
+    """Help to split raw HTTP responses to (status code, headers, body)
+    """
+    responses = []
+    while data:
+        head, _, data = data.partition(b'\r\n\r\n')
+        status_line, *header_lines = head.decode().split('\r\n')
+        headers = dict(line.split(': ', 1) for line in header_lines)
+        length = int(headers.get('Content-Length', 0))
+        body, data = data[:length], data[length:]
+        responses.append((int(status_line.split()[1]), headers, body))
+    return responses
+
+
+class TestServer(unittest.TestCase):
+    """Test serving handlers over HTTP
+    """
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.server = HttpServer()
+        self.loop.run_until_complete(self.server.start('127.0.0.1', 0))
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.server.shutdown())
+        self.loop.close()
+
+    def exchange(self, data):
+        """Help to send raw *data* and read responses until server
+        closes connection
+        """
+        async def _exchange():
+            reader, writer = await asyncio.open_connection(
+                '127.0.0.1', self.port)
+            writer.write(data)
+            response = await reader.read()
+            writer.close()
+            return response
+        return parse_responses(self.loop.run_until_complete(_exchange()))
+
+    def test_get_working_hours(self):
+        """
+        Query is passed to handler and its response is returned
+        """
+        [(status_code, headers, body)] = self.exchange(generate_get_request(
+            '/openinghours/?query=' + generate_query(),
+            'Connection: close\r\n'))
+        self.assertEqual(status_code, 200)
+        self.assertEqual(headers['Content-Type'], 'application/json')
+        self.assertEqual(headers['Connection'], 'close')
+        self.assertEqual(
+            json.loads(body)['working_hours'][0], 'Monday: 9 AM - 11 AM')
+
+    def test_pipelined_requests_are_answered_in_order(self):
+        """
+        Connection is kept alive and pipelined requests
+        are answered in the same order
+        """
+        query = generate_query()
+        responses = self.exchange(
+            generate_get_request('/openinghours?query=' + query) +
+            generate_get_request('/openinghours?query=invalid') +
+            generate_get_request(
+                '/openinghours/open?query={}&at=36000'.format(query)) +
+            generate_get_request('/unknown', 'Connection: close\r\n'))
+        self.assertEqual(
+            [status_code for status_code, _, _ in responses],
+            [200, 400, 200, 404])
+        self.assertEqual(responses[0][1]['Connection'], 'keep-alive')
+        self.assertEqual(
+            json.loads(responses[1][2]), {'error': 'Invalid base64 format'})
+        self.assertTrue(json.loads(responses[2][2])['is_open'])
+
+    def test_post_batch(self):
+        """
+        Request body is passed to batch handler
+        """
+        body = json.dumps(
+            [{'id': 1, 'working_hours': generate_valid_request()}]).encode()
+        [(status_code, _, response_body)] = self.exchange(
+            b'POST /openinghours/batch HTTP/1.1\r\n'
+            b'Content-Length: ' + str(len(body)).encode() + b'\r\n'
+            b'Connection: close\r\n\r\n' + body)
+        self.assertEqual(status_code, 200)
+        self.assertEqual(json.loads(response_body)['results'][0]['id'], 1)
+
+    @mock.patch.object(settings, 'RESPONSE_COMPRESSION_MIN_BYTES', 0)
+    def test_compressed_response(self):
+        """
+        Compressed response of handler is sent as binary body
+        with Content-Encoding header
+        """
+        [(status_code, headers, body)] = self.exchange(generate_get_request(
+            '/openinghours?query=' + generate_query(),
+            'Accept-Encoding: gzip\r\nConnection: close\r\n'))
+        self.assertEqual(status_code, 200)
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertEqual(
+            json.loads(gzip.decompress(body))['working_hours'][0],
+            'Monday: 9 AM - 11 AM')
+
+    def test_chunked_body(self):
+        """
+        Body sent in chunks is joined
+        """
+        body = json.dumps(
+            [{'id': 1, 'working_hours': generate_valid_request()}]).encode()
+        chunks = b''.join(
+            '{:x}\r\n'.format(len(chunk)).encode() + chunk + b'\r\n'
+            for chunk in [body[:10], body[10:]])
+        [(status_code, _, _)] = self.exchange(
+            b'POST /openinghours/batch HTTP/1.1\r\n'
+            b'Transfer-Encoding: chunked\r\n'
+            b'Connection: close\r\n\r\n' + chunks + b'0\r\n\r\n')
+        self.assertEqual(status_code, 200)
+
+    def test_wrong_method(self):
+        """
+        We return 405 Method Not Allowed for unsupported method
+        """
+        [(status_code, headers, _)] = self.exchange(
+            b'POST /openinghours HTTP/1.1\r\n'
+            b'Content-Length: 0\r\nConnection: close\r\n\r\n')
+        self.assertEqual(status_code, 405)
+        self.assertEqual(headers['Allow'], 'GET')
+
+    def test_invalid_request_closes_connection(self):
+        """
+        We return 400 Bad Request and close connection
+        if request can not be parsed
+        """
+        [(status_code, headers, _)] = self.exchange(
+            b'GARBAGE\r\n\r\n' + generate_get_request('/openinghours'))
+        self.assertEqual(status_code, 400)
+        self.assertEqual(headers['Connection'], 'close')
+
+    def test_http_1_0_closes_connection(self):
+        """
+        HTTP/1.0 connection is closed after response
+        """
+        [(status_code, headers, _)] = self.exchange(
+            b'GET /openinghours HTTP/1.0\r\n\r\n')
+        self.assertEqual(status_code, 400)
+        self.assertEqual(headers['Connection'], 'close')
+
+    def test_shutdown_closes_idle_connections(self):
+        """
+        Idle keep-alive connection is closed when server stops
+        and new connections are not accepted
+        """
+        async def _shutdown():
+            reader, writer = await asyncio.open_connection(
+                '127.0.0.1', self.port)
+            writer.write(generate_get_request('/unknown'))
+            response = await reader.readuntil(b'\r\n\r\n')
+            await self.server.shutdown()
+            rest = await reader.read()
+            writer.close()
+            return response, rest
+        response, rest = self.loop.run_until_complete(_shutdown())
+        self.assertIn(b'Connection: keep-alive', response)
+        self.assertEqual(rest, b'{"error": "Not found"}')
+        with self.assertRaises(ConnectionError):
+            socket.create_connection(('127.0.0.1', self.port), timeout=1)
+
+    def test_shutdown_waits_for_request_in_progress(self):
+        """
+        Request, which is being read when server stops, is answered
+        and connection is closed
+        """
+        async def _shutdown():
+            reader, writer = await asyncio.open_connection(
+                '127.0.0.1', self.port)
+            request_line, headers = generate_get_request(
+                '/unknown').split(b'\r\n', 1)
+            writer.write(request_line + b'\r\n')
+            await asyncio.sleep(0.1)
+            shutdown = asyncio.ensure_future(self.server.shutdown())
+            await asyncio.sleep(0.1)
+            writer.write(headers)
+            response = await reader.read()
+            await shutdown
+            writer.close()
+            return response
+        [(status_code, headers, _)] = parse_responses(
+            self.loop.run_until_complete(_shutdown()))
+        self.assertEqual(status_code, 404)
+        self.assertEqual(headers['Connection'], 'close')
+
+
+def get_free_port():
+    """Help to find port, which is not used
+    """
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def get_status_code(port):
+    """Help to send request to server on *port*,
+    which may be not started yet, and return status code
+    """
+    for _ in range(100):
+        try:
+            connection = socket.create_connection(('127.0.0.1', port))
+            break
+        except ConnectionError:
+            time.sleep(0.05)
+    with connection:
+        connection.sendall(
+            generate_get_request('/unknown', 'Connection: close\r\n'))
+        response = b''
+        while True:
+            data = connection.recv(4096)
+            if not data:
+                break
+            response += data
+    [(status_code, _, _)] = parse_responses(response)
+    return status_code
+
+
+class TestWorkerPool(unittest.TestCase):
+    """Test pre-forked server with worker processes
+    """
+
+    def run_server(self, *arguments):
+        """Help to run pre-forked server, send requests, restart it
+        and stop it
+        """
+        port = get_free_port()
+        process = subprocess.Popen(
+            [
+                sys.executable, '-m', 'src.server', '--port', str(port),
+                '--workers', '2'] + list(arguments),
+            stderr=subprocess.DEVNULL)
+        try:
+            self.assertEqual(get_status_code(port), 404)
+            process.send_signal(signal.SIGHUP)
+            for _ in range(10):
+                self.assertEqual(get_status_code(port), 404)
+            process.send_signal(signal.SIGTERM)
+            self.assertEqual(process.wait(timeout=10), 0)
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+
+    def test_workers_share_socket(self):
+        """
+        Workers serve requests on socket of master process,
+        are restarted on SIGHUP and stopped on SIGTERM
+        """
+        self.run_server()
+
+    @unittest.skipUnless(
+        hasattr(socket, 'SO_REUSEPORT'), 'SO_REUSEPORT is not supported')
+    def test_workers_reuse_port(self):
+        """
+        Workers serve requests on own sockets with SO_REUSEPORT
+        """
+        self.run_server('--reuse-port')
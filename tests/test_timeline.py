@@ -0,0 +1,163 @@
+"""Test case for working week timeline
+"""
+import unittest
+
+from src.pipeline import create_week
+from src.working_hours import CompiledWeek, Timeline
+from src.working_hours.constants import SECONDS_IN_DAY, SECONDS_IN_WEEK
+from tests.utils import (
+    generate_empty_request,
+    generate_valid_request)
+
+
+def create_timeline(*shifts):
+    """Help to create timeline from shifts in seconds since monday midnight
+    """
+    return Timeline.create_from_compiled_week(
+        CompiledWeek.create_from_shifts(shifts))
+
+
+class TestTimeline(unittest.TestCase):
+    """Test open at and next opening and closing queries
+    """
+
+    def test_open_during_shift(self):
+        """
+        Restaurant is open from opening time and closed from closing time
+        """
+        timeline = create_week(generate_valid_request()).create_timeline()
+        tuesday = SECONDS_IN_DAY
+        self.assertFalse(timeline.is_open_at(tuesday + 32399))
+        self.assertTrue(timeline.is_open_at(tuesday + 32400))
+        self.assertTrue(timeline.is_open_at(tuesday + 39599))
+        self.assertFalse(timeline.is_open_at(tuesday + 39600))
+
+    def test_next_opening_and_closing(self):
+        """
+        Next opening and closing are found for open and closed restaurant
+        """
+        timeline = create_week(generate_valid_request()).create_timeline()
+        tuesday = SECONDS_IN_DAY
+        wednesday = 2 * SECONDS_IN_DAY
+        # Closed
+        self.assertEqual(
+            timeline.get_next_opening(tuesday), tuesday + 32400)
+        self.assertEqual(
+            timeline.get_next_closing(tuesday), tuesday + 39600)
+        # Open
+        self.assertEqual(
+            timeline.get_next_opening(tuesday + 32400), wednesday + 32400)
+        self.assertEqual(
+            timeline.get_next_closing(tuesday + 32400), tuesday + 39600)
+
+    def test_next_opening_is_next_week(self):
+        """
+        Restaurant, closed after the last shift of the week,
+        opens on monday
+        """
+        timeline = create_week(generate_valid_request()).create_timeline()
+        sunday_evening = 6 * SECONDS_IN_DAY + 72000
+        self.assertEqual(timeline.get_next_opening(sunday_evening), 32400)
+        self.assertEqual(timeline.get_next_closing(sunday_evening), 39600)
+
+    def test_shift_from_sunday_to_monday(self):
+        """
+        Shift from sunday to monday is open on both days
+        """
+        request = {
+            **generate_empty_request(),
+            'sunday': [
+                {
+                    'type': 'open',
+                    'value': 72000,
+                }
+            ],
+            'monday': [
+                {
+                    'type': 'close',
+                    'value': 3600,
+                }
+            ]
+        }
+        timeline = create_week(request).create_timeline()
+        sunday = 6 * SECONDS_IN_DAY
+        self.assertTrue(timeline.is_open_at(0))
+        self.assertTrue(timeline.is_open_at(3599))
+        self.assertFalse(timeline.is_open_at(3600))
+        self.assertFalse(timeline.is_open_at(sunday + 71999))
+        self.assertTrue(timeline.is_open_at(sunday + 72000))
+        self.assertEqual(timeline.get_next_closing(0), 3600)
+        self.assertEqual(timeline.get_next_closing(sunday + 72000), 3600)
+        self.assertEqual(timeline.get_next_opening(0), sunday + 72000)
+        self.assertEqual(timeline.get_next_opening(3600), sunday + 72000)
+
+    def test_shift_through_several_days_of_next_week(self):
+        """
+        Shift, which opens on wednesday and closes on wednesday
+        of the next week, is open on all days between them
+        """
+        request = {
+            **generate_empty_request(),
+            'wednesday': [
+                {
+                    'type': 'close',
+                    'value': 36000,
+                },
+                {
+                    'type': 'open',
+                    'value': 72000,
+                }
+            ]
+        }
+        timeline = create_week(request).create_timeline()
+        wednesday = 2 * SECONDS_IN_DAY
+        self.assertTrue(timeline.is_open_at(0))
+        self.assertTrue(timeline.is_open_at(wednesday + 35999))
+        self.assertFalse(timeline.is_open_at(wednesday + 36000))
+        self.assertTrue(timeline.is_open_at(wednesday + 72000))
+        self.assertTrue(timeline.is_open_at(SECONDS_IN_WEEK - 1))
+        self.assertEqual(timeline.get_next_closing(0), wednesday + 36000)
+        self.assertEqual(
+            timeline.get_next_opening(0), wednesday + 72000)
+
+    def test_overlapping_and_touching_shifts_are_merged(self):
+        """
+        Restaurant does not close between overlapping or touching shifts
+        """
+        timeline = create_timeline((0, 100), (50, 200), (200, 300), (400, 500))
+        self.assertEqual(list(timeline.bounds), [0, 300, 400, 500])
+        self.assertEqual(timeline.get_next_closing(10), 300)
+
+    def test_shift_after_week_is_merged_with_monday(self):
+        """
+        Shift continuing on monday is merged with monday shift it touches
+        """
+        timeline = create_timeline(
+            (100, 200), (SECONDS_IN_WEEK - 100, SECONDS_IN_WEEK + 100))
+        self.assertEqual(
+            list(timeline.bounds),
+            [SECONDS_IN_WEEK - 100, SECONDS_IN_WEEK + 200])
+        self.assertEqual(timeline.get_next_closing(0), 200)
+        self.assertEqual(
+            timeline.get_next_opening(0), SECONDS_IN_WEEK - 100)
+
+    def test_always_open(self):
+        """
+        Restaurant open during the whole week has no next opening or closing
+        """
+        timeline = create_timeline(
+            (0, SECONDS_IN_WEEK - 100),
+            (SECONDS_IN_WEEK - 100, SECONDS_IN_WEEK))
+        self.assertTrue(timeline.is_always_open)
+        self.assertTrue(timeline.is_open_at(SECONDS_IN_WEEK - 1))
+        self.assertIsNone(timeline.get_next_opening(0))
+        self.assertIsNone(timeline.get_next_closing(0))
+
+    def test_closed_all_week(self):
+        """
+        Restaurant without shifts is never open
+        """
+        timeline = create_week(generate_empty_request()).create_timeline()
+        self.assertFalse(timeline.is_open_at(0))
+        self.assertIsNone(timeline.get_next_opening(0))
+        self.assertIsNone(timeline.get_next_closing(0))
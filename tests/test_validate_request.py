@@ -1,9 +1,15 @@
 """Test case for request validation
 """
 import unittest
-from jsonschema import ValidationError
 
-from src.request.validate import validate_request
+import jsonschema
+
+from src.request.validate import (
+    validate_batch_item,
+    validate_request,
+    ValidationError,
+    BATCH_ITEM_SCHEMA,
+    WORKING_HOURS_SCHEMA)
 from tests.utils import (
     generate_empty_request,
     generate_valid_request)
@@ -76,3 +82,81 @@ class TestValidateRequest(unittest.TestCase):
         ]
         with self.assertRaises(ValidationError):
             validate_request(request)
+
+
+class TestValidationMatchesJsonSchema(unittest.TestCase):
+    """Test that specialized validation reports the same errors
+    as jsonschema validation with request schemas
+    """
+
+    def assert_same_error(self, instance, schema, validate):
+        """Check that *validate* and jsonschema raise errors
+        with the same message
+        """
+        with self.assertRaises(jsonschema.ValidationError) as expected:
+            jsonschema.validate(instance, schema)
+        with self.assertRaises(ValidationError) as actual:
+            validate(instance)
+        self.assertEqual(actual.exception.message, expected.exception.message)
+
+    def test_invalid_working_hours(self):
+        """
+        Invalid working hours are reported with jsonschema messages
+        """
+        invalid_days = [
+            'monday',
+            [1],
+            [{}],
+            [{'value': 0}],
+            [{'type': 'open'}],
+            [{'type': 1, 'value': 0}],
+            [{'type': 'not-valid', 'value': 0}],
+            [{'type': 'open', 'value': '0'}],
+            [{'type': 'open', 'value': True}],
+            [{'type': 'open', 'value': -1}],
+            [{'type': 'open', 'value': 86400}],
+            [{'type': 'open', 'value': 86399.5}],
+            [{'type': 'open', 'value': 0}, {'type': 'close', 'value': None}],
+        ]
+        for day in invalid_days:
+            with self.subTest(day=day):
+                request = generate_valid_request()
+                request['wednesday'] = day
+                self.assert_same_error(
+                    request, WORKING_HOURS_SCHEMA, validate_request)
+
+    def test_invalid_day_is_reported_before_missing_day(self):
+        """
+        Invalid day is reported before missing days, same as in jsonschema
+        """
+        request = generate_valid_request()
+        request.pop('monday')
+        request['sunday'] = [{'type': 'open'}]
+        self.assert_same_error(request, WORKING_HOURS_SCHEMA, validate_request)
+
+    def test_request_is_not_object(self):
+        """
+        Request of invalid type is reported with jsonschema message
+        """
+        for request in [[], 'monday', None, 1]:
+            with self.subTest(request=request):
+                self.assert_same_error(
+                    request, WORKING_HOURS_SCHEMA, validate_request)
+
+    def test_invalid_batch_items(self):
+        """
+        Invalid batch items are reported with jsonschema messages
+        """
+        invalid_items = [
+            [],
+            {},
+            {'id': 1},
+            {'working_hours': {}},
+            {'id': True, 'working_hours': {}},
+            {'id': 1.5, 'working_hours': {}},
+            {'id': 1, 'working_hours': []},
+        ]
+        for item in invalid_items:
+            with self.subTest(item=item):
+                self.assert_same_error(
+                    item, BATCH_ITEM_SCHEMA, validate_batch_item)
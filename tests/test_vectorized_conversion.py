@@ -0,0 +1,198 @@
+"""Test case for vectorized conversion of many weeks
+to human readable format
+"""
+import random
+import unittest
+from unittest import mock
+
+from src import settings
+from src.pipeline import create_week
+from src.request.validate import ValidationError
+from src.time_format import get_time_table
+from src.working_hours import vectorized, WorkingHoursError
+from src.working_hours.vectorized import (
+    convert_weeks_to_human_readable_format)
+from tests.utils import (
+    generate_empty_request,
+    generate_random_request,
+    generate_valid_request)
+
+
+def convert_week(schedule, time_table=None):
+    """Help to convert week with Week and return raised error
+    """
+    try:
+        return create_week(schedule).to_human_readable_format(time_table)
+    except (ValidationError, WorkingHoursError) as err:
+        return err
+
+
+def describe_result(result):
+    """Help to compare results: errors are compared by type,
+    message and pointer
+    """
+    if isinstance(result, Exception):
+        return type(result), result.message, result.pointer
+    return result
+
+
+class TestVectorizedConversion(unittest.TestCase):
+    """Test that vectorized conversion has the same result
+    as conversion of every week with Week
+    """
+
+    def assert_same_results(self, schedules, time_table=None):
+        """Check that every week is converted as with Week
+        """
+        results = convert_weeks_to_human_readable_format(
+            schedules, time_table)
+        self.assertEqual(len(results), len(schedules))
+        for schedule, result in zip(schedules, results):
+            with self.subTest(schedule=schedule):
+                self.assertEqual(
+                    describe_result(result),
+                    describe_result(convert_week(schedule, time_table)))
+
+    def test_random_weeks(self):
+        """
+        Random valid and invalid weeks are converted as with Week
+        """
+        rand = random.Random(42)
+        self.assert_same_results(
+            [generate_random_request(rand) for _ in range(2000)])
+
+    def test_time_table(self):
+        """
+        Time is formatted with passed time table
+        """
+        rand = random.Random(7)
+        self.assert_same_results(
+            [generate_random_request(rand) for _ in range(200)],
+            get_time_table('24h', 'fi'))
+
+    def test_empty_weeks(self):
+        """
+        Restaurant, which is closed all week, and empty list are converted
+        """
+        self.assertEqual(convert_weeks_to_human_readable_format([]), [])
+        self.assert_same_results([generate_empty_request()] * 3)
+
+    def test_shifts_of_one_day_are_joined(self):
+        """
+        Shifts of one day are joined in order, shift closing
+        on the next day is the last one
+        """
+        request = {
+            **generate_empty_request(),
+            'monday': [
+                {'type': 'close', 'value': 3600},
+            ],
+            'saturday': [
+                {'type': 'open', 'value': 72000},
+            ],
+            'sunday': [
+                {'type': 'close', 'value': 3600},
+                {'type': 'open', 'value': 36000},
+                {'type': 'close', 'value': 39600},
+                {'type': 'open', 'value': 43200},
+                {'type': 'close', 'value': 50400},
+                {'type': 'open', 'value': 72000},
+            ],
+        }
+        results = convert_weeks_to_human_readable_format(
+            [generate_valid_request(), request])
+        self.assertEqual(
+            results[1][-1],
+            'Sunday: 10 AM - 11 AM, 12 PM - 2 PM, 8 PM - 1 AM')
+        self.assert_same_results([generate_valid_request(), request])
+
+    def test_shifts_through_several_days(self):
+        """
+        Shifts, which close several days after they open or on the same
+        weekday of the next week, are converted without fallback to Week,
+        and days inside them are open 24 hours
+        """
+        through_thursday = {
+            **generate_empty_request(),
+            'monday': [
+                {'type': 'open', 'value': 36000},
+            ],
+            'thursday': [
+                {'type': 'close', 'value': 3600},
+                {'type': 'open', 'value': 36000},
+                {'type': 'close', 'value': 64800},
+            ],
+        }
+        through_week = {
+            **generate_empty_request(),
+            'wednesday': [
+                {'type': 'close', 'value': 3600},
+                {'type': 'open', 'value': 36000},
+            ],
+        }
+        with mock.patch.object(
+                vectorized, '_convert_week',
+                side_effect=AssertionError('Week is converted one by one')):
+            results = convert_weeks_to_human_readable_format(
+                [through_thursday, through_week])
+        self.assertEqual(
+            results[0][:4],
+            ['Monday: 10 AM - 1 AM', 'Tuesday: Open 24 hours',
+             'Wednesday: Open 24 hours', 'Thursday: 10 AM - 6 PM'])
+        self.assertEqual(
+            results[1][:3],
+            ['Monday: Open 24 hours', 'Tuesday: Open 24 hours',
+             'Wednesday: 10 AM - 1 AM'])
+        self.assert_same_results([through_thursday, through_week])
+
+    @mock.patch.object(settings, 'SHIFTS', settings.NORMALIZED_SHIFTS)
+    def test_normalized_shifts(self):
+        """
+        Weeks with unsorted and touching shifts are converted as with Week,
+        if shifts are normalized
+        """
+        request = generate_empty_request()
+        request['monday'] = [
+            {'type': 'open', 'value': 50400},
+            {'type': 'close', 'value': 64800},
+            {'type': 'open', 'value': 36000},
+            {'type': 'close', 'value': 50400},
+        ]
+        results = convert_weeks_to_human_readable_format([request])
+        self.assertEqual(results[0][0], 'Monday: 10 AM - 6 PM')
+        rand = random.Random(42)
+        self.assert_same_results(
+            [generate_random_request(rand) for _ in range(200)] + [request])
+
+    def test_invalid_structure(self):
+        """
+        Weeks with invalid structure or values are converted with Week,
+        so they have the same errors, and other weeks are not affected
+        """
+        valid_request = generate_valid_request()
+        invalid_requests = [
+            [],
+            {'monday': []},
+            {**valid_request, 'tuesday': {}},
+            {**valid_request, 'tuesday': [[]]},
+            {**valid_request, 'tuesday': [{'type': 'open'}]},
+            {**valid_request, 'tuesday': [{'type': ['open'], 'value': 1}]},
+            {**valid_request, 'tuesday': [{'type': 'opened', 'value': 1}]},
+            {**valid_request, 'tuesday': [{'type': 'open', 'value': '1'}]},
+            {**valid_request, 'tuesday': [{'type': 'open', 'value': True}]},
+            {**valid_request, 'tuesday': [{'type': 'open', 'value': 2**70}]},
+            {**valid_request, 'tuesday': [{'type': 'open', 'value': -1}]},
+        ]
+        self.assert_same_results(
+            [valid_request] + invalid_requests + [valid_request])
+
+    def test_float_hours(self):
+        """
+        Float hours are valid and are converted with Week
+        """
+        request = generate_valid_request()
+        request['monday'] = [
+            {'type': 'open', 'value': 3600.5},
+            {'type': 'close', 'value': 7200.0},
+        ]
+        self.assert_same_results([request, generate_valid_request()])
@@ -0,0 +1,137 @@
+"""Test case for columnar store of working weeks
+"""
+import random
+import unittest
+
+from src.pipeline import create_week
+from src.request.validate import ValidationError
+from src.working_hours import CompiledWeek, Timeline, WorkingHoursError
+from src.working_hours.constants import SECONDS_IN_DAY, SECONDS_IN_WEEK
+from src.working_hours.store import WeekStore
+from tests.utils import (
+    generate_empty_request,
+    generate_random_request,
+    generate_valid_request)
+
+
+def generate_random_schedules(rand, count):
+    """Help to generate valid random working hours
+    """
+    schedules = []
+    while len(schedules) < count:
+        request = generate_random_request(rand)
+        try:
+            create_week(request)
+        except (ValidationError, WorkingHoursError):
+            continue
+        schedules.append(request)
+    return schedules
+
+
+def is_open_during(timeline, start, end):
+    """Help to find if restaurant is open during the whole window
+    with timeline queries
+    """
+    if timeline.is_always_open:
+        return True
+    if not timeline.is_open_at(start):
+        return False
+    open_for = (timeline.get_next_closing(start) - start) % SECONDS_IN_WEEK
+    return open_for >= end - start
+
+
+class TestWeekStore(unittest.TestCase):
+    """Test vectorized queries of week store
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        rand = random.Random(42)
+        cls.schedules = generate_random_schedules(rand, 200) + [
+            generate_empty_request(),
+            generate_valid_request(),
+        ]
+        cls.timelines = [
+            create_week(schedule).create_timeline()
+            for schedule in cls.schedules
+        ]
+        cls.store = WeekStore.create_from_json(cls.schedules)
+        cls.moments = [0, SECONDS_IN_WEEK - 1] + [
+            rand.randrange(SECONDS_IN_WEEK) for _ in range(50)]
+
+    def test_open_at_matches_timeline(self):
+        """
+        Restaurants open at some moment are the same as found by timelines
+        """
+        self.assertEqual(len(self.store), len(self.schedules))
+        for seconds in self.moments:
+            with self.subTest(seconds=seconds):
+                expected = [
+                    timeline.is_open_at(seconds)
+                    for timeline in self.timelines
+                ]
+                self.assertEqual(
+                    self.store.is_open_at(seconds).tolist(), expected)
+                self.assertEqual(
+                    self.store.count_open_at(seconds), sum(expected))
+
+    def test_open_during_matches_timeline(self):
+        """
+        Restaurants open during the whole window are the same
+        as found by timelines, including windows from sunday to monday
+        """
+        for start in self.moments:
+            for duration in [1, 3600, SECONDS_IN_DAY]:
+                end = start + duration
+                with self.subTest(start=start, end=end):
+                    expected = [
+                        is_open_during(timeline, start, end)
+                        for timeline in self.timelines
+                    ]
+                    self.assertEqual(
+                        self.store.is_open_during(start, end).tolist(),
+                        expected)
+                    self.assertEqual(
+                        self.store.count_open_during(start, end),
+                        sum(expected))
+
+    def test_always_open_restaurant(self):
+        """
+        Restaurant open during the whole week is open during any window
+        """
+        timeline = Timeline.create_from_compiled_week(
+            CompiledWeek([0, 3600], [3600, SECONDS_IN_WEEK]))
+        store = WeekStore.create_from_timelines([timeline])
+        self.assertTrue(store.is_open_at(0)[0])
+        self.assertTrue(
+            store.is_open_during(SECONDS_IN_WEEK - 1, SECONDS_IN_WEEK)[0])
+        self.assertTrue(store.is_open_during(1000, 1000 + SECONDS_IN_WEEK)[0])
+
+    def test_invalid_window(self):
+        """
+        Raise error if window is empty or longer than week
+        """
+        for start, end in [(10, 10), (10, 5), (0, SECONDS_IN_WEEK + 1)]:
+            with self.subTest(start=start, end=end):
+                with self.assertRaises(ValueError):
+                    self.store.is_open_during(start, end)
+
+    def test_float_hours(self):
+        """
+        Hours with fractions of seconds are truncated to whole seconds
+        """
+        request = generate_valid_request()
+        request['monday'][0]['value'] = 32400.5
+        request['monday'][1]['value'] = 39600.5
+        store = WeekStore.create_from_json([request])
+        self.assertListEqual(list(store.starts[:1]), [32400])
+        self.assertListEqual(list(store.ends[:1]), [39600])
+
+    def test_invalid_working_hours(self):
+        """
+        Raise error if any working hours are invalid
+        """
+        request = generate_valid_request()
+        del request['monday'][0]
+        with self.assertRaises(WorkingHoursError):
+            WeekStore.create_from_json([generate_valid_request(), request])
@@ -1,6 +1,6 @@
 """Misc utils for tests
 """
-from src.constants import DAYS_OF_WEEK
+from src.constants import DAYS_OF_WEEK, SECONDS_IN_DAY, SECONDS_IN_WEEK
 
 
 def generate_empty_request():
@@ -29,3 +29,97 @@ def generate_valid_request():
         ]
         for day_of_week in DAYS_OF_WEEK
     }
+
+
+def generate_random_request(rand):
+    """Help to generate request with random shifts through the week.
+    Shifts can close on the next day, including sunday to monday.
+    Some requests are broken: one hour is dropped or its type is changed.
+    """
+    shifts_count = rand.randint(0, 10)
+    timestamps = sorted(rand.sample(
+        range(0, SECONDS_IN_WEEK, 600), 2 * shifts_count))
+    # Shift the whole week, so that some shifts go from sunday to monday
+    offset = rand.choice([0, rand.randrange(0, SECONDS_IN_WEEK, 600)])
+    hours = [
+        (
+            'open' if index % 2 == 0 else 'close',
+            (timestamp + offset) % SECONDS_IN_WEEK
+        )
+        for index, timestamp in enumerate(timestamps)
+    ]
+    if hours and rand.random() < 0.3:
+        index = rand.randrange(len(hours))
+        if rand.random() < 0.5:
+            hours.pop(index)
+        else:
+            hours[index] = ('open', hours[index][1])
+    request = {weekday: [] for weekday in DAYS_OF_WEEK}
+    for hour_type, timestamp in sorted(hours, key=lambda hour: hour[1]):
+        request[DAYS_OF_WEEK[timestamp // SECONDS_IN_DAY]].append({
+            'type': hour_type,
+            'value': timestamp % SECONDS_IN_DAY
+        })
+    return request
+
+
+def generate_multi_shift_request(shifts_count=5):
+    """Help to generate request where all days have *shifts_count*
+    shifts, based on valid request
+    """
+    request = generate_valid_request()
+    step = SECONDS_IN_DAY // shifts_count
+    for day_of_week in DAYS_OF_WEEK:
+        request[day_of_week] = [
+            {
+                'type': hour_type,
+                'value': start + offset,
+            }
+            for start in range(0, step * shifts_count, step)
+            for hour_type, offset in [('open', 0), ('close', step // 2)]
+        ]
+    return request
+
+
+def generate_overnight_request():
+    """Help to generate request where every shift closes on the next day,
+    including shift from sunday to monday
+    """
+    request = generate_valid_request()
+    for day_of_week in DAYS_OF_WEEK:
+        request[day_of_week] = [
+            {
+                'type': 'close',
+                'value': 7200,
+            },
+            {
+                'type': 'open',
+                'value': 72000,
+            },
+        ]
+    return request
+
+
+def generate_max_size_request():
+    """Help to generate request with the largest days: every day
+    has shift in every minute, which can be printed
+    """
+    return generate_multi_shift_request(shifts_count=SECONDS_IN_DAY // 120)
+
+
+def generate_invalid_structure_request():
+    """Help to generate request, which fails validation
+    on the last hour of the last day
+    """
+    request = generate_valid_request()
+    request[DAYS_OF_WEEK[-1]][-1]['value'] = SECONDS_IN_DAY
+    return request
+
+
+def generate_invalid_shifts_request():
+    """Help to generate request with valid structure and closing hour
+    without opening hour on the last day
+    """
+    request = generate_valid_request()
+    request[DAYS_OF_WEEK[-1]].pop(0)
+    return request